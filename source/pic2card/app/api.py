@@ -1,4 +1,5 @@
 """Flask service to predict the adaptive card json from the card design"""
+import atexit
 import os
 import logging
 from logging.handlers import RotatingFileHandler
@@ -6,9 +7,9 @@ from flask import Flask
 from flask_cors import CORS
 from flask_restplus import Api
 
-from mystique.utils import load_od_instance
 from mystique import config
 from . import resources as res
+from .service import init_service, shutdown_service
 
 
 logger = logging.getLogger("mysitque")
@@ -51,8 +52,14 @@ if config.ENABLE_TF_SERVING:
 else:
     api.add_resource(res.PredictJson, "/predict_json", methods=["POST"])
 
-# Load the models and cache it for request handling.
-app.od_model = load_od_instance()
+# Load the models and the enabled caches for request handling.
+init_service(app)
+atexit.register(shutdown_service, app)
+
+if app.od_batcher is not None:
+    api.add_resource(res.GetBatchStats, "/batch_stats", methods=["GET"])
+if app.card_cache is not None or app.detection_cache is not None:
+    api.add_resource(res.GetCacheStats, "/cache_stats", methods=["GET"])
 
 # Include more debug points along with /predict_json api.
 api.add_resource(res.DebugEndpoint, "/predict_json_debug", methods=["POST"])
@@ -0,0 +1,359 @@
+"""
+ASGI service to predict the adaptive card json from the card design.
+
+Serves the same routes as the flask [ app.api ] app, the uploads are read on
+the event loop and the card prediction [ detection, OCR, layout ] runs in a
+thread pool, so a single process holds many in-flight requests. Requests
+beyond the ASGI_MAX_IN_FLIGHT running and the ASGI_MAX_WAITING queued ones
+are rejected with a 503.
+
+Usage :
+uvicorn app.asgi:app --host 0.0.0.0 --port 5050
+"""
+import asyncio
+import base64
+import functools
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from mystique import config
+from .service import (
+    debug_card,
+    encode_image,
+    get_cache_stats,
+    init_service,
+    predict_card,
+    shutdown_service,
+    tf_predict_card,
+)
+from .utils import (
+    BINARY_UPLOAD_TYPES,
+    UPLOAD_CHUNK_SIZE,
+    get_templates,
+    get_version,
+    upload_size_error,
+    UploadTooLarge,
+)
+
+logger = logging.getLogger("mysitque")
+
+# Suppress the tf warnings.
+os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
+
+
+class Overloaded(Exception):
+    """Raised if all the in-flight and the waiting slots are taken"""
+
+
+class Backpressure:
+    """
+    Limits the number of concurrently running predictions and the number
+    of requests waiting for a running slot.
+    """
+
+    def __init__(self, max_in_flight: int, max_waiting: int):
+        """
+        @param max_in_flight: max number of concurrent predictions
+        @param max_waiting: max number of requests waiting for a slot
+        """
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.max_waiting = max_waiting
+        self.waiting = 0
+
+    def overloaded(self) -> bool:
+        """Returns True if all the running and the waiting slots are taken"""
+        return self.semaphore.locked() and self.waiting >= self.max_waiting
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Waits for a running slot, raises Overloaded if the waiting queue
+        is full.
+        """
+        if self.overloaded():
+            raise Overloaded("Too many requests in flight")
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            yield
+        finally:
+            self.semaphore.release()
+
+
+def overloaded_error():
+    """
+    Returns the error response for the requests rejected by the
+    backpressure.
+    """
+    return {
+        "error": {
+            "msg": "Service is busy, retry the request later.",
+            "code": 1003,
+        },
+        "card_json": None,
+    }
+
+
+async def read_stream_upload(stream, max_size: float) -> bytes:
+    """
+    Reads the request body stream, stops reading as soon as the read size
+    exceeds the max size.
+    @param stream: async iterator of the body chunks
+    @param max_size: maximum upload size in bytes
+    @return: uploaded file content
+    """
+    chunks = []
+    size = 0
+    async for chunk in stream:
+        size += len(chunk)
+        if size > max_size:
+            raise UploadTooLarge(f"Upload exceeds {max_size} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def limit_receive(receive, max_size: float):
+    """
+    Wraps the ASGI receive channel, raises UploadTooLarge as soon as the
+    received body exceeds the max size. Bounds the multipart parsing, which
+    reads the whole body before the image field can be checked.
+    @param receive: ASGI receive channel of the request
+    @param max_size: maximum body size in bytes
+    @return: wrapped receive channel
+    """
+    size = 0
+
+    async def limited_receive():
+        nonlocal size
+        message = await receive()
+        if message["type"] == "http.request":
+            size += len(message.get("body", b""))
+            if size > max_size:
+                raise UploadTooLarge(f"Upload exceeds {max_size} bytes")
+        return message
+
+    return limited_receive
+
+
+async def read_form_upload(upload, max_size: float) -> bytes:
+    """
+    Reads the multipart upload file in chunks, stops reading as soon as the
+    read size exceeds the max size.
+    @param upload: starlette UploadFile of the image
+    @param max_size: maximum upload size in bytes
+    @return: uploaded file content
+    """
+    chunks = []
+    size = 0
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_size:
+            raise UploadTooLarge(f"Upload exceeds {max_size} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def read_image(request) -> bytes:
+    """
+    Reads the posted image, either a base64 json or a raw multipart
+    [ "image" field ] / octet-stream upload. The size is checked with the
+    Content-Length before reading the body and while reading it.
+    @param request: starlette request
+    @return: image file content
+    """
+    mimetype = request.headers.get("content-type", "").split(";")[0].strip()
+    if mimetype not in BINARY_UPLOAD_TYPES:
+        bs64_img = (await request.json()).get("image", "")
+        if sys.getsizeof(bs64_img) >= config.IMG_MAX_UPLOAD_SIZE:
+            raise UploadTooLarge("Base64 image exceeds the upload size")
+        return base64.b64decode(bs64_img)
+
+    max_body_size = config.IMG_MAX_UPLOAD_SIZE
+    if mimetype == "multipart/form-data":
+        # the multipart body carries the part headers and boundaries
+        max_body_size += config.IMG_UPLOAD_MULTIPART_OVERHEAD
+    content_length = request.headers.get("content-length")
+    if content_length is not None and int(content_length) > max_body_size:
+        raise UploadTooLarge("Content-Length exceeds the upload size")
+    if mimetype == "multipart/form-data":
+        # chunked uploads have no Content-Length to check
+        form = await Request(
+            request.scope, limit_receive(request.receive, max_body_size)
+        ).form()
+        try:
+            return await read_form_upload(
+                form["image"], config.IMG_MAX_UPLOAD_SIZE
+            )
+        finally:
+            await form.close()
+    return await read_stream_upload(
+        request.stream(), config.IMG_MAX_UPLOAD_SIZE
+    )
+
+
+async def run_prediction(request, executor, predict, *args) -> JSONResponse:
+    """
+    Reads the posted image and runs the prediction in the executor once a
+    running slot is free, the upload is read without holding a slot.
+    @param request: starlette request
+    @param executor: executor to run the prediction
+    @param predict: prediction function taking the image file content and
+                    the card format
+    @param args: leading arguments of the prediction function
+    """
+    backpressure = request.app.state.backpressure
+    try:
+        # Reject early, before reading the upload of a request which can't
+        # get a running slot.
+        if backpressure.overloaded():
+            raise Overloaded("Too many requests in flight")
+        card_format = request.query_params.get("format")
+        try:
+            imgdata = await read_image(request)
+        except UploadTooLarge:
+            # Upload smaller image.
+            return JSONResponse(upload_size_error())
+        async with backpressure.slot():
+            response = await asyncio.get_running_loop().run_in_executor(
+                executor,
+                functools.partial(predict, *args, imgdata, card_format),
+            )
+    except Overloaded:
+        return JSONResponse(overloaded_error(), status_code=503)
+    except Exception as ex:  # pylint: disable=broad-except
+        error_msg = f"Unhandled Error, failed to process the request: {ex}"
+        logger.error(error_msg)
+        response = {
+            "error": {"msg": error_msg, "code": 1001},
+            "card_json": None,
+        }
+    return JSONResponse(response)
+
+
+def tf_predict_from_bytes(imgdata: bytes, card_format: str):
+    """
+    From the image file content generate adaptive card schema, the
+    tf-serving rest api takes the image as base64.
+    """
+    return tf_predict_card(encode_image(imgdata), card_format)
+
+
+async def predict_json(request):
+    """
+    predicts the adaptive card json for the posted image.
+    """
+    state = request.app.state
+    return await run_prediction(request, state.executor, predict_card, state)
+
+
+async def tf_predict_json(request):
+    """
+    predicts the adaptive card json for the posted image using the
+    tf-serving service for the object detection.
+    """
+    return await run_prediction(
+        request, request.app.state.executor, tf_predict_from_bytes
+    )
+
+
+async def predict_json_debug(request):
+    """
+    returns the debug images along with the predicted adaptive card json.
+    """
+    state = request.app.state
+    return await run_prediction(
+        request, state.debug_executor, debug_card, state
+    )
+
+
+async def get_card_templates(request):
+    """
+    returns adaptive card templates images in str format
+    """
+    templates = await asyncio.get_running_loop().run_in_executor(
+        request.app.state.executor, get_templates
+    )
+    return JSONResponse(templates)
+
+
+async def version(request):  # pylint: disable=unused-argument
+    """
+    Return the current deployed git_hash of this project.
+    """
+    return JSONResponse(get_version())
+
+
+async def batch_stats(request):
+    """
+    returns the current queue depth and the batch size and queue depth
+    histograms of the detection micro-batcher.
+    """
+    return JSONResponse(request.app.state.od_batcher.stats())
+
+
+async def cache_stats(request):
+    """
+    returns the hit / miss counters and the usage of the card and the
+    detection caches.
+    """
+    return JSONResponse(get_cache_stats(request.app.state))
+
+
+@asynccontextmanager
+async def lifespan(asgi_app):
+    """
+    Loads the models and the thread pools on startup and shuts down the
+    thread pools, the micro-batcher and the worker pool on exit.
+    """
+    state = asgi_app.state
+    init_service(state)
+    state.executor = ThreadPoolExecutor(max_workers=config.ASGI_WORKERS)
+    # matplotlib.pyplot drawing of the debug images isn't thread safe.
+    state.debug_executor = ThreadPoolExecutor(max_workers=1)
+    state.backpressure = Backpressure(
+        config.ASGI_MAX_IN_FLIGHT, config.ASGI_MAX_WAITING
+    )
+    try:
+        yield
+    finally:
+        state.executor.shutdown(wait=False)
+        state.debug_executor.shutdown(wait=False)
+        shutdown_service(state)
+
+
+def get_routes():
+    """
+    Returns the routes of the enabled apis, same as the flask app.
+    """
+    if config.ENABLE_TF_SERVING:
+        routes = [Route("/tf_predict_json", tf_predict_json, methods=["POST"])]
+    else:
+        routes = [Route("/predict_json", predict_json, methods=["POST"])]
+    routes += [
+        # Include more debug points along with /predict_json api.
+        Route("/predict_json_debug", predict_json_debug, methods=["POST"]),
+        Route("/get_card_templates", get_card_templates, methods=["GET"]),
+        Route("/version", version, methods=["GET"]),
+    ]
+    if config.ENABLE_MICRO_BATCHING:
+        routes.append(Route("/batch_stats", batch_stats, methods=["GET"]))
+    if config.ENABLE_CARD_CACHE or config.ENABLE_DETECTION_CACHE:
+        routes.append(Route("/cache_stats", cache_stats, methods=["GET"]))
+    return routes
+
+
+app = Starlette(routes=get_routes(), lifespan=lifespan)
@@ -3,18 +3,29 @@
 
 import sys
 import os
-import io
 import base64
 import logging
 from urllib.parse import parse_qs, urlparse
-from PIL import Image
 from flask import request
 from flask import current_app
 from flask_restplus import Resource
-from mystique.predict_card import PredictCard
 from mystique import config
-from mystique.debug import Debug
-from .utils import get_templates
+from .service import (
+    debug_card,
+    encode_image,
+    get_cache_stats,
+    predict_card,
+    tf_predict_card,
+)
+from .utils import (
+    BINARY_UPLOAD_TYPES,
+    LimitedUploadStream,
+    get_templates,
+    get_version,
+    read_upload,
+    upload_size_error,
+    UploadTooLarge,
+)
 
 
 logger = logging.getLogger("mysitque")
@@ -37,16 +48,7 @@ class GetVersion(Resource):
         The commit has will be available in env "COMMIT_SHA" or from a file
         "<project_root>/git_commit.md5"
         """
-        git_sha = os.environ.get("COMMIT_SHA")
-        branch_name = os.environ.get("BRANCH_NAME")
-        sha_file = os.path.join(cur_dir, "../git_commit.md5")
-        branch_name_file = os.path.join(cur_dir, "../git_branch_name.txt")
-        if not git_sha and os.path.exists(sha_file):
-            git_sha = open(sha_file).read().strip()
-            branch_name = open(branch_name_file).read().strip()
-
-        response = {"git_sha": git_sha, "branch": branch_name}
-        return response
+        return get_version()
 
 
 class PredictJson(Resource):
@@ -54,41 +56,80 @@ class PredictJson(Resource):
     Handling Adaptive Card Predictions
     """
 
-    def _get_card_object(
-        self, bs64_img: str, card_format: str
-    ):  # pylint: disable=no-self-use
+    def _get_card_object(self, bs64_img: str, card_format: str):
         """
         From base64 image generate adaptive card schema.
+        """
+        return self._get_card_object_from_bytes(
+            base64.b64decode(bs64_img), card_format
+        )
+
+    def _get_card_object_from_bytes(
+        self, imgdata: bytes, card_format: str
+    ):  # pylint: disable=no-self-use
+        """
+        From the image file content generate adaptive card schema.
 
         Make use of the frozen graph for inferencing.
         """
-        imgdata = base64.b64decode(bs64_img)
-        image = Image.open(io.BytesIO(imgdata))
-        predict_card = PredictCard(current_app.od_model)
-        card = predict_card.main(image=image, card_format=card_format)
-        return card
+        return predict_card(current_app, imgdata, card_format)
+
+    # pylint: disable=no-self-use
+    def _read_binary_upload(self) -> bytes:
+        """
+        Reads the raw image of a multipart [ "image" field ] or an
+        octet-stream upload, the size is checked with the Content-Length
+        before parsing the body and while reading the image in chunks. The
+        chunked uploads [ no Content-Length ] are parsed from a stream
+        bounded to the max body size, so they are never read in full.
+        :return: image file content
+        """
+        max_body_size = config.IMG_MAX_UPLOAD_SIZE
+        if request.mimetype == "multipart/form-data":
+            # the multipart body carries the part headers and boundaries
+            max_body_size += config.IMG_UPLOAD_MULTIPART_OVERHEAD
+        if (
+            request.content_length is not None
+            and request.content_length > max_body_size
+        ):
+            raise UploadTooLarge("Content-Length exceeds the upload size")
+        if request.content_length is None:
+            request.environ["wsgi.input"] = LimitedUploadStream(
+                request.environ["wsgi.input"], max_body_size
+            )
+        if request.mimetype == "multipart/form-data":
+            stream = request.files["image"].stream
+        else:
+            stream = request.stream
+        return read_upload(stream, config.IMG_MAX_UPLOAD_SIZE)
 
     def post(self):
         """
-        predicts the adaptive card json for the posted image
+        predicts the adaptive card json for the posted image, the image is
+        either posted as base64 json or as raw multipart / octet-stream
+        upload.
         :return: adaptive card json
         """
         try:
             card_format = parse_qs(urlparse(request.url).query).get(
                 "format", [None]
             )[0]
-            bs64_img = request.json.get("image", "")
-            if sys.getsizeof(bs64_img) < config.IMG_MAX_UPLOAD_SIZE:
-                response = self._get_card_object(bs64_img, card_format)
+            if request.mimetype in BINARY_UPLOAD_TYPES:
+                try:
+                    imgdata = self._read_binary_upload()
+                    response = self._get_card_object_from_bytes(
+                        imgdata, card_format
+                    )
+                except UploadTooLarge:
+                    # Upload smaller image.
+                    response = upload_size_error()
             else:
-                # Upload smaller image.
-                response = {
-                    "error": {
-                        "msg": "Upload images of size <="
-                        f" {config.IMG_MAX_UPLOAD_SIZE/(1024*1024)} MB.",
-                        "code": 1002,
-                    }
-                }
+                bs64_img = request.json.get("image", "")
+                if sys.getsizeof(bs64_img) < config.IMG_MAX_UPLOAD_SIZE:
+                    response = self._get_card_object(bs64_img, card_format)
+                else:
+                    # Upload smaller image.
+                    response = upload_size_error()
 
         except Exception as ex:  # pylint: disable=broad-except
             error_msg = f"Unhandled Error, failed to process the request: {ex}"
@@ -106,23 +147,46 @@ class TfPredictJson(PredictJson):
     Serve the card prediction using tf-serving service.
     """
 
-    # pylint: disable=bad-super-call
-    def __init__(self, *args, **kwargs):
-        self.model_name = config.TF_SERVING_MODEL_NAME
-        self.tf_server = config.TF_SERVING_URL
-        super(PredictJson, self).__init__(*args, **kwargs)
-
     def _get_card_object(self, bs64_img: str, card_format: str):
         """
         From base64 image generate adaptive card schema.
 
         Using TF serving to do the object detection.
         """
-        pic2card = PredictCard(None)
-        card = pic2card.tf_serving_main(
-            bs64_img, self.tf_server, self.model_name, card_format
-        )
-        return card
+        return tf_predict_card(bs64_img, card_format)
+
+    def _get_card_object_from_bytes(self, imgdata: bytes, card_format: str):
+        """
+        From the image file content generate adaptive card schema, the
+        tf-serving rest api takes the image as base64.
+        """
+        return self._get_card_object(encode_image(imgdata), card_format)
+
+
+class GetBatchStats(Resource):
+    """
+    Micro-batching queue statistics
+    """
+
+    def get(self):  # pylint: disable=no-self-use
+        """
+        returns the current queue depth and the batch size and queue depth
+        histograms of the detection micro-batcher.
+        """
+        return current_app.od_batcher.stats()
+
+
+class GetCacheStats(Resource):
+    """
+    Generated card and detection cache statistics
+    """
+
+    def get(self):  # pylint: disable=no-self-use
+        """
+        returns the hit / miss counters and the usage of the card and the
+        detection caches.
+        """
+        return get_cache_stats(current_app)
 
 
 class GetCardTemplates(Resource):
@@ -140,7 +204,6 @@ class GetCardTemplates(Resource):
 
 
 class DebugEndpoint(PredictJson):
-
     """
     Handles the returning the debug images from different adaptive card
     prediction models.
@@ -150,16 +213,11 @@ class DebugEndpoint(PredictJson):
     def __init__(self, *args, **kwargs):
         super(PredictJson, self).__init__(*args, **kwargs)
 
-    def _get_card_object(self, bs64_img: str, card_format: str):
+    def _get_card_object_from_bytes(self, imgdata: bytes, card_format: str):
         """
-        From base64 image generate debugging images from the adaptive
-        card prediction.
+        From the image file content generate debugging images from the
+        adaptive card prediction.
 
         Make use of the frozen graph for inferencing.
         """
-
-        imgdata = base64.b64decode(bs64_img)
-        image = Image.open(io.BytesIO(imgdata))
-        debug = Debug(current_app.od_model)
-        images = debug.main(pil_image=image, card_format=card_format)
-        return images
+        return debug_card(current_app, imgdata, card_format)
@@ -0,0 +1,152 @@
+"""
+Model loading and card prediction shared by the flask [ app.api ] and the
+ASGI [ app.asgi ] apps, the loaded models and caches are kept as the
+attributes of the app object passed around as `service`.
+"""
+import base64
+import io
+from typing import Dict
+
+from PIL import Image
+
+from mystique import config
+from mystique.cache import CardCache, DetectionCache, CachedObjectDetection
+from mystique.debug import Debug
+from mystique.micro_batcher import MicroBatcher
+from mystique.ocr import close_ocr_backend
+from mystique.predict_card import PredictCard
+from mystique.utils import DecodedImage, load_od_instance
+from mystique.worker_pool import init_worker_pool, shutdown_worker_pool
+
+
+def init_service(service):
+    """
+    Loads the object detection model along with the enabled detection
+    cache, micro-batcher and card cache.
+    @param service: app object to hold the loaded instances
+    """
+    # Start the card layout worker pool before loading the model, so the
+    # pre-forked workers doesn't carry the model memory.
+    if config.MULTI_PROC:
+        init_worker_pool()
+
+    # Load the models and cache it for request handling.
+    service.od_model = load_od_instance()
+
+    # Reuse the detections of the already seen images.
+    service.detection_cache = None
+    if config.ENABLE_DETECTION_CACHE:
+        service.detection_cache = DetectionCache(
+            config.DETECTION_CACHE_MAX_BYTES,
+            config.DETECTION_CACHE_TTL,
+            disk_dir=config.DETECTION_CACHE_DIR,
+            disk_max_bytes=config.DETECTION_CACHE_DISK_MAX_BYTES,
+        )
+        service.od_model = CachedObjectDetection(
+            service.od_model, service.detection_cache
+        )
+
+    # Batch the detections of concurrent requests.
+    service.od_batcher = None
+    if config.ENABLE_MICRO_BATCHING:
+        service.od_batcher = MicroBatcher(service.od_model)
+
+    # Cache the generated cards of the repeated uploads.
+    service.card_cache = None
+    if config.ENABLE_CARD_CACHE:
+        service.card_cache = CardCache(
+            config.CARD_CACHE_MAX_BYTES,
+            config.CARD_CACHE_TTL,
+            disk_dir=config.CARD_CACHE_DIR,
+            disk_max_bytes=config.CARD_CACHE_DISK_MAX_BYTES,
+        )
+
+
+def shutdown_service(service):
+    """
+    Stops the micro-batcher and the card layout worker pool started by
+    `init_service` and closes the OCR backend.
+    @param service: app object holding the loaded instances
+    """
+    if service.od_batcher is not None:
+        service.od_batcher.shutdown()
+    shutdown_worker_pool()
+    close_ocr_backend()
+
+
+def predict_card(service, imgdata: bytes, card_format: str) -> Dict:
+    """
+    From the image file content generate adaptive card schema.
+    Make use of the frozen graph for inferencing.
+    @param service: app object holding the loaded instances
+    @param imgdata: image file content
+    @param card_format: format specification for template data binding
+    @return: predicted card json
+    """
+    card_cache = service.card_cache
+    if card_cache is not None:
+        cache_key = card_cache.get_key(imgdata, card_format)
+        card = card_cache.get(cache_key)
+        if card is not None:
+            return card
+    # Route the detection through the micro-batcher when enabled.
+    od_model = service.od_batcher or service.od_model
+    card = PredictCard(od_model).predict_decoded(
+        DecodedImage.from_bytes(imgdata), card_format=card_format
+    )
+    # Cache only the successfully generated cards.
+    if card_cache is not None and not card.get("error"):
+        card_cache.set(cache_key, card)
+    return card
+
+
+def tf_predict_card(bs64_img: str, card_format: str) -> Dict:
+    """
+    From base64 image generate adaptive card schema.
+    Using TF serving to do the object detection.
+    @param bs64_img: base64 string of the image
+    @param card_format: format specification for template data binding
+    @return: predicted card json
+    """
+    pic2card = PredictCard(None)
+    # the url of the configured TF_SERVING_PROTOCOL
+    return pic2card.tf_serving_main(
+        bs64_img, None, config.TF_SERVING_MODEL_NAME, card_format
+    )
+
+
+def debug_card(service, imgdata: bytes, card_format: str) -> Dict:
+    """
+    From the image file content generate debugging images from the
+    adaptive card prediction.
+    @param service: app object holding the loaded instances
+    @param imgdata: image file content
+    @param card_format: format specification for template data binding
+    @return: predicted card json along with the debug image
+    """
+    image = Image.open(io.BytesIO(imgdata))
+    debug = Debug(service.od_model)
+    return debug.main(pil_image=image, card_format=card_format)
+
+
+def encode_image(imgdata: bytes) -> str:
+    """
+    Returns the base64 string of the image file content.
+    @param imgdata: image file content
+    """
+    return base64.b64encode(imgdata).decode()
+
+
+def get_cache_stats(service) -> Dict:
+    """
+    Returns the hit / miss counters and the usage of the card and the
+    detection caches.
+    @param service: app object holding the loaded instances
+    """
+    return {
+        name: cache.stats() if cache else None
+        for name, cache in [
+            ("card_cache", service.card_cache),
+            ("detection_cache", service.detection_cache),
+        ]
+    }
@@ -1,7 +1,15 @@
 """ utils for the app """
+# pylint: disable=consider-using-with
 import os
 import base64
 
+from mystique import config
+
+cur_dir = os.path.dirname(__file__)
+
+# Content types of the raw image uploads
+BINARY_UPLOAD_TYPES = ("application/octet-stream", "multipart/form-data")
+
 
 def get_templates(templates_path="assets/samples"):
     """
@@ -21,3 +29,96 @@ def get_templates(templates_path="assets/samples"):
         with open(file_path, "rb") as template:
             templates.append(base64.b64encode(template.read()).decode())
     return {"templates": templates}
+
+
+def get_version():
+    """
+    Return the current deployed git_hash of this project.
+
+    The commit has will be available in env "COMMIT_SHA" or from a file
+    "<project_root>/git_commit.md5"
+    """
+    git_sha = os.environ.get("COMMIT_SHA")
+    branch_name = os.environ.get("BRANCH_NAME")
+    sha_file = os.path.join(cur_dir, "../git_commit.md5")
+    branch_name_file = os.path.join(cur_dir, "../git_branch_name.txt")
+    if not git_sha and os.path.exists(sha_file):
+        git_sha = open(sha_file).read().strip()
+        branch_name = open(branch_name_file).read().strip()
+
+    return {"git_sha": git_sha, "branch": branch_name}
+
+
+def upload_size_error():
+    """
+    Returns the error response for the images larger than the
+    IMG_MAX_UPLOAD_SIZE.
+    """
+    return {
+        "error": {
+            "msg": "Upload images of size <="
+            f" {config.IMG_MAX_UPLOAD_SIZE/(1024*1024)} MB.",
+            "code": 1002,
+        }
+    }
+
+
+# Chunk size of the binary image upload reads
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised if the uploaded image exceeds the maximum upload size"""
+
+
+def read_upload(stream, max_size: float, chunk_size=UPLOAD_CHUNK_SIZE) -> bytes:
+    """
+    Reads the uploaded file stream in chunks, stops reading as soon as the
+    read size exceeds the max size.
+    :param stream: file like object of the upload
+    :param max_size: maximum upload size in bytes
+    :param chunk_size: size of each read
+    :return: uploaded file content
+    """
+    chunks = []
+    size = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_size:
+            raise UploadTooLarge(f"Upload exceeds {max_size} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+class LimitedUploadStream:
+    """
+    File like wrapper of the request input stream, raises UploadTooLarge as
+    soon as more than the max size is read. Used to bound the multipart
+    parsing of the chunked uploads, which have no Content-Length to check.
+    """
+
+    def __init__(self, stream, max_size: float):
+        """
+        :param stream: request input stream
+        :param max_size: maximum body size in bytes
+        """
+        self.stream = stream
+        self.max_size = max_size
+        self.read_size = 0
+
+    def _count(self, data: bytes) -> bytes:
+        self.read_size += len(data)
+        if self.read_size > self.max_size:
+            raise UploadTooLarge(f"Upload exceeds {self.max_size} bytes")
+        return data
+
+    def read(self, *args) -> bytes:
+        """Reads from the input stream"""
+        return self._count(self.stream.read(*args))
+
+    def readline(self, *args) -> bytes:
+        """Reads a line from the input stream"""
+        return self._count(self.stream.readline(*args))
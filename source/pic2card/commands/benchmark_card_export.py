@@ -0,0 +1,77 @@
+"""
+Command to measure the per card latency of the adaptive card export [ the
+alignment updates, the container properties and the template emission ],
+comparing the fused single traversal export with the traversal per pass.
+
+The cards are synthetic column-sets nested up to the given depth, each
+column holding a textbox, a nested column-set and at the last level an
+image-set and a choice-set, so the export is measured without running the
+object detection and the property extraction.
+
+Usage :
+python -m commands.benchmark_card_export --depth=4 --breadth=3
+"""
+import argparse
+import copy
+import json
+import time
+from typing import Dict, List
+
+from PIL import Image
+
+from mystique.ac_export.adaptive_card_export import (
+    FusedCardExport,
+    export_to_card_by_pass,
+)
+from tests.test_card_export import IMAGE_SIZE, build_nested_card
+
+
+def _measure(export, card_layout: List[Dict], pil_image, repeat: int):
+    """
+    Returns the mean export latency in ms and the exported card body.
+    @param export: export function of the layout structure and image
+    @param card_layout: layout structure of the card
+    @param pil_image: input design image
+    @param repeat: number of timed runs
+    """
+    runs = [copy.deepcopy(card_layout) for _ in range(repeat)]
+    start = time.perf_counter()
+    for run in runs:
+        body = export(run, pil_image)
+    return (time.perf_counter() - start) * 1000 / repeat, body
+
+
+def main(depth=4, breadth=3, repeat=20):
+    """
+    Prints the mean export latency per card of the both exports.
+    @param depth: number of the nested column-set levels
+    @param breadth: number of the columns per column-set
+    @param repeat: number of timed runs
+    """
+    pil_image = Image.new("RGB", IMAGE_SIZE, "white")
+    card_layout = build_nested_card(depth, breadth)
+    by_pass, by_pass_body = _measure(
+        export_to_card_by_pass, card_layout, pil_image, repeat
+    )
+    fused, fused_body = _measure(
+        lambda run, image: FusedCardExport(image).build_adaptive_card(run),
+        card_layout,
+        pil_image,
+        repeat,
+    )
+    n_objects = len(json.dumps(card_layout).split('"object"')) - 1
+    print(f"depth {depth}, breadth {breadth}, {n_objects} design objects")
+    print(f"export by pass: {by_pass:.3f} ms/card")
+    print(f"fused export: {fused:.3f} ms/card")
+    print(f"identical output: {by_pass_body == fused_body}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the adaptive card export"
+    )
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--breadth", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(depth=args.depth, breadth=args.breadth, repeat=args.repeat)
@@ -0,0 +1,113 @@
+"""
+Command to compare the latency and the thickness values of the morph based
+font weight extraction with the other registered font weight pipelines.
+
+The design images are split into text line sized crops and the get_weight
+of each pipeline is run on every crop having both text and background
+pixels.
+
+Usage :
+python -m commands.benchmark_font_weight --images_path=tests/test_images \
+    --font_specs font_distance_transform
+"""
+import argparse
+import glob
+import os
+import time
+from typing import List, Tuple
+
+import numpy as np
+from PIL import Image
+
+from mystique import config
+from mystique.font_properties import FontPropMorph
+from mystique.utils import load_instance_with_class_path
+
+
+def get_crops(images_path: str, crop_size: Tuple[int, int]) -> List:
+    """
+    Returns the images and the coordinates of the crops to measure.
+    @param images_path: directory of the design images
+    @param crop_size: width, height of the crops
+    @return: list of image, coordinates pairs
+    """
+    crops = []
+    for image_path in sorted(glob.glob(os.path.join(images_path, "*"))):
+        if not image_path.lower().endswith((".png", ".jpg", ".jpeg")):
+            continue
+        image = Image.open(image_path).convert("RGB")
+        width, height = image.size
+        for top in range(0, height - crop_size[1] + 1, crop_size[1]):
+            for left in range(0, width - crop_size[0] + 1, crop_size[0]):
+                coords = (left, top, left + crop_size[0], top + crop_size[1])
+                img = FontPropMorph.get_binary_image(image, coords)
+                # the morph erosion never ends on a crop without background
+                if 0 < np.count_nonzero(img) < img.size:
+                    crops.append((image, coords))
+    return crops
+
+
+def measure(font_spec, crops: List) -> Tuple[List[float], float]:
+    """
+    Returns the thickness of each crop and the mean latency in ms.
+    @param font_spec: font properties instance
+    @param crops: list of image, coordinates pairs
+    """
+    thickness = []
+    start = time.perf_counter()
+    for ctr, (image, coords) in enumerate(crops):
+        weight = font_spec.get_weight(image, coords, img_data={"uuid": ctr})
+        thickness.append(weight[ctr])
+    latency = (time.perf_counter() - start) * 1000 / max(len(crops), 1)
+    return thickness, latency
+
+
+def main(images_path: str, font_specs: List[str], crop_size: Tuple[int, int]):
+    """
+    Prints the latency and the agreement with the morph based thickness.
+    @param images_path: directory of the design images
+    @param font_specs: FONT_SPEC_REGISTRY names to compare
+    @param crop_size: width, height of the crops
+    """
+    crops = get_crops(images_path, crop_size)
+    reference, morph_latency = measure(FontPropMorph(), crops)
+    print(f"{len(crops)} crops of {crop_size[0]}x{crop_size[1]}")
+    print(f"{'font_spec':>24} {'ms/crop':>8} {'max diff':>9} {'mismatch':>9}")
+    print(f"{'font_morph':>24} {morph_latency:>8.3f} {0:>9.2f} {0:>9}")
+    for name in font_specs:
+        font_spec = load_instance_with_class_path(
+            config.FONT_SPEC_REGISTRY[name]
+        )
+        thickness, latency = measure(font_spec, crops)
+        diff = np.abs(np.array(thickness) - np.array(reference))
+        max_diff = diff.max() if crops else 0.0
+        mismatch = int(np.count_nonzero(diff > 0.01))
+        print(f"{name:>24} {latency:>8.3f} {max_diff:>9.2f} {mismatch:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the font weight pipelines"
+    )
+    parser.add_argument(
+        "--images_path", default="tests/test_images", help="Enter images path"
+    )
+    parser.add_argument(
+        "--font_specs",
+        nargs="+",
+        default=["font_distance_transform"],
+        help="FONT_SPEC_REGISTRY names to compare with font_morph",
+    )
+    parser.add_argument(
+        "--crop_size",
+        nargs=2,
+        type=int,
+        default=[200, 40],
+        help="Width and height of the crops",
+    )
+    args = parser.parse_args()
+    main(
+        images_path=args.images_path,
+        font_specs=args.font_specs,
+        crop_size=tuple(args.crop_size),
+    )
@@ -0,0 +1,149 @@
+"""
+Command to compare the latency and the detected boxes of the custom image
+pipeline at reduced working resolutions against the full resolution.
+
+For each working resolution, the image objects found by
+ImageExtraction.detect_image are matched with the full resolution objects
+at an IOU >= --iou_threshold and the precision / recall of the match is
+reported along with the mean latency.
+
+Usage :
+python -m commands.benchmark_image_extraction \
+    --images_path=tests/test_images --max_dims 1024 768 512
+"""
+import argparse
+import glob
+import os
+import time
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from mystique.image_extraction import ImageExtraction
+
+
+def get_iou(box1: Tuple, box2: Tuple) -> float:
+    """
+    Returns the intersection over union of the 2 boxes.
+    @param box1: xmin, ymin, xmax, ymax of the 1st box
+    @param box2: xmin, ymin, xmax, ymax of the 2nd box
+    """
+    width = min(box1[2], box2[2]) - max(box1[0], box2[0])
+    height = min(box1[3], box2[3]) - max(box1[1], box2[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    union = (
+        (box1[2] - box1[0]) * (box1[3] - box1[1])
+        + (box2[2] - box2[0]) * (box2[3] - box2[1])
+        - intersection
+    )
+    return intersection / union
+
+
+def count_matches(
+    reference: List[Tuple], points: List[Tuple], iou_threshold: float
+) -> int:
+    """
+    Returns the number of points greedily matched with a reference point.
+    @param reference: full resolution boxes
+    @param points: boxes to evaluate
+    @param iou_threshold: minimum iou of a match
+    """
+    unmatched = list(reference)
+    matches = 0
+    for point in points:
+        ious = [get_iou(point, ref_point) for ref_point in unmatched]
+        if ious and max(ious) >= iou_threshold:
+            del unmatched[int(np.argmax(ious))]
+            matches += 1
+    return matches
+
+
+def detect(image_path: str, max_dim: int, repeat: int) -> Tuple:
+    """
+    Runs the custom image pipeline on the image.
+    @param image_path: input image path
+    @param max_dim: working resolution, 0 for the full resolution
+    @param repeat: number of timed runs
+    @return: image points and the mean latency in ms
+    """
+    pil_image = Image.open(image_path).convert("RGB")
+    image = cv2.cvtColor(np.asarray(pil_image), cv2.COLOR_RGB2BGR)
+    image_extraction = ImageExtraction()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        image_points = image_extraction.detect_image(
+            image=image,
+            detected_coords=[],
+            pil_image=pil_image,
+            max_dim=max_dim,
+        )
+    latency = (time.perf_counter() - start) * 1000 / repeat
+    return image_points, latency
+
+
+def main(images_path: str, max_dims: List[int], repeat=5, iou_threshold=0.5):
+    """
+    Prints the latency and the matching of each working resolution.
+    @param images_path: directory of the design images
+    @param max_dims: working resolutions to compare
+    @param repeat: number of timed runs per image
+    @param iou_threshold: minimum iou of a matching box
+    """
+    image_paths = sorted(
+        path
+        for path in glob.glob(os.path.join(images_path, "*"))
+        if path.lower().endswith((".png", ".jpg", ".jpeg"))
+    )
+    results = {max_dim: [0.0, 0, 0, 0] for max_dim in [0] + max_dims}
+    for image_path in image_paths:
+        reference, latency = detect(image_path, 0, repeat)
+        results[0][0] += latency
+        for max_dim in max_dims:
+            points, latency = detect(image_path, max_dim, repeat)
+            result = results[max_dim]
+            result[0] += latency
+            result[1] += count_matches(reference, points, iou_threshold)
+            result[2] += len(points)
+            result[3] += len(reference)
+
+    print(f"{len(image_paths)} images, iou >= {iou_threshold}")
+    print(f"{'max_dim':>8} {'ms/image':>10} {'precision':>10} {'recall':>8}")
+    for max_dim, (latency, matches, n_points, n_reference) in results.items():
+        latency /= max(len(image_paths), 1)
+        if max_dim == 0:
+            print(f"{'full':>8} {latency:>10.2f} {1:>10.3f} {1:>8.3f}")
+            continue
+        precision = matches / n_points if n_points else 1.0
+        recall = matches / n_reference if n_reference else 1.0
+        print(
+            f"{max_dim:>8} {latency:>10.2f} {precision:>10.3f} {recall:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the image extraction working resolution"
+    )
+    parser.add_argument(
+        "--images_path", default="tests/test_images", help="Enter images path"
+    )
+    parser.add_argument(
+        "--max_dims",
+        nargs="+",
+        type=int,
+        default=[1024, 768, 512, 384],
+        help="Working resolutions to compare",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--iou_threshold", type=float, default=0.5)
+    args = parser.parse_args()
+    main(
+        images_path=args.images_path,
+        max_dims=args.max_dims,
+        repeat=args.repeat,
+        iou_threshold=args.iou_threshold,
+    )
@@ -0,0 +1,91 @@
+"""
+Command to measure the per card latency of the hierarchical layout
+generation [ row / column grouping and the container merging ].
+
+The design objects are read from the labelImg annotations of the dataset,
+so the layout is measured without running the object detection model.
+
+Usage :
+python -m commands.benchmark_layout --annotations_path=data/test
+"""
+import argparse
+import copy
+import glob
+import os
+import time
+import xml.etree.ElementTree as Et
+from typing import Dict, List
+
+from mystique import config
+from mystique.card_layout.row_column_group import get_layout_structure
+
+LABEL_TO_ID = {
+    label: class_id for class_id, label in config.ID_TO_LABEL.items()
+}
+
+
+def load_design_objects(xml_path: str) -> List[Dict]:
+    """
+    Returns the design objects of the annotation in the layout input format.
+    @param xml_path: labelImg annotation path
+    """
+    design_objects = []
+    root = Et.parse(xml_path).getroot()
+    for ctr, member in enumerate(root.findall("object")):
+        label = member.find("name").text
+        xmin, ymin, xmax, ymax = [
+            float(member.find("bndbox").find(key).text)
+            for key in ["xmin", "ymin", "xmax", "ymax"]
+        ]
+        design_objects.append(
+            {
+                "object": label,
+                "xmin": xmin,
+                "ymin": ymin,
+                "xmax": xmax,
+                "ymax": ymax,
+                "coordinates": (xmin, ymin, xmax, ymax),
+                "score": 1.0,
+                "uuid": str(ctr),
+                "class": LABEL_TO_ID.get(label, 0),
+            }
+        )
+    return design_objects
+
+
+def main(annotations_path: str, repeat=10):
+    """
+    Prints the mean layout generation latency per card.
+    @param annotations_path: directory of the labelImg annotations
+    @param repeat: number of timed runs per card
+    """
+    cards = [
+        load_design_objects(xml_path)
+        for xml_path in sorted(
+            glob.glob(os.path.join(annotations_path, "*.xml"))
+        )
+    ]
+    latency = 0.0
+    for design_objects in cards:
+        runs = [copy.deepcopy(design_objects) for _ in range(repeat)]
+        start = time.perf_counter()
+        for run in runs:
+            get_layout_structure(run)
+        latency += (time.perf_counter() - start) * 1000 / repeat
+    n_objects = sum(len(design_objects) for design_objects in cards)
+    print(f"{len(cards)} cards, {n_objects} design objects")
+    print(f"layout: {latency / max(len(cards), 1):.3f} ms/card")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the card layout generation"
+    )
+    parser.add_argument(
+        "--annotations_path",
+        default="data/test",
+        help="Enter the labelImg annotations path",
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    main(annotations_path=args.annotations_path, repeat=args.repeat)
@@ -27,8 +27,9 @@ os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
     "-t",
     "--tf_server",
     required=False,
-    default=config.TF_SERVING_URL,
-    help="TF serving base URL",
+    default=None,
+    help="TF serving base URL, TF_SERVING_URL or TF_SERVING_GRPC_URL of the"
+    " configured TF_SERVING_PROTOCOL by default",
 )
 @click.option(
     "-n",
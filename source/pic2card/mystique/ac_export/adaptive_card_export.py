@@ -6,6 +6,7 @@ from typing import List, Dict, Union
 
 from PIL import Image
 
+from mystique import config
 from mystique.card_layout.ds_helper import DsHelper, ContainerDetailTemplate
 from mystique.extract_properties import ContainerProperties
 from mystique.card_layout import property_updates
@@ -20,6 +21,21 @@ def export_to_card(card_layout: List[Dict], pil_image: Image) -> List[Dict]:
     @param pil_image: Input design image
     @return: Exported adaptive card json body
     """
+    if config.FUSED_CARD_EXPORT:
+        return FusedCardExport(pil_image).build_adaptive_card(card_layout)
+    return export_to_card_by_pass(card_layout, pil_image)
+
+
+def export_to_card_by_pass(
+    card_layout: List[Dict], pil_image: Image
+) -> List[Dict]:
+    """
+    Returns the exported adaptive card design body, traversing the layout
+    structure once for each of the property updates and the export.
+    @param card_layout: Generated hierarchical layout structure.
+    @param pil_image: Input design image
+    @return: Exported adaptive card json body
+    """
     export_card = AdaptiveCardExport()
     container_details_object = ContainerDetailTemplate()
     # update the extracted properties
@@ -66,15 +82,9 @@ class AdaptiveCardExport:
             template_object = getattr(
                 self.object_template, design_object.get("object", "")
             )
-            card_template = template_object(design_object)
-            if (
-                body
-                and design_object.get("object") == "radiobutton"
-                and body[-1].get("type") == "Input.ChoiceSet"
-            ):
-                body[-1]["choices"].append(card_template["choices"][0])
-            else:
-                body.append(card_template)
+            self.append_template(
+                body, design_object, template_object(design_object)
+            )
         elif isinstance(design_object, list):
             for design_obj in design_object:
                 self.export_card_body(body, design_obj)
@@ -85,6 +95,26 @@ class AdaptiveCardExport:
             )
             ac_containers_object(body)
 
+    # pylint: disable=no-self-use
+    def append_template(
+        self, body: List[Dict], design_object: Dict, card_template: Dict
+    ) -> None:
+        """
+        Appends the design element's template to the body, the radiobuttons
+        following a choice-set are merged as it's choices.
+        @param body: adaptive card json body
+        @param design_object: design element
+        @param card_template: design element's adaptive card template
+        """
+        if (
+            body
+            and design_object.get("object") == "radiobutton"
+            and body[-1].get("type") == "Input.ChoiceSet"
+        ):
+            body[-1]["choices"].append(card_template["choices"][0])
+        else:
+            body.append(card_template)
+
     def build_adaptive_card(self, card_layout: List[Dict]) -> List:
         """
         Returns the exported adaptive card json
@@ -101,3 +131,116 @@ class AdaptiveCardExport:
             )
         ]
         return body
+
+
+class FusedCardExport(AdaptiveCardExport):
+    """
+    Exports the layout structure in a single traversal of the card tree.
+    The alignment updates and the container properties of a container's
+    items are done right before their templates are emitted, instead of a
+    separate recursive pass for each of them, and the per node getattr
+    dispatch is replaced by the tables built once per export.
+    """
+
+    def __init__(self, pil_image: Image):
+        """
+        @param pil_image: Input design image
+        """
+        super().__init__()
+        self.pil_image = pil_image
+        self.ds_alignment = property_updates.DsAlignment()
+        container_properties = ContainerProperties(pil_image=pil_image)
+        self.container_items = {
+            name: getattr(self.container_detail, name)
+            for name in DsHelper.CONTAINERS
+        }
+        # column and choice-set have no container properties
+        self.container_property = {
+            "columnset": container_properties.columnset,
+            "imageset": container_properties.imageset,
+        }
+        # template key of the children, the choice-set's radiobuttons are
+        # merged into the choice-set template itself
+        self.child_body = {
+            "columnset": "columns",
+            "column": "items",
+            "imageset": "images",
+            "choiceset": None,
+        }
+        self.templates = {
+            name: getattr(self.object_template, name)
+            for name in dir(self.object_template)
+            if not name.startswith("_")
+        }
+
+    def align_items(
+        self, design_objects: List[Dict], parent_object=None, align=True
+    ) -> None:
+        """
+        Sets the horizontal alignment of the design elements of a container
+        and resolves the conflicting ones.
+        @param design_objects: design elements of the container
+        @param parent_object: the container, None for the root elements
+        @param align: False below a single element container, whose elements
+                      keep their extracted alignment
+        """
+        if align:
+            for design_object in design_objects:
+                self.ds_alignment.align_object(
+                    design_object,
+                    parent_object=parent_object,
+                    image=self.pil_image,
+                )
+        self.ds_alignment.resolve_conflicts(design_objects)
+
+    def export_card_body(
+        self, body: List[Dict], design_object: Union[List, Dict]
+    ) -> None:
+        """
+        Aligns the root elements of the layout structure and exports them.
+        @param body: adaptive card json body
+        @param design_object: design objects from the layout structure
+        """
+        self.align_items(design_object)
+        for design_obj in design_object:
+            self.export_object(body, design_obj)
+
+    def export_object(
+        self, body: List[Dict], design_object: Dict, align=True
+    ) -> None:
+        """
+        Recursively exports the design element and it's children, whose
+        alignment is updated before the container's template is emitted.
+        @param body: adaptive card json body
+        @param design_object: aligned design element
+        @param align: if the children's alignment has to be updated
+        """
+        object_name = design_object.get("object", "")
+        container_items = self.container_items.get(object_name)
+        if not container_items:
+            template_object = self.templates.get(object_name) or getattr(
+                self.object_template, object_name
+            )
+            self.append_template(
+                body, design_object, template_object(design_object)
+            )
+            return
+
+        items = container_items(design_object)
+        if align and len(items) == 1:
+            self.ds_alignment.align_single_item(items)
+        align = align and len(items) != 1
+        self.align_items(items, parent_object=design_object, align=align)
+
+        property_object = self.container_property.get(object_name)
+        if property_object:
+            container_property = property_object(design_object)
+            if container_property:
+                design_object.update(container_property)
+
+        body.append(self.templates[object_name](design_object))
+        child_body = self.child_body[object_name]
+        if child_body:
+            body = body[-1][child_body]
+        for item in items:
+            self.export_object(body, item, align=align)
@@ -0,0 +1,369 @@
+"""
+Content addressed caches for the card prediction pipeline.
+
+The caches are LRU with a time to live, bounded by the total size of the
+cached values in bytes, and can be backed by an optional on-disk tier which
+outlives the process and is shared by the workers. The disk tier is bounded
+by the total size of its files, the oldest written files are evicted first.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from mystique import config
+
+logger = logging.getLogger("mysitque")
+
+
+def content_hash(*parts) -> str:
+    """
+    Returns the sha256 hex digest of the given bytes / str parts.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        digest.update(part)
+        # separator to keep ("ab", "c") and ("a", "bc") apart
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class LruTtlCache:
+    """
+    Thread safe LRU cache with time to live and a size bound in bytes.
+
+    Sub classes define how a value is sized and stored in the disk tier by
+    overriding `get_size`, `dump` and `load`.
+    """
+
+    SUFFIX = ".bin"
+
+    def __init__(
+        self,
+        max_bytes: float,
+        ttl: float,
+        disk_dir: str = None,
+        disk_max_bytes: float = None,
+    ):
+        """
+        @param max_bytes: maximum total size of the in-memory values
+        @param ttl: time to live of a cached value in seconds
+        @param disk_dir: directory of the on-disk tier, disabled if None
+        @param disk_max_bytes: maximum total size of the disk tier files,
+                               defaults to 10 times the in-memory bound
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        if disk_max_bytes is None:
+            self.disk_max_bytes = 10 * max_bytes
+        self.disk_evictions = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # estimated size of the disk tier, the directory is only scanned
+        # when the estimate crosses the bound
+        self._disk_bytes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+    # pylint: disable=no-self-use
+    def get_size(self, value: Any) -> int:
+        """Returns the size of the value in bytes"""
+        return len(value)
+
+    # pylint: disable=no-self-use
+    def dump(self, value: Any, path: str) -> None:
+        """Writes the value to the disk tier file"""
+        with open(path, "wb") as cache_file:
+            cache_file.write(value)
+
+    # pylint: disable=no-self-use
+    def load(self, path: str) -> Any:
+        """Reads the value from the disk tier file"""
+        with open(path, "rb") as cache_file:
+            return cache_file.read()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + self.SUFFIX)
+
+    def _disk_files(self) -> List:
+        """Returns the (mtime, size, path) of the disk tier files"""
+        files = []
+        with os.scandir(self.disk_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(self.SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    # removed by an other worker
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _evict_disk(self) -> None:
+        """Drop the oldest disk tier files until fits the size bound"""
+        files = sorted(self._disk_files())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.disk_evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._disk_bytes = total
+
+    def _set_disk(self, key: str, value: Any) -> None:
+        """
+        Writes the value to the disk tier, the write errors are logged as
+        the disk tier is only an optimization.
+        """
+        path = self._disk_path(key)
+        # write and rename, so readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self.dump(value, tmp_path)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+            with self._lock:
+                self._disk_bytes += size
+                if self._disk_bytes > self.disk_max_bytes:
+                    self._evict_disk()
+        except OSError as err:
+            logger.warning("Failed to write the disk cache %s: %s", path, err)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _evict(self) -> None:
+        """Drop the least recently used values until fits the size bound"""
+        while self._entries and self.current_bytes > self.max_bytes:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+
+    def _set_memory(self, key: str, value: Any, created_at: float) -> None:
+        size = self.get_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key)[2]
+        self._entries[key] = (value, created_at, size)
+        self.current_bytes += size
+        self._evict()
+
+    def _get_disk(self, key: str) -> Optional[Any]:
+        """Returns the unexpired value from the disk tier if any"""
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            created_at = os.path.getmtime(path)
+            if time.time() - created_at > self.ttl:
+                os.remove(path)
+                return None
+            value = self.load(path)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self._set_memory(key, value, created_at)
+        return value
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the cached value for the key or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, created_at, size = entry
+                if time.time() - created_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.current_bytes -= size
+        value = self._get_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.disk_hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Cache the value for the key in memory and in the disk tier
+        """
+        with self._lock:
+            self._set_memory(key, value, time.time())
+        if self.disk_dir:
+            self._set_disk(key, value)
+
+    def stats(self) -> Dict:
+        """Returns the hit / miss counters and the cache usage"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "disk_evictions": self.disk_evictions,
+            }
+
+
+class CardCache(LruTtlCache):
+    """
+    Cache of the generated card responses, the responses are kept as
+    serialized json so that callers always get a fresh copy.
+    """
+
+    SUFFIX = ".json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        value = super().get(key)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Dict) -> None:
+        super().set(key, json.dumps(value).encode())
+
+    @staticmethod
+    def get_key(imgdata: bytes, card_format: str) -> str:
+        """
+        Returns the cache key of the card for the decoded image bytes, the
+        card format and the active object detection model.
+        """
+        return content_hash(imgdata, str(card_format), config.ACTIVE_MODEL_NAME)
+
+
+class DetectionCache(LruTtlCache):
+    """
+    Cache of the raw object detection output dicts, stored as .npz files in
+    the disk tier.
+    """
+
+    SUFFIX = ".npz"
+
+    def get_size(self, value: Dict) -> int:
+        return sum(np.asarray(array).nbytes for array in value.values())
+
+    def dump(self, value: Dict, path: str) -> None:
+        with open(path, "wb") as cache_file:
+            np.savez(cache_file, **value)
+
+    def load(self, path: str) -> Dict:
+        with np.load(path) as data:
+            return {key: data[key] for key in data.files}
+
+    def get(self, key: str) -> Optional[Dict]:
+        value = super().get(key)
+        if value is None:
+            return None
+        # callers are free to update the output dict and arrays
+        return {name: np.array(array) for name, array in value.items()}
+
+    def set(self, key: str, value: Dict) -> None:
+        super().set(
+            key, {name: np.array(array) for name, array in value.items()}
+        )
+
+    @staticmethod
+    def get_key(image_np: np.array) -> str:
+        """
+        Returns the cache key of the detections for the decoded image
+        pixels and the active object detection model.
+        """
+        return content_hash(
+            str(image_np.shape),
+            np.ascontiguousarray(image_np).tobytes(),
+            config.ACTIVE_MODEL_NAME,
+        )
+
+
+class CachedObjectDetection:
+    """
+    Wraps an object detection model and serves the repeated images from
+    the detection cache, so tuning the layout and export thresholds doesn't
+    re-run the model.
+    """
+
+    def __init__(self, od_model, cache: DetectionCache):
+        """
+        @param od_model: object detection model instance
+        @param cache: DetectionCache instance
+        """
+        self.od_model = od_model
+        self.cache = cache
+
+    def get_objects(self, image_np: np.array, image: Image) -> Dict:
+        """
+        Returns the cached detections of the image or runs the model.
+        @param image_np: Image tensor, dimension should be HxWx3
+        @param image: PIL Image object
+        @return: ouput dict from the object detection model
+        """
+        key = self.cache.get_key(image_np)
+        output_dict = self.cache.get(key)
+        if output_dict is None:
+            output_dict = self.od_model.get_objects(
+                image_np=image_np, image=image
+            )
+            self.cache.set(key, output_dict)
+        return output_dict
+
+    def get_objects_batch(
+        self, images_np: List[np.array], images: List[Image.Image]
+    ) -> List[Dict]:
+        """
+        Returns the detections of the images, only the cache misses are
+        passed to the model as a batch.
+        @param images_np: list of image tensors, dimension should be HxWx3
+        @param images: list of PIL Image objects
+        @return: list of output dicts
+        """
+        keys = [self.cache.get_key(image_np) for image_np in images_np]
+        output_dicts = [self.cache.get(key) for key in keys]
+        missed = [
+            ctr
+            for ctr, output_dict in enumerate(output_dicts)
+            if output_dict is None
+        ]
+        if missed:
+            missed_images_np = [images_np[ctr] for ctr in missed]
+            missed_images = [images[ctr] for ctr in missed]
+            if hasattr(self.od_model, "get_objects_batch"):
+                results = self.od_model.get_objects_batch(
+                    missed_images_np, missed_images
+                )
+            else:
+                results = [
+                    self.od_model.get_objects(image_np=image_np, image=image)
+                    for image_np, image in zip(missed_images_np, missed_images)
+                ]
+            for ctr, output_dict in zip(missed, results):
+                self.cache.set(keys[ctr], output_dict)
+                output_dicts[ctr] = output_dict
+        return output_dicts
@@ -2,7 +2,11 @@
 - IOU finding
 - nosie objects [ i.e overlapping objects ] removal
 """
-from typing import List, Dict, Union
+from typing import List, Dict, Tuple, Union
+
+import numpy as np
+
+from mystique import config
 
 
 def find_iou(coord1, coord2, threshold=0.5) -> List:
@@ -91,49 +95,117 @@ def remove_actionset_textbox_overlapping(
         return None
 
 
-def remove_noise_objects(predicted_objects: Dict):
+def get_candidate_pairs(boxes: np.ndarray, mode: str) -> Tuple:
+    """
+    Returns the (i, j), i < j index pairs of the boxes to be compared.
+    "matrix" mode returns all the pairs, "sweep" mode sorts the boxes by
+    xmin and returns only the pairs whose x ranges overlap or touch, which
+    are the only pairs that can intersect or contain each other.
+    @param boxes: Nx4 array of xmin, ymin, xmax, ymax
+    @param mode: matrix / sweep
+    @return: row and column index arrays
+    """
+    n_boxes = boxes.shape[0]
+    if mode == "matrix":
+        return np.triu_indices(n_boxes, k=1)
+    order = np.argsort(boxes[:, 0], kind="stable")
+    xmins = boxes[order, 0]
+    # for each box, boxes sorted after it with xmin <= its xmax
+    ends = np.searchsorted(xmins, boxes[order, 2], side="right")
+    starts = np.arange(1, n_boxes + 1)
+    counts = np.maximum(ends - starts, 0)
+    sorted_rows = np.repeat(np.arange(n_boxes), counts)
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    sorted_cols = np.arange(counts.sum()) - offsets + np.repeat(starts, counts)
+    rows, cols = order[sorted_rows], order[sorted_cols]
+    return np.minimum(rows, cols), np.maximum(rows, cols)
+
+
+def remove_noise_objects(predicted_objects: Dict, mode=None):
     """
     Removes all noisy objects by eliminating all smaller and intersecting
             objects within / with the bigger objects.
+    The pairwise intersection, IOU and containment checks are done as numpy
+    operations over the candidate pairs, and the removal decisions are
+    taken over the overlapping pairs only in the same order as comparing
+    each pair of objects one by one.
     @param predicted_objects: list of detected objects.
+    @param mode: candidate pairs selection, matrix [ all pairs ] or sweep
+                 [ sorted x ranges ], by default sweep is used above
+                 config.NOISE_REMOVAL_SWEEP_MIN_OBJECTS objects
     """
-    points = []
-    for deisgn_object in predicted_objects["objects"]:
-        points.append(deisgn_object.get("coordinates"))
-    positions_to_delete = []
-    for ctr, point in enumerate(points):
-        box1 = point
-        for ctr1 in range(ctr + 1, len(points)):
-            box2 = points[ctr1]
-            # check if there's a textbox vs actionset overlap
-            # remove the textbox
-            position = remove_actionset_textbox_overlapping(
-                predicted_objects["objects"][ctr],
-                predicted_objects["objects"][ctr1],
-                box1,
-                box2,
-                ctr,
-                ctr1,
-            )
-            if position:
-                positions_to_delete.append(position)
-            else:
-                iou = find_iou(box1, box2)
-                if iou[0]:
-                    box1_area = iou[1]
-                    box2_area = iou[2]
-                    if (
-                        box1_area > box2_area
-                        and ctr1 not in positions_to_delete
-                    ):
-                        positions_to_delete.append(ctr1)
-                    elif ctr not in positions_to_delete:
-                        positions_to_delete.append(ctr)
+    design_objects = predicted_objects["objects"]
+    if len(design_objects) < 2:
+        return
+    if mode is None:
+        mode = (
+            "sweep"
+            if len(design_objects) >= config.NOISE_REMOVAL_SWEEP_MIN_OBJECTS
+            else "matrix"
+        )
     points = [
-        p for ctr, p in enumerate(points) if ctr not in positions_to_delete
+        design_object.get("coordinates") for design_object in design_objects
     ]
+    boxes = np.asarray(points)
+    names = np.array(
+        [design_object.get("object", "") for design_object in design_objects]
+    )
+    rows, cols = get_candidate_pairs(boxes, mode)
+    xmin, ymin, xmax, ymax = boxes.T
+    areas = (xmax - xmin) * (ymax - ymin)
+
+    # intersection and iou of the pairs, same as find_iou
+    width = np.minimum(xmax[rows], xmax[cols]) - np.maximum(
+        xmin[rows], xmin[cols]
+    )
+    height = np.minimum(ymax[rows], ymax[cols]) - np.maximum(
+        ymin[rows], ymin[cols]
+    )
+    intersects = (width > 0) & (height > 0)
+    intersection = np.where(intersects, width * height, 0)
+    union = areas[rows] + areas[cols] - intersection
+    with np.errstate(divide="ignore", invalid="ignore"):
+        iou = intersection / union
+        coverage = intersection / np.minimum(areas[rows], areas[cols])
+    overlaps = intersects & ((union == 0) | (iou >= 0.5) | (coverage >= 0.50))
+
+    # textbox vs actionset overlap, same as
+    # remove_actionset_textbox_overlapping
+    is_textbox, is_actionset = names == "textbox", names == "actionset"
+    actionset_pair = (is_actionset[rows] & is_textbox[cols]) | (
+        is_textbox[rows] & is_actionset[cols]
+    )
+    contains = (
+        (xmin[cols] <= xmin[rows])
+        & (xmin[rows] <= xmax[cols])
+        & (ymin[cols] <= ymin[rows])
+        & (ymin[rows] <= ymax[cols])
+    )
+    textbox_position = np.where(is_textbox[rows], rows, cols)
+    # position 0 is skipped as in the pairwise comparison
+    remove_textbox = (
+        actionset_pair & (contains | intersects) & (textbox_position != 0)
+    )
+
+    flagged = np.flatnonzero(remove_textbox | overlaps)
+    # decide in the order of the pairwise comparison
+    flagged = flagged[np.lexsort((cols[flagged], rows[flagged]))]
+    positions_to_delete = set()
+    for pair in flagged:
+        ctr, ctr1 = rows[pair], cols[pair]
+        if remove_textbox[pair]:
+            positions_to_delete.add(textbox_position[pair])
+        elif areas[ctr] > areas[ctr1] and ctr1 not in positions_to_delete:
+            positions_to_delete.add(ctr1)
+        elif ctr not in positions_to_delete:
+            positions_to_delete.add(ctr)
+    points = {
+        tuple(p)
+        for ctr, p in enumerate(points)
+        if ctr not in positions_to_delete
+    }
     predicted_objects["objects"] = [
         deisgn_object
-        for deisgn_object in predicted_objects["objects"]
-        if deisgn_object.get("coordinates") in points
+        for deisgn_object in design_objects
+        if tuple(deisgn_object.get("coordinates")) in points
     ]
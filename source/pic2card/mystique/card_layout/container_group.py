@@ -5,9 +5,12 @@ from operator import itemgetter
 from typing import List, Dict, Union, Tuple
 
 # pylint: disable=relative-beyond-top-level
-import pandas as pd
-
-from .ds_helper import DsHelper, ContainerTemplate, ContainerDetailTemplate
+from .ds_helper import (
+    DsHelper,
+    ContainerTemplate,
+    ContainerDetailTemplate,
+    sort_by_coordinate,
+)
 
 
 class ContainerGroup:
@@ -33,14 +36,12 @@ class ContainerGroup:
                  other elements inside the passed container
         """
         items = []
+        remaining_items = []
         for design_object in card_layout:
             if design_object.get("class", 0) == object_class:
                 items.append(design_object)
-        remaining_items = [
-            design_object
-            for design_object in card_layout
-            if design_object not in items
-        ]
+            else:
+                remaining_items.append(design_object)
         return items, remaining_items
 
     def add_merged_items(
@@ -85,8 +86,12 @@ class ContainerGroup:
                     card_layout[-1][object_type][key].append(item)
                     coordinates.append(item.get("coordinates", []))
 
+                # the grouped items are the same dicts as in the layout
+                grouped_items = set(map(id, items["objects"]))
                 card_layout = [
-                    item for item in card_layout if item not in items["objects"]
+                    item
+                    for item in card_layout
+                    if id(item) not in grouped_items
                 ]
         return card_layout
 
@@ -106,38 +111,12 @@ class ContainerGroup:
         )
         if items:
             # order the container elements based on the order_key
-            items = [
-                value
-                for _, value in sorted(
-                    zip(
-                        list(zip(*pd.DataFrame(items)["coordinates"]))[
-                            order_key
-                        ],
-                        items,
-                    ),
-                    key=lambda value: value[0],
-                )
-            ]
+            items = sort_by_coordinate(items, order_key)
         updated_column_items = self.add_merged_items(
             items, column_items, payload
         )
         if updated_column_items:
-            updated_column_items = [
-                value
-                for _, value in sorted(
-                    zip(
-                        list(
-                            zip(
-                                *pd.DataFrame(updated_column_items)[
-                                    "coordinates"
-                                ]
-                            )
-                        )[1],
-                        updated_column_items,
-                    ),
-                    key=lambda value: value[0],
-                )
-            ]
+            updated_column_items = sort_by_coordinate(updated_column_items, 1)
         if remaining_items:
             self.merge_column_items(updated_column_items, payload)
         return updated_column_items
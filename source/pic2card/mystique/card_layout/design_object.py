@@ -0,0 +1,122 @@
+"""
+Compact models of the detected design objects.
+
+DesignObjects keeps the detected objects of a card as a struct of arrays
+[ labels, boxes, scores, classes, uuids ], which pickles as a handful of
+arrays instead of a dict with NumPy scalars per object when the objects are
+sent to the worker processes. DesignObject is the __slots__ record of a
+single object. Both convert to the design object dicts used by the layout
+and the export with `to_dict` / `to_dicts`.
+"""
+import uuid
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+# Keys of the design object dicts built from the detection.
+DETECTED_KEYS = (
+    "object",
+    "xmin",
+    "ymin",
+    "xmax",
+    "ymax",
+    "coordinates",
+    "score",
+    "uuid",
+    "class",
+)
+
+
+class DesignObject:
+    """
+    A single detected design object.
+    """
+
+    __slots__ = ("object", "coordinates", "score", "uuid", "class_id")
+
+    def __init__(self, object_name, coordinates, score, uuid_, class_id):
+        """
+        @param object_name: design object label eg; textbox
+        @param coordinates: xmin, ymin, xmax, ymax of the object
+        @param score: detection score
+        @param uuid_: unique id of the object in the card
+        @param class_id: detected class id
+        """
+        self.object = object_name
+        self.coordinates = coordinates
+        self.score = score
+        self.uuid = uuid_
+        self.class_id = class_id
+
+    def to_dict(self) -> Dict:
+        """Returns the design object dict"""
+        xmin, ymin, xmax, ymax = self.coordinates
+        return {
+            "object": self.object,
+            "xmin": xmin,
+            "ymin": ymin,
+            "xmax": xmax,
+            "ymax": ymax,
+            "coordinates": (xmin, ymin, xmax, ymax),
+            "score": self.score,
+            "uuid": self.uuid,
+            "class": self.class_id,
+        }
+
+
+class DesignObjects:
+    """
+    Detected design objects of a card as a struct of arrays.
+    """
+
+    __slots__ = ("labels", "boxes", "scores", "classes", "uuids")
+
+    def __init__(
+        self,
+        labels: np.array,
+        boxes: np.array,
+        scores: np.array,
+        classes: np.array,
+        uuids: List[str] = None,
+    ):
+        """
+        @param labels: design object labels
+        @param boxes: Nx4 array of xmin, ymin, xmax, ymax
+        @param scores: detection scores
+        @param classes: detected class ids
+        @param uuids: unique ids of the objects, new uuid4 strings if None
+        """
+        self.labels = np.asarray(labels)
+        self.boxes = np.asarray(boxes).reshape(-1, 4)
+        self.scores = np.asarray(scores)
+        self.classes = np.asarray(classes)
+        if uuids is None:
+            uuids = [str(uuid.uuid4()) for _ in range(len(self.boxes))]
+        self.uuids = list(uuids)
+
+    def __len__(self) -> int:
+        return len(self.uuids)
+
+    def __iter__(self) -> Iterator[DesignObject]:
+        for label, box, score, class_id, uuid_ in zip(
+            self.labels, self.boxes, self.scores, self.classes, self.uuids
+        ):
+            yield DesignObject(str(label), tuple(box), score, uuid_, class_id)
+
+    @classmethod
+    def from_dicts(cls, design_objects: List[Dict]):
+        """
+        Returns the struct of arrays of the design object dicts.
+        @param design_objects: design object dicts of the detection
+        """
+        return cls(
+            [obj["object"] for obj in design_objects],
+            [obj["coordinates"] for obj in design_objects],
+            [obj["score"] for obj in design_objects],
+            [obj["class"] for obj in design_objects],
+            [obj["uuid"] for obj in design_objects],
+        )
+
+    def to_dicts(self) -> List[Dict]:
+        """Returns the design object dicts"""
+        return [design_object.to_dict() for design_object in self]
@@ -2,13 +2,32 @@
 the layout generation"""
 # pylint: disable=relative-beyond-top-level
 
+from operator import itemgetter
 from typing import List, Tuple, Dict, Union
 
-import pandas as pd
-
 from .objects_group import ChoicesetGrouping
 
 
+def sort_by_key(design_objects: List[Dict], key: str) -> List[Dict]:
+    """
+    Returns the design objects sorted on the key, the objects having the
+    same key value keep their order.
+    @param design_objects: list of design objects
+    @param key: coordinate key eg; ymin
+    """
+    return sorted(design_objects, key=itemgetter(key))
+
+
+def sort_by_coordinate(design_objects: List[Dict], index: int) -> List[Dict]:
+    """
+    Returns the design objects sorted on the coordinate at the index, the
+    objects having the same coordinate keep their order.
+    @param design_objects: list of design objects
+    @param index: index of the coordinate in xmin, ymin, xmax, ymax
+    """
+    return sorted(design_objects, key=lambda obj: obj["coordinates"][index])
+
+
 class DsHelper:
     """
     Base class for layout ds utilities and template handling.
@@ -25,28 +44,35 @@ class DsHelper:
 
     def merge_properties(
         self,
-        properties: List[Dict],
+        properties: Union[List[Dict], Dict[str, Dict]],
         design_object: List[Dict],
         container_details_object: object,
     ) -> None:
         """
         Merges the design objects with properties with the appropriate layout
         structure with the help of the uuid.
-        @param properties: design objects with properties
+        The properties are indexed by the uuid once for the card and are left
+        unchanged, the layout keeps its own coordinates.
+        @param properties: design objects with properties, or the uuid to
+                           design object index of them
         @param design_object: layout data structure
         @param container_details_object: ContainerDetailsTemplate object
         """
+        if isinstance(properties, list):
+            # the first design object of a uuid wins, as in the list scan
+            properties = {
+                prop.get("uuid", ""): prop for prop in reversed(properties)
+            }
         if (
             isinstance(design_object, dict)
             and design_object.get("object", "") not in DsHelper.CONTAINERS
         ):
-            extracted_properties = [
-                prop
-                for prop in properties
-                if prop.get("uuid", "") == design_object.get("uuid")
-            ][0]
-            extracted_properties.pop("coordinates")
-            design_object.update(extracted_properties)
+            extracted_properties = properties[design_object.get("uuid")]
+            design_object.update(
+                (key, value)
+                for key, value in extracted_properties.items()
+                if key != "coordinates"
+            )
 
         elif isinstance(design_object, list):
             for design_obj in design_object:
@@ -113,16 +139,7 @@ class DsHelper:
         @param card_layout: adaptive card body
         @return: debugging data-structure format
         """
-        card_layout = [
-            value
-            for _, value in sorted(
-                zip(
-                    list(zip(*pd.DataFrame(card_layout)["coordinates"]))[1],
-                    card_layout,
-                ),
-                key=lambda value: value[0],
-            )
-        ]
+        card_layout = sort_by_coordinate(card_layout, 1)
 
         self.export_debug_string(
             self.serialized_layout, card_layout, card_layout, indentation=0
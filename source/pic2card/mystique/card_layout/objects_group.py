@@ -57,23 +57,26 @@ class GroupObjects:
         groups them based on the passed conditions and while grouping
         updates the grouped list of object's coordinates for each element
         addition.
+        The group membership is tracked with the ids of the design objects
+        instead of comparing the dicts, so the cost doesn't depend on the
+        size of the design object dicts.
         @param design_objects: objects
         @param condition: Grouping condition function
         @return: Grouped list of design objects.
         """
         groups = []
-        for _, design_object in enumerate(
-            design_objects
-        ):  # pylint: disable=unused-variable
+        # ids and object names of the design objects in the last group
+        group_members = set()
+        group_names = set()
+        for design_object in design_objects:
             if not groups:
                 groups.append(self.update_group_objects(design_object))
+                group_members = {id(design_object)}
+                group_names = {design_object.get("object")}
             if groups:
                 bbox_1 = list(groups[-1]["coordinates"])
                 bbox_2 = list(design_object["coordinates"])
-                object_names = [
-                    obj.get("object") for obj in groups[-1].get("objects")
-                ]
-                if "image" in object_names:
+                if "image" in group_names:
                     bbox_1.append("image")
                 else:
                     bbox_1.append("group")
@@ -81,18 +84,20 @@ class GroupObjects:
 
                 if condition(bbox_1, bbox_2):
                     objects = groups[-1].get("objects")
-                    if design_object not in objects:
+                    if id(design_object) not in group_members:
                         objects.append(design_object)
+                        group_members.add(id(design_object))
+                        group_names.add(design_object.get("object"))
                         coordinates = self._update_coords(bbox_1, bbox_2)
                         groups[-1].update(
                             self.update_group_objects(
                                 objects, coordinates=coordinates
                             )
                         )
-                else:
-
-                    if design_object not in groups[-1].get("objects"):
-                        groups.append(self.update_group_objects(design_object))
+                elif id(design_object) not in group_members:
+                    groups.append(self.update_group_objects(design_object))
+                    group_members = {id(design_object)}
+                    group_names = {design_object.get("object")}
         return groups
 
 
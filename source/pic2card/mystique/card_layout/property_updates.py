@@ -29,6 +29,69 @@ class DsAlignment:
     def __init__(self):
         self.base_property = BaseExtractProperties()
 
+    def align_object(
+        self, design_object: Dict, parent_object=None, image=None
+    ) -> None:
+        """
+        Set the horizontal alignment property of a single design object based
+        on it's parent container's coordinates, or the image for the root
+        level objects.
+        @param design_object: design element to be set or updated
+        @param parent_object: parent container object
+        @param image: input pil image
+        """
+        if not parent_object:
+            parent_width = None
+            pil_image = image
+            design_element_xmin = design_object.get("coordinates", [])[0]
+            design_element_xmax = design_object.get("coordinates", [])[2]
+
+        else:
+            parent_width = abs(
+                parent_object.get("coordinates")[2]
+                - parent_object.get("coordinates")[0]
+            )
+            pil_image = None
+            design_element_xmin = abs(
+                design_object.get("coordinates")[0]
+                - parent_object.get("coordinates")[0]
+            )
+            design_element_width = abs(
+                design_object.get("coordinates")[2]
+                - design_object.get("coordinates")[0]
+            )
+            design_element_xmax = (
+                abs(
+                    parent_object.get("coordinates")[2]
+                    - design_object.get("coordinates")[2]
+                )
+                + design_element_width
+            )
+
+        # update the element's inside the container's
+        design_object.update(
+            {
+                "horizontal_alignment": self.base_property.get_alignment(
+                    xmin=design_element_xmin,
+                    xmax=design_element_xmax,
+                    width=parent_width,
+                    image=pil_image,
+                )
+            }
+        )
+
+    def align_single_item(self, container_items: List[Dict]) -> None:
+        """
+        If a container has only one element, then extract the alignment based
+        on the line numbers and top values from pytesseract data.
+        @param container_items: the only design element of the container
+        """
+        text_data = container_items[0].get("image_data", [])
+        if text_data:
+            if self._get_number_of_lines(text_data) > 1:
+                alignment = self.base_property.get_line_alignment(text_data)
+                container_items[0].update({"horizontal_alignment": alignment})
+
     def update_or_set_alignment(
         self,
         design_object: Union[List, Dict],
@@ -46,44 +109,8 @@ class DsAlignment:
         extract the container details from the card layout structure.
         """
         if isinstance(design_object, dict):
-            if not parent_object:
-                parent_width = None
-                pil_image = image
-                design_element_xmin = design_object.get("coordinates", [])[0]
-                design_element_xmax = design_object.get("coordinates", [])[2]
-
-            else:
-                parent_width = abs(
-                    parent_object.get("coordinates")[2]
-                    - parent_object.get("coordinates")[0]
-                )
-                pil_image = None
-                design_element_xmin = abs(
-                    design_object.get("coordinates")[0]
-                    - parent_object.get("coordinates")[0]
-                )
-                design_element_width = abs(
-                    design_object.get("coordinates")[2]
-                    - design_object.get("coordinates")[0]
-                )
-                design_element_xmax = (
-                    abs(
-                        parent_object.get("coordinates")[2]
-                        - design_object.get("coordinates")[2]
-                    )
-                    + design_element_width
-                )
-
-            # update the element's inside the container's
-            design_object.update(
-                {
-                    "horizontal_alignment": self.base_property.get_alignment(
-                        xmin=design_element_xmin,
-                        xmax=design_element_xmax,
-                        width=parent_width,
-                        image=pil_image,
-                    )
-                }
+            self.align_object(
+                design_object, parent_object=parent_object, image=image
             )
 
             # set the container's alignment
@@ -94,19 +121,8 @@ class DsAlignment:
                 container_items = container_details_template_object(
                     design_object
                 )
-                # if a container has only one element, then extract the
-                # alignment based on the line numbers and top values from
-                # pytesseract data.
                 if len(container_items) == 1:
-                    text_data = container_items[0].get("image_data", [])
-                    if text_data:
-                        if self._get_number_of_lines(text_data) > 1:
-                            alignment = self.base_property.get_line_alignment(
-                                text_data
-                            )
-                            container_items[0].update(
-                                {"horizontal_alignment": alignment}
-                            )
+                    self.align_single_item(container_items)
                 else:
                     self.update_or_set_alignment(
                         container_items,
@@ -171,31 +187,42 @@ class DsAlignment:
             )
 
         elif isinstance(card_layout, list):
-            for ctr, design_obj in enumerate(card_layout):
-                if not design_obj.get("horizontal_alignment"):
-
-                    if ctr + 1 < len(card_layout):
-                        design_obj.update(
-                            {
-                                "horizontal_alignment": card_layout[
-                                    ctr + 1
-                                ].get("horizontal_alignment")
-                            }
-                        )
-                    elif ctr - 1 >= 0:
-                        design_obj.update(
-                            {
-                                "horizontal_alignment": card_layout[
-                                    ctr - 1
-                                ].get("horizontal_alignment")
-                            }
-                        )
-                    if not design_obj.get("horizontal_alignment"):
-                        design_obj.update({"horizontal_alignment": "Left"})
+            self.resolve_conflicts(card_layout)
+            for design_obj in card_layout:
                 self.update_conflicting_alignments(
                     design_obj, container_details_object
                 )
 
+    # pylint: disable=no-self-use
+    def resolve_conflicts(self, design_objects: List[Dict]) -> None:
+        """
+        Set the missing alignment of the design objects of a container from
+        the next element, or the previous element for the last one, and Left
+        if both are missing.
+        @param design_objects: design elements of a container
+        """
+        for ctr, design_obj in enumerate(design_objects):
+            if not design_obj.get("horizontal_alignment"):
+
+                if ctr + 1 < len(design_objects):
+                    design_obj.update(
+                        {
+                            "horizontal_alignment": design_objects[ctr + 1].get(
+                                "horizontal_alignment"
+                            )
+                        }
+                    )
+                elif ctr - 1 >= 0:
+                    design_obj.update(
+                        {
+                            "horizontal_alignment": design_objects[ctr - 1].get(
+                                "horizontal_alignment"
+                            )
+                        }
+                    )
+                if not design_obj.get("horizontal_alignment"):
+                    design_obj.update({"horizontal_alignment": "Left"})
+
 
 def update_properties(
     card_layout: List,
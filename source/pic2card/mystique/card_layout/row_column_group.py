@@ -1,15 +1,15 @@
 """Module responsible for grouping the related row of elements and to it's
 respective columns"""
-from multiprocessing import Process, Queue
-from typing import List, Dict
+from typing import List, Dict, Tuple, Union
 
 # pylint: disable=relative-beyond-top-level
-import pandas as pd
 from PIL import Image
 from mystique.extract_properties import CollectProperties
+from mystique import worker_pool
 
 from .container_group import ContainerGroup
-from .ds_helper import DsHelper, ContainerDetailTemplate
+from .design_object import DETECTED_KEYS, DesignObjects
+from .ds_helper import DsHelper, ContainerDetailTemplate, sort_by_key
 from .objects_group import RowColumnGrouping
 
 
@@ -24,16 +24,7 @@ def get_layout_structure(predicted_objects: List, queue=None) -> List:
     card_layout = []
     # group row and columns
     # sorting the design objects y way
-    predicted_objects = [
-        value
-        for _, value in sorted(
-            zip(
-                pd.DataFrame(predicted_objects).to_dict(orient="list")["ymin"],
-                predicted_objects,
-            ),
-            key=lambda value: value[0],
-        )
-    ]
+    predicted_objects = sort_by_key(predicted_objects, "ymin")
     row_column_group = RowColumnGroup()
     card_layout = row_column_group.row_column_grouping(
         predicted_objects, card_layout
@@ -46,44 +37,92 @@ def get_layout_structure(predicted_objects: List, queue=None) -> List:
     return card_layout
 
 
+def _get_object_properties(
+    design_objects: DesignObjects, image_ref: Union[Image.Image, Tuple]
+) -> List[Dict]:
+    """
+    Worker process task for the property extraction of the design objects.
+    @param design_objects: extracted design objects
+    @param image_ref: shared image reference of the input design image
+    @return: extracted properties of each design object, without the
+             detected keys the caller already has
+    """
+    # pylint: disable=import-outside-toplevel, cyclic-import
+    from mystique.predict_card import PredictCard
+
+    image = worker_pool.load_shared_image(image_ref)
+    properties = PredictCard().get_object_properties(
+        design_objects.to_dicts(), image
+    )
+    return [
+        {
+            key: value
+            for key, value in prop.items()
+            if key not in DETECTED_KEYS or key == "uuid"
+        }
+        for prop in properties
+    ]
+
+
+def _get_layout_structure(design_objects: DesignObjects) -> List:
+    """
+    Worker process task for the layout structuring of the design objects.
+    @param design_objects: extracted design objects
+    @return: generated hierarchical card layout
+    """
+    return get_layout_structure(design_objects.to_dicts())
+
+
 def generate_card_layout_multi(
     predicted_objects: List, image: Image, predict_card_object=None
 ) -> RowColumnGrouping:
     """
     Performs the property extraction and hierarchical layout structuring
-    in parallel and merges both on completion and returns the card layout
-    with the spatial and property details.
+    in parallel on the persistent worker pool and merges both on completion
+    and returns the card layout with the spatial and property details.
     @param predicted_objects: List of extracted design objects
     @param image: input design image
     @param predict_card_object: PredictCard object
     @return: card layout with the primitive properties merged
     """
-    queue1 = Queue()
-    queue2 = Queue()
+    pool = worker_pool.get_worker_pool()
+    use_processes = worker_pool.get_pool_type() == "process"
+    design_objects = predicted_objects["objects"]
     try:
-        process1 = Process(
-            target=predict_card_object.get_object_properties,
-            args=(
-                predicted_objects["objects"],
-                image,
-                queue1,
-            ),
-        )
-        process2 = Process(
-            target=get_layout_structure,
-            args=(
-                predicted_objects["objects"],
-                queue2,
-            ),
-        )
-        process1.start()
-        process2.start()
-
-        properties = queue1.get()
-        card_layout = queue2.get()
+        with worker_pool.SharedImage(
+            image, use_shared_memory=use_processes
+        ) as image_ref:
+            if use_processes:
+                # the objects are pickled as a struct of arrays
+                objects_batch = DesignObjects.from_dicts(design_objects)
+                properties_future = pool.submit(
+                    _get_object_properties, objects_batch, image_ref
+                )
+                layout_future = pool.submit(
+                    _get_layout_structure, objects_batch
+                )
+            else:
+                properties_future = pool.submit(
+                    predict_card_object.get_object_properties,
+                    design_objects,
+                    image_ref,
+                )
+                # The threads share the design objects, layout works on a
+                # copy as the property extraction updates them in place.
+                layout_future = pool.submit(
+                    get_layout_structure,
+                    [dict(design_object) for design_object in design_objects],
+                )
+            properties = properties_future.result()
+            card_layout = layout_future.result()
+        if use_processes:
+            # add back the detected keys left out by the worker
+            properties = {prop["uuid"]: prop for prop in properties}
+            properties = [
+                dict(design_object, **properties[design_object["uuid"]])
+                for design_object in design_objects
+            ]
 
-        process1.join()
-        process2.join()
         # merge the card layout and extracted properties
         ds_helper = DsHelper()
         container_detail_object = ContainerDetailTemplate()
@@ -152,18 +191,7 @@ class RowColumnGroup:
             )
         elif len(column_set["objects"]) > 1:
             # sort x wise for columns grouping
-            column_set["objects"] = [
-                value
-                for _, value in sorted(
-                    zip(
-                        pd.DataFrame(column_set["objects"]).to_dict(
-                            orient="list"
-                        )["xmin"],
-                        column_set["objects"],
-                    ),
-                    key=lambda value: value[0],
-                )
-            ]
+            column_set["objects"] = sort_by_key(column_set["objects"], "xmin")
             columns = self.columns_grouping.object_grouping(
                 column_set["objects"], self.columns_grouping.column_condition
             )
@@ -193,18 +221,7 @@ class RowColumnGroup:
                 "column", row_columns, coords=column["coordinates"]
             )
             column_counter = len(row_columns) - 1
-            column["objects"] = [
-                value
-                for _, value in sorted(
-                    zip(
-                        pd.DataFrame(column["objects"]).to_dict(orient="list")[
-                            "ymin"
-                        ],
-                        column["objects"],
-                    ),
-                    key=lambda value: value[0],
-                )
-            ]
+            column["objects"] = sort_by_key(column["objects"], "ymin")
             self.row_column_grouping(
                 column["objects"],
                 row_columns[column_counter]["column"]["items"],
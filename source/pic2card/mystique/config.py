@@ -5,11 +5,28 @@ import os
 
 # max 2mb
 IMG_MAX_UPLOAD_SIZE = 2e6
+# Allowed size of the part headers and boundaries of the multipart uploads
+# on top of the IMG_MAX_UPLOAD_SIZE
+IMG_UPLOAD_MULTIPART_OVERHEAD = 8 * 1024
 
 # tf-serving url
 TF_SERVING_URL = os.environ.get("TF_SERVING_URL", "http://172.17.0.5:8501")
 TF_SERVING_MODEL_NAME = "mystique"
 ENABLE_TF_SERVING = os.environ.get("ENABLE_TF_SERVING", False)
+# "rest" or "grpc", the grpc client needs the tensorflow-serving-api package
+TF_SERVING_PROTOCOL = os.environ.get("TF_SERVING_PROTOCOL", "rest")
+TF_SERVING_GRPC_URL = os.environ.get("TF_SERVING_GRPC_URL", "172.17.0.5:8500")
+# input tensor name of the serving_default signature
+TF_SERVING_INPUT_NAME = "inputs"
+
+# Keep-alive http connection pool of the json api clients, idle connections
+# kept open per host, connect / read timeout in seconds and the retries of
+# the failed requests with a backoff of 0.1s, 0.2s, 0.4s ...
+HTTP_POOL_MAX_SIZE = int(os.environ.get("HTTP_POOL_MAX_SIZE", 8))
+HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", 30))
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", 2))
+HTTP_RETRY_BACKOFF = 0.1
+
 TF_FROZEN_MODEL_PATH = os.path.join(
     os.path.dirname(__file__), "../model/frozen_inference_graph.pb"
 )
@@ -73,10 +90,28 @@ PROPERTY_EXTRACTOR_FUNC = {
 FONT_SPEC_REGISTRY = {
     "font_morph": "mystique.font_properties.FontPropMorph",
     "font_bbox": "mystique.font_properties.FontPropBoundingBox",
+    "font_distance_transform": (
+        "mystique.font_properties.FontPropDistanceTransform"
+    ),
 }
 # active font prop pipelne
 ACTIVE_FONTSPEC_NAME = "font_morph"
 
+# OCR backend registry
+# pytesseract spawns the tesseract binary for each call, tesserocr runs
+# tesseract in-process and falls back to pytesseract if not installed.
+OCR_BACKEND_REGISTRY = {
+    "pytesseract": "mystique.ocr.PytesseractBackend",
+    "tesserocr": "mystique.ocr.TesserocrBackend",
+}
+# active OCR backend
+ACTIVE_OCR_BACKEND = os.environ.get("ACTIVE_OCR_BACKEND", "pytesseract")
+# max number of the tesserocr API handles kept open per page segmentation
+# mode, shared by the property extraction threads of all the requests.
+TESSEROCR_POOL_SIZE = int(os.environ.get("TESSEROCR_POOL_SIZE", 4))
+# max seconds to wait for a free tesserocr API handle
+TESSEROCR_POOL_TIMEOUT = float(os.environ.get("TESSEROCR_POOL_TIMEOUT", 60))
+
 # image detection swtiching paramater
 # On True [ uses custom image pipeline for image objects]
 # On False [ uses RCNN model image obejcts ]
@@ -89,6 +124,38 @@ MODEL_CONFIDENCE = 80.0
 # Extra textbox padding - 5px
 TEXTBOX_PADDING = 5
 
+# Number of detected objects from which the noise removal compares only the
+# objects with overlapping x ranges [ sweep line ] instead of all the pairs.
+NOISE_REMOVAL_SWEEP_MIN_OBJECTS = 200
+
+# OCR mode for the text extraction
+# "per_object" runs tesseract on each detected object crop.
+# "whole_image" runs tesseract once on the whole card and assigns the words
+# to the detected objects.
+OCR_MODE = os.environ.get("OCR_MODE", "per_object")
+OCR_WHOLE_IMAGE_PSM = 3
+# grid cell size in pixels of the word spatial index for whole image OCR
+OCR_GRID_CELL_SIZE = 64
+
+# grid cell size in pixels of the detected objects spatial index used to
+# filter the image objects found by the edge detection
+IMAGE_EXTRACTION_GRID_CELL_SIZE = 64
+# number of image object boxes compared at once with all the other boxes
+# in the image objects noise removal
+IMAGE_NOISE_REMOVAL_BLOCK_SIZE = 512
+# working resolution [ larger side in pixels ] of the image objects edge
+# detection, larger designs are downscaled before finding the contours.
+# 0 runs the edge detection at the full upload resolution.
+IMAGE_EDGE_DETECTION_MAX_DIM = int(
+    os.environ.get("IMAGE_EDGE_DETECTION_MAX_DIM", 0)
+)
+
+# Number of threads used to extract the design object properties
+# concurrently [ OCR, font weight and color ], 1 runs them serially.
+PROPERTY_EXTRACTION_WORKERS = int(
+    os.environ.get("PROPERTY_EXTRACTION_WORKERS", 4)
+)
+
 MODEL_REGISTRY = {
     "tf_faster_rcnn": "mystique.detect_objects.ObjectDetection",
     # "tfs_faster_rcnn": "mystique.detect_objects.TfsObjectDetection",
@@ -100,6 +167,59 @@ MODEL_REGISTRY = {
 
 ACTIVE_MODEL_NAME = os.environ.get("ACTIVE_MODEL_NAME", "tf_faster_rcnn")
 
+# Frozen graph inference session settings, 0 lets tensorflow pick the
+# thread pool sizes.
+TF_INTRA_OP_THREADS = int(os.environ.get("TF_INTRA_OP_THREADS", 0))
+TF_INTER_OP_THREADS = int(os.environ.get("TF_INTER_OP_THREADS", 0))
+# Run a dummy inference at model load time to warm-up the session.
+TF_SESSION_WARMUP = True
+TF_SESSION_WARMUP_SHAPE = (600, 400, 3)
+
+# Micro-batching of the concurrent /predict_json requests, the detections of
+# requests arriving within MICRO_BATCH_MAX_WAIT_MS are served with a single
+# batched inference of at most MICRO_BATCH_MAX_SIZE images.
+# Needs a threaded server (eg; gunicorn --threads) to have concurrent requests.
+ENABLE_MICRO_BATCHING = os.environ.get("ENABLE_MICRO_BATCHING", False)
+MICRO_BATCH_MAX_SIZE = int(os.environ.get("MICRO_BATCH_MAX_SIZE", 8))
+MICRO_BATCH_MAX_WAIT_MS = float(os.environ.get("MICRO_BATCH_MAX_WAIT_MS", 20))
+
+# Generated card cache, keyed by the hash of the uploaded image bytes, the
+# card format and the active model name.
+ENABLE_CARD_CACHE = os.environ.get("ENABLE_CARD_CACHE", False)
+# max 64mb of cached cards in memory
+CARD_CACHE_MAX_BYTES = 64e6
+# time to live of a cached card in seconds
+CARD_CACHE_TTL = 24 * 60 * 60
+# on-disk cache directory, the disk tier is disabled if not set
+CARD_CACHE_DIR = os.environ.get("CARD_CACHE_DIR")
+# max 512mb of cached cards on disk, the oldest files are evicted first
+CARD_CACHE_DISK_MAX_BYTES = float(
+    os.environ.get("CARD_CACHE_DISK_MAX_BYTES", 512e6)
+)
+
+# Raw object detection output cache, keyed by the hash of the image pixels
+# and the active model name, lets the layout and export re-run without the
+# model inference.
+ENABLE_DETECTION_CACHE = os.environ.get("ENABLE_DETECTION_CACHE", False)
+# max 32mb of cached detections in memory
+DETECTION_CACHE_MAX_BYTES = 32e6
+# time to live of a cached detection in seconds
+DETECTION_CACHE_TTL = 24 * 60 * 60
+# on-disk cache directory [ .npz files ], disabled if not set
+DETECTION_CACHE_DIR = os.environ.get("DETECTION_CACHE_DIR")
+# max 256mb of cached detections on disk, the oldest files are evicted first
+DETECTION_CACHE_DISK_MAX_BYTES = float(
+    os.environ.get("DETECTION_CACHE_DISK_MAX_BYTES", 256e6)
+)
+
+# ASGI serving mode [ uvicorn app.asgi:app ], the card prediction runs in a
+# pool of ASGI_WORKERS threads while the uploads are awaited on the event
+# loop. At most ASGI_MAX_IN_FLIGHT predictions run at once and up to
+# ASGI_MAX_WAITING requests queue for a slot, the rest get a 503.
+ASGI_WORKERS = int(os.environ.get("ASGI_WORKERS", 4))
+ASGI_MAX_IN_FLIGHT = int(os.environ.get("ASGI_MAX_IN_FLIGHT", 8))
+ASGI_MAX_WAITING = int(os.environ.get("ASGI_MAX_WAITING", 32))
+
 # Threshold values of w,h ratio of each image object labels
 IMAGE_SIZE_RATIOS = {
     (10.23, 11.92): "Small",
@@ -147,7 +267,14 @@ LINE_ALIGNMENT_THRESHOLD = {"minimum": 0.20, "maximum": 0.75}
 
 # Multi Process flag to run card-layout and properties extraction as a
 # parallel or sequential tasks, True by default
+# The parallel tasks run on a persistent worker pool created at app startup,
+# True / "process" selects a process pool and "thread" a thread pool.
 MULTI_PROC = True
+MULTI_PROC_WORKERS = 2
+
+# Export the card layout in a single traversal updating the alignments and
+# the container properties, False runs a separate pass for each of them.
+FUSED_CARD_EXPORT = True
 
 # synthetic module config values
 CANVAS_COLOR = {
@@ -11,7 +11,7 @@ import matplotlib.pyplot as plt
 
 from mystique.predict_card import PredictCard
 from mystique.image_extraction import ImageExtraction
-from mystique.utils import plot_results
+from mystique.utils import DecodedImage, plot_results
 
 
 class Debug:
@@ -102,9 +102,8 @@ class Debug:
 
         @return: predicted card json
         """
-        pil_image = pil_image.convert("RGB")
-        image_np = np.asarray(pil_image)
-        image_np = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
+        decoded_image = DecodedImage.from_pil(pil_image)
+        pil_image, image_np = decoded_image.pil_image, decoded_image.bgr
         (boxes, classes, scores, output_dict) = self.get_boundary_boxes(
             image_np, pil_image
         )
@@ -120,7 +119,7 @@ class Debug:
         debug_output = {"image": image_model_base64_string}
         # generate card from existing workflow
         predict_json = predict_card.generate_card(
-            output_dict, pil_image, image_np, card_format
+            output_dict, pil_image, card_format
         )
         debug_output.update(predict_json)
         return debug_output
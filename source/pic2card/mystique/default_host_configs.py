@@ -13,3 +13,46 @@ FONT_SIZE = {
 FONT_WEIGHT_BBOX = {"lighter": 0.0143, "default": 0.0176, "bolder": 0.0213}
 
 FONT_WEIGHT_MORPH = {"lighter": 2.35, "default": 2.75, "bolder": 3.25}
+
+# Reference RGB values of the text colors and actionset styles, an object
+# gets the name of the closest reference color within COLOR_MAX_DISTANCE.
+TEXT_COLORS = {
+    "Attention": [
+        (255, 0, 0),
+        (180, 8, 0),
+        (220, 54, 45),
+        (194, 25, 18),
+        (143, 7, 0),
+    ],
+    "Accent": [(0, 0, 255), (7, 47, 95), (18, 97, 160), (56, 149, 211)],
+    "Good": [
+        (0, 128, 0),
+        (145, 255, 0),
+        (30, 86, 49),
+        (164, 222, 2),
+        (118, 186, 27),
+        (76, 154, 42),
+        (104, 187, 89),
+    ],
+    "Dark": [
+        (0, 0, 0),
+        (76, 76, 76),
+        (51, 51, 51),
+        (102, 102, 102),
+        (153, 153, 153),
+    ],
+    "Light": [(255, 255, 255)],
+    "Warning": [
+        (255, 255, 0),
+        (255, 170, 0),
+        (184, 134, 11),
+        (218, 165, 32),
+        (234, 186, 61),
+        (234, 162, 33),
+    ],
+}
+ACTIONSET_STYLES = {
+    "destructive": TEXT_COLORS["Attention"],
+    "positive": TEXT_COLORS["Accent"],
+}
+COLOR_MAX_DISTANCE = 150
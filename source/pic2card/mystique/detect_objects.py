@@ -1,13 +1,15 @@
 """Module for object detection using faster rcnn"""
 
+import threading
 from distutils.version import StrictVersion
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 import numpy as np
 import tensorflow as tf
 from PIL import Image
 
+from mystique import config
 from mystique.predict_card import PredictCard
-from mystique.utils import id_to_label
+from mystique.utils import group_by_size, id_to_label
 from mystique.image_extraction import ImageExtraction
 from mystique.initial_setups import set_graph_and_tensors
 
@@ -34,11 +36,55 @@ class ObjectDetection:
         det_g, tens_d = self._load_model_dump()
         self.detection_graph = det_g
         self.tensor_dict = tens_d
+        self.image_tensor = det_g.get_tensor_by_name("image_tensor:0")
+        # Long lived session shared across the requests, session.run is
+        # thread safe, the lock only guards the session (re)creation.
+        self._session_lock = threading.Lock()
+        self._session = self._create_session()
+        if config.TF_SESSION_WARMUP:
+            self.warm_up()
 
     @staticmethod
     def _load_model_dump():
         return set_graph_and_tensors()
 
+    def _create_session(self) -> tf.compat.v1.Session:
+        """
+        Create the inference session on the detection graph with the
+        configured intra/inter op thread pools.
+        """
+        session_config = tf.compat.v1.ConfigProto(
+            intra_op_parallelism_threads=config.TF_INTRA_OP_THREADS,
+            inter_op_parallelism_threads=config.TF_INTER_OP_THREADS,
+        )
+        return tf.compat.v1.Session(
+            graph=self.detection_graph, config=session_config
+        )
+
+    @property
+    def session(self) -> tf.compat.v1.Session:
+        """Returns the shared inference session, re-created if closed"""
+        with self._session_lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def close(self):
+        """Release the shared inference session"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def warm_up(self):
+        """
+        Run a dummy inference so the first request doesn't pay for the
+        graph optimization and memory allocation.
+        """
+        self.run_inference_for_single_image(
+            np.zeros(config.TF_SESSION_WARMUP_SHAPE, dtype=np.uint8)
+        )
+
     # pylint: disable=no-self-use
     def _img_preprocess(self, image_path: str) -> Tuple[Image.Image, np.array]:
         """
@@ -120,6 +166,54 @@ class ObjectDetection:
         # renormalize the the box cooridinates
         return output_dict
 
+    def get_objects_batch(
+        self, images_np: List[np.array], images: List[Image.Image]
+    ) -> List[Dict]:
+        """
+        Returns the objects and coordiates detected for a list of images
+        using a single session run per image size, so the detections are
+        the same as of `get_objects`.
+
+        @param images_np: list of image tensors, dimension should be HxWx3
+        @param images: list of PIL Image objects
+
+        @return: list of ouput dicts, one per image
+        """
+        output_dicts = [None] * len(images_np)
+        for indices in group_by_size(images_np):
+            batch = np.stack([images_np[ctr] for ctr in indices])
+            batch_outputs = self.run_inference_for_batch(batch)
+            for ctr, output_dict in zip(indices, batch_outputs):
+                width, height = images[ctr].size
+                # format: ymin, xmin, ymax, xmax, renormalize the coords.
+                scale = [height, width, height, width]
+                bboxes = output_dict["detection_boxes"] * scale
+                # format: xmin, ymin, xmax, ymax
+                output_dict["detection_boxes"] = bboxes[:, [1, 0, 3, 2]]
+                output_dicts[ctr] = output_dict
+        return output_dicts
+
+    def run_inference_for_batch(self, batch: np.array) -> List[Dict]:
+        """
+        Runs the inference graph for the given batch of images
+        @param batch: NxHxWx3 numpy array of same sized design images
+        @return: list of output dict of objects, classes and coordinates
+        """
+        output_dict = self.session.run(
+            self.tensor_dict, feed_dict={self.image_tensor: batch}
+        )
+
+        return [
+            {
+                "detection_classes": output_dict["detection_classes"][
+                    ctr
+                ].astype(np.uint8),
+                "detection_boxes": output_dict["detection_boxes"][ctr],
+                "detection_scores": output_dict["detection_scores"][ctr],
+            }
+            for ctr in range(batch.shape[0])
+        ]
+
     def run_inference_for_single_image(self, image: np.array):
         """
         Runs the inference graph for the given image
@@ -127,14 +221,10 @@ class ObjectDetection:
         @return: output dict of objects, classes and coordinates
         """
         # Run inference
-        detection_graph = self.detection_graph
-        with detection_graph.as_default():  # pylint: disable=not-context-manager
-            image_tensor = detection_graph.get_tensor_by_name("image_tensor:0")
-            with tf.compat.v1.Session() as sess:
-                output_dict = sess.run(
-                    self.tensor_dict,
-                    feed_dict={image_tensor: np.expand_dims(image, 0)},
-                )
+        output_dict = self.session.run(
+            self.tensor_dict,
+            feed_dict={self.image_tensor: np.expand_dims(image, 0)},
+        )
 
         # all outputs are float32 numpy arrays, so convert types as
         # appropriate
@@ -7,10 +7,11 @@ from typing import Tuple, Dict, List, Any, Union
 
 import numpy as np
 from PIL import Image
-from pytesseract import pytesseract, Output
 
-from mystique import config
+from mystique import config, default_host_configs
 from mystique.utils import load_instance_with_class_path
+from mystique.ocr import get_ocr_backend
+from mystique.object_crop import get_object_crop
 from mystique.extract_properties_abstract import (
     AbstractFontColor,
     AbstractBaseExtractProperties,
@@ -19,12 +20,59 @@ from mystique.extract_properties_abstract import (
 from mystique.card_layout.ds_helper import ContainerDetailTemplate, DsHelper
 
 
+class ColorPalette:
+    """
+    Reference colors matrix for finding the closest named color of an RGB
+    value in a single array operation.
+    """
+
+    def __init__(
+        self,
+        colors: Dict[str, List[Tuple]],
+        max_distance=default_host_configs.COLOR_MAX_DISTANCE,
+    ):
+        """
+        @param colors: color names and their reference RGB values
+        @param max_distance: maximum RGB distance of a matching color
+        """
+        self.names = [name for name, values in colors.items() for _ in values]
+        self.values = np.array(
+            [value for values in colors.values() for value in values],
+            dtype=float,
+        )
+        self.max_distance = max_distance
+
+    def get_closest(self, color: List) -> Union[str, None]:
+        """
+        Returns the name of the closest reference color within the
+        max distance, the first reference color is picked on ties.
+        @param color: RGB value
+        @return: color name or None if no reference color is close enough
+        """
+        distances = np.linalg.norm(self.values - color, axis=1)
+        index = int(np.argmin(distances))
+        if distances[index] <= self.max_distance:
+            return self.names[index]
+        return None
+
+
+TEXT_COLOR_PALETTE = ColorPalette(default_host_configs.TEXT_COLORS)
+ACTIONSET_STYLE_PALETTE = ColorPalette(default_host_configs.ACTIONSET_STYLES)
+
+
 class BaseExtractProperties(AbstractBaseExtractProperties):
 
     """
     Base Class for all design objects's common properties extraction.
     """
 
+    # WholeImageOcr instance of the card, if set the text is looked up from
+    # the whole image OCR instead of recognizing the object crop.
+    ocr_index = None
+    # ObjectCrop instance of the design object, shares the crops and
+    # their conversions among the property extractors.
+    object_crop = None
+
     # pylint: disable=arguments-differ, too-many-return-statements
     def get_alignment(
         self, image=None, xmin=None, xmax=None, width=None
@@ -113,13 +161,15 @@ class BaseExtractProperties(AbstractBaseExtractProperties):
                        text should be extracted
         @return: ocr text, pytesseract image data
         """
-        coords = (coords[0] - 5, coords[1], coords[2] + 5, coords[3])
-        cropped_image = image.crop(coords)
-        cropped_image = cropped_image.convert("LA")
+        if self.ocr_index is not None:
+            img_data = self.ocr_index.get_data(
+                (coords[0] - 5, coords[1], coords[2] + 5, coords[3])
+            )
+        else:
+            object_crop = get_object_crop(self.object_crop, image, coords)
+            cropped_image = object_crop.text_image
 
-        img_data = pytesseract.image_to_data(
-            cropped_image, lang="eng", config="--psm 6", output_type=Output.DICT
-        )
+            img_data = get_ocr_backend().image_to_data(cropped_image, psm=6)
         text_list = filter(None, img_data["text"])
         extracted_text = " ".join(text_list).lstrip("#-_*~").strip()
         return extracted_text, img_data
@@ -130,6 +180,9 @@ class FontColor(AbstractFontColor):  # pylint: disable=too-few-public-methods
     Class handles extraction of font color of respective design element.
     """
 
+    # ObjectCrop instance of the design object
+    object_crop = None
+
     # pylint: disable=too-many-locals
     def get_colors(self, image: Image, coords: Tuple) -> str:
         """
@@ -143,75 +196,20 @@ class FontColor(AbstractFontColor):  # pylint: disable=too-few-public-methods
 
         @return: foreground color name
         """
-        cropped_image = image.crop(coords)
         # get 2 dominant colors
-        q_a = cropped_image.quantize(colors=2, method=2)
+        q_a = get_object_crop(self.object_crop, image, coords).quantized
         dominant_color = q_a.getpalette()[3:6]
 
-        colors = {
-            "Attention": [
-                (255, 0, 0),
-                (180, 8, 0),
-                (220, 54, 45),
-                (194, 25, 18),
-                (143, 7, 0),
-            ],
-            "Accent": [(0, 0, 255), (7, 47, 95), (18, 97, 160), (56, 149, 211)],
-            "Good": [
-                (0, 128, 0),
-                (145, 255, 0),
-                (30, 86, 49),
-                (164, 222, 2),
-                (118, 186, 27),
-                (76, 154, 42),
-                (104, 187, 89),
-            ],
-            "Dark": [
-                (0, 0, 0),
-                (76, 76, 76),
-                (51, 51, 51),
-                (102, 102, 102),
-                (153, 153, 153),
-            ],
-            "Light": [(255, 255, 255)],
-            "Warning": [
-                (255, 255, 0),
-                (255, 170, 0),
-                (184, 134, 11),
-                (218, 165, 32),
-                (234, 186, 61),
-                (234, 162, 33),
-            ],
-        }
-        color = "Default"
-        found_colors = []
-        distances = []
         # find the dominant text colors based on the RGB difference
-        for key, values in colors.items():
-            for value in values:
-                distance = np.sqrt(
-                    np.sum(
-                        (np.asarray(value) - np.asarray(dominant_color)) ** 2
-                    )
-                )
-                if distance <= 150:
-                    found_colors.append(key)
-                    distances.append(distance)
+        found_color = TEXT_COLOR_PALETTE.get_closest(dominant_color)
         # If the color is predicted as LIGHT check for false cases
         # where both dominan colors are White
-        if found_colors:
-            index = distances.index(min(distances))
-            color = found_colors[index]
-            if found_colors[index] == "Light":
-                background = q_a.getpalette()[:3]
-                foreground = q_a.getpalette()[3:6]
-                distance = np.sqrt(
-                    np.sum(
-                        (np.asarray(background) - np.asarray(foreground)) ** 2
-                    )
-                )
-                if distance < 150:
-                    color = "Default"
+        color = found_color or "Default"
+        if found_color == "Light":
+            background = q_a.getpalette()[:3]
+            distance = np.linalg.norm(np.subtract(background, dominant_color))
+            if distance < default_host_configs.COLOR_MAX_DISTANCE:
+                color = "Default"
         return color
 
 
@@ -268,7 +266,9 @@ class TextBoxProperty(BaseExtractProperties, FontColor):
             "data": data,
             "image_data": image_data,
             "size": font_spec.get_size(image, coords, img_data=image_data),
-            "weight": font_spec.get_weight(image, coords, img_data=image_data),
+            "weight": font_spec.get_weight(
+                image, coords, img_data=image_data, object_crop=self.object_crop
+            ),
             "color": self.get_colors(image, coords),
         }
 
@@ -288,44 +288,13 @@ class ActionSetProperty(BaseExtractProperties):
         @param coords: object's coordinate
         @return: style string of the actionset
         """
-        cropped_image = image.crop(coords)
         # get 2 dominant colors
-        quantized = cropped_image.quantize(colors=2, method=2)
+        quantized = get_object_crop(self.object_crop, image, coords).quantized
         # extract the background color
         background_color = quantized.getpalette()[:3]
-        colors = {
-            "destructive": [
-                (255, 0, 0),
-                (180, 8, 0),
-                (220, 54, 45),
-                (194, 25, 18),
-                (143, 7, 0),
-            ],
-            "positive": [
-                (0, 0, 255),
-                (7, 47, 95),
-                (18, 97, 160),
-                (56, 149, 211),
-            ],
-        }
-        style = "default"
-        found_colors = []
-        distances = []
         # find the dominant background colors based on the RGB difference
-        for key, values in colors.items():
-            for value in values:
-                distance = np.sqrt(
-                    np.sum(
-                        (np.asarray(value) - np.asarray(background_color)) ** 2
-                    )
-                )
-                if distance <= 150:
-                    found_colors.append(key)
-                    distances.append(distance)
-        if found_colors:
-            index = distances.index(min(distances))
-            style = found_colors[index]
-        return style
+        style = ACTIONSET_STYLE_PALETTE.get_closest(background_color)
+        return style or "default"
 
     def actionset(self, image: Image, coords: Tuple) -> Dict:
         """
@@ -393,7 +362,7 @@ class ImageProperty(BaseExtractProperties):
         Returns the image properties of the extracted design object
         @return: property object
         """
-        cropped = image.crop(coords)
+        cropped = get_object_crop(self.object_crop, image, coords).pil_image
         buff = BytesIO()
         cropped.save(buff, format="PNG")
         base64_string = base64.b64encode(buff.getvalue()).decode()
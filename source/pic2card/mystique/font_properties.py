@@ -10,6 +10,7 @@ import cv2
 from PIL import Image
 from mystique import default_host_configs
 from mystique.extract_properties_abstract import AbstractFontSizeAndWeight
+from mystique.object_crop import ObjectCrop, get_object_crop
 
 
 def classify_font_weights(design_objects):
@@ -120,8 +121,10 @@ class FontPropBoundingBox(AbstractFontSizeAndWeight):
 
         return size
 
-    # pylint: disable=arguments-differ
-    def get_weight(self, image: Image, coords: Tuple, img_data: Dict) -> str:
+    # pylint: disable=arguments-differ, unused-argument
+    def get_weight(
+        self, image: Image, coords: Tuple, img_data: Dict, object_crop=None
+    ) -> str:
         """
         Extract the weight by taking an average of
         ratio of width of each character to image width from
@@ -131,6 +134,7 @@ class FontPropBoundingBox(AbstractFontSizeAndWeight):
         @param coords: list of coordinated from which
                        text and width should be extracted
         @param img_data : input image data from pytesseract
+        @param object_crop: ObjectCrop instance of the design object
         @return: weight
         """
         image_width, _ = image.size
@@ -152,8 +156,21 @@ class FontPropMorph(FontPropBoundingBox):
     using morphology operations.
     """
 
+    @staticmethod
+    def get_binary_image(image: Image, coords: Tuple) -> np.array:
+        """
+        Crops the text region and converts it to a binary image with the
+        text pixels set to 255.
+        @param image : input PIL image
+        @param coords: coordinates of the text region
+        @return: binary image array
+        """
+        return ObjectCrop(image, coords).binary
+
     # pylint: disable=too-many-locals
-    def get_weight(self, image: Image, coords: Tuple, img_data: None) -> str:
+    def get_weight(
+        self, image: Image, coords: Tuple, img_data: None, object_crop=None
+    ) -> str:
         """
         Extract the weight of the each words by
         skeletization applying morph operations on
@@ -162,19 +179,10 @@ class FontPropMorph(FontPropBoundingBox):
         @param image : input PIL image
         @param coords: list of coordinated from which
                        text and height should be extracted
+        @param object_crop: ObjectCrop instance of the design object
         @return: weight
         """
-        cropped_image = image.crop(coords)
-        c_img = np.asarray(cropped_image)
-        # """
-        # if(image_height/image_width) < 1:
-        #     y_scale = round((800/image_width), 2)
-        #     x_scale = round((500/image_height), 2)
-        #     c_img = cv2.resize(c_img, (0, 0), fx=x_scale, fy=y_scale)
-        # """
-        gray = cv2.cvtColor(c_img, cv2.COLOR_BGR2GRAY)
-        # Converting input image to binary format
-        _, img = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY_INV)
+        img = get_object_crop(object_crop, image, coords).binary
         area_of_img = np.count_nonzero(img)
         # creating an empty skeleton
         skel = np.zeros(img.shape, np.uint8)
@@ -194,3 +202,43 @@ class FontPropMorph(FontPropBoundingBox):
         # width of line = area of the line / length of the line
         thickness = round(area_of_img / area_of_skel, 2)
         return {img_data["uuid"]: thickness}
+
+
+class FontPropDistanceTransform(FontPropMorph):
+    """
+    Class handles extraction of font weight property using the distance
+    transform of the text pixels.
+    The morphological skeleton with the 3x3 cross kernel is the set of
+    local maxima of the city block distance to the background, so the
+    skeleton is found in a single pass instead of eroding the crop once
+    per pixel of the thickest stroke, giving the same thickness values as
+    FontPropMorph.
+    """
+
+    def get_weight(
+        self, image: Image, coords: Tuple, img_data: None, object_crop=None
+    ) -> str:
+        """
+        Extract the weight of the each words as the ratio of the text
+        area and the skeleton length.
+
+        @param image : input PIL image
+        @param coords: list of coordinated from which
+                       text and height should be extracted
+        @param object_crop: ObjectCrop instance of the design object
+        @return: weight, nan for a crop without text pixels as of
+                 FontPropMorph
+        """
+        img = get_object_crop(object_crop, image, coords).binary
+        area_of_img = np.count_nonzero(img)
+        distance = cv2.distanceTransform(img, cv2.DIST_L1, 3)
+        kernel = cv2.getStructuringElement(cv2.MORPH_CROSS, (3, 3))
+        # length of the lines in text
+        area_of_skel = np.count_nonzero(
+            (distance > 0) & (distance >= cv2.dilate(distance, kernel))
+        )
+        # width of line = area of the line / length of the line
+        thickness = (
+            round(area_of_img / area_of_skel, 2) if area_of_skel else np.nan
+        )
+        return {img_data["uuid"]: thickness}
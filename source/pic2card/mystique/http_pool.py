@@ -0,0 +1,178 @@
+"""
+Keep-alive http connection pool used by the json api clients [ tf-serving,
+pic2card service ], each host keeps its idle connections open between the
+requests and the failed requests are retried with an exponential backoff.
+"""
+import http.client
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from mystique import config
+
+# Response status codes retried along with the connection errors.
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+class RetryableStatus(Exception):
+    """Raised for the response status codes worth a retry"""
+
+
+def retry_with_backoff(
+    func: Callable,
+    retry_on: Tuple,
+    retries: int = config.HTTP_RETRIES,
+    backoff: float = config.HTTP_RETRY_BACKOFF,
+    should_retry: Callable = None,
+):
+    """
+    Calls the function, retrying on the given exceptions after a delay of
+    backoff, 2 * backoff, 4 * backoff ... seconds.
+    @param func: function to call without arguments
+    @param retry_on: exception types to retry on
+    @param retries: max number of retries after the first attempt
+    @param backoff: delay in seconds before the first retry
+    @param should_retry: predicate of the caught exception, all of them are
+                         retried if None
+    @return: return value of the function
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except retry_on as err:
+            if attempt == retries or (
+                should_retry is not None and not should_retry(err)
+            ):
+                raise
+            time.sleep(backoff * 2**attempt)
+    return None
+
+
+def split_host_port(url: str) -> Tuple[str, Optional[int], bool]:
+    """
+    Returns the host, port and https flag of an url or a host:port string.
+    @param url: eg; http://localhost:8501 or localhost:5050
+    """
+    if "://" not in url:
+        url = "http://" + url
+    parts = urlsplit(url)
+    return parts.hostname, parts.port, parts.scheme == "https"
+
+
+class ConnectionPool:
+    """
+    Pool of keep-alive connections to a single host.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_size: int = config.HTTP_POOL_MAX_SIZE,
+        timeout: float = config.HTTP_TIMEOUT,
+    ):
+        """
+        @param url: host and port of the server, with an optional scheme
+        @param max_size: max number of idle connections kept open
+        @param timeout: connect and read timeout in seconds
+        """
+        self.host, self.port, https = split_host_port(url)
+        self.connection_class = (
+            http.client.HTTPSConnection if https else http.client.HTTPConnection
+        )
+        self.timeout = timeout
+        self.idle = queue.LifoQueue(maxsize=max_size)
+
+    def _get_connection(self) -> http.client.HTTPConnection:
+        """Returns an idle connection or a new one"""
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            return self.connection_class(
+                self.host, self.port, timeout=self.timeout
+            )
+
+    def _put_connection(self, conn: http.client.HTTPConnection):
+        """Keeps the connection open for the next request if there is room"""
+        try:
+            self.idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _request(
+        self, method: str, path: str, body: bytes, headers: Dict
+    ) -> Tuple[int, bytes]:
+        """
+        Sends a single request, the connection goes back to the pool only
+        after the response is fully read.
+        """
+        conn = self._get_connection()
+        try:
+            conn.request(method, path, body, headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            # Stale keep-alive connection or a network error.
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            self._put_connection(conn)
+        if response.status in RETRY_STATUS_CODES:
+            raise RetryableStatus(f"{response.status} from {self.host}")
+        return response.status, data
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes = None,
+        headers: Optional[Dict] = None,
+        retries: int = config.HTTP_RETRIES,
+        backoff: float = config.HTTP_RETRY_BACKOFF,
+    ) -> Tuple[int, bytes]:
+        """
+        Sends the request, retrying on the connection errors, timeouts and
+        the 502 / 503 / 504 responses.
+        @param method: Http request method
+        @param path: API path, eg; /predict_json
+        @param body: request body
+        @param headers: request headers
+        @param retries: max number of retries
+        @param backoff: delay in seconds before the first retry
+        @return: response status and body
+        """
+        return retry_with_backoff(
+            lambda: self._request(method, path, body, headers or {}),
+            # socket.timeout is an OSError
+            (OSError, http.client.HTTPException, RetryableStatus),
+            retries=retries,
+            backoff=backoff,
+        )
+
+    def close(self):
+        """Closes the idle connections"""
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_connection_pool(url: str) -> ConnectionPool:
+    """
+    Returns the process wide connection pool of the host.
+    @param url: host and port of the server, with an optional scheme
+    """
+    key = split_host_port(url)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = ConnectionPool(url)
+        return pool
@@ -11,6 +11,7 @@ import cv2
 from PIL import Image
 
 from mystique import config
+from mystique.utils import GridIndex
 
 
 class ImageExtraction:
@@ -91,78 +92,105 @@ class ImageExtraction:
         """
         Removes all noisy objects by eliminating all smaller and intersecting
                 objects within / with the bigger objects.
+        A box is removed if any bigger box intersects it or it contains
+        the top left point of any bigger box, the pairs are compared as
+        numpy operations in blocks of config.IMAGE_NOISE_REMOVAL_BLOCK_SIZE
+        boxes.
 
         @param points: list of detected object's coordinates.
 
         @return points: list of filtered objects coordinates
         """
-        positions_to_delete = []
-        intersection_combination = []
-        for i in range(len(points)):  # pylint: disable=too-many-nested-blocks
-            for j in range(len(points)):
-                if j < len(points) and i < len(points) and i != j:
-                    box1 = [float(c) for c in points[i]]
-                    box2 = [float(c) for c in points[j]]
-                    intersection = self.find_points(box1, box2, for_image=True)
-                    contain = self.check_contains(box1, box2)
-                    if intersection or contain:
-                        if (i, j) not in intersection_combination:
-                            # remove the smallest box
-                            box1_area = (box1[2] - box1[0]) * (
-                                box1[3] - box1[1]
-                            )
-                            box2_area = (box2[2] - box2[0]) * (
-                                box2[3] - box2[1]
-                            )
-                            if (
-                                box1_area > box2_area
-                                and j not in positions_to_delete
-                            ):
-                                positions_to_delete.append(j)
-                                intersection_combination.append((i, j))
-                            elif (
-                                box1_area  # pylint: disable=comparison-with-itself
-                                < box1_area
-                                and i not in positions_to_delete
-                            ):
-                                positions_to_delete.append(i)
-                                intersection_combination.append((i, j))
-        points = [
-            p for ctr, p in enumerate(points) if ctr not in positions_to_delete
-        ]
+        if len(points) < 2:
+            return points
+        boxes = np.asarray(points, dtype=float)
+        xmin, ymin, xmax, ymax = boxes.T
+        areas = (xmax - xmin) * (ymax - ymin)
+        # normalized ranges used in the containment check
+        x_low, x_high = np.minimum(xmin, xmax), np.maximum(xmin, xmax)
+        y_low, y_high = np.minimum(ymin, ymax), np.maximum(ymin, ymax)
+        to_delete = np.zeros(len(points), dtype=bool)
+        block_size = config.IMAGE_NOISE_REMOVAL_BLOCK_SIZE
+        for start in range(0, len(points), block_size):
+            block = slice(start, start + block_size)
+            # rows are the i boxes of the block, columns the j boxes
+            intersection = (
+                np.maximum(xmin[block, None], xmin)
+                <= np.minimum(xmax[block, None], xmax)
+            ) & (
+                np.maximum(ymin[block, None], ymin)
+                <= np.minimum(ymax[block, None], ymax)
+            )
+            contain = (
+                (x_low <= xmin[block, None])
+                & (xmin[block, None] <= x_high)
+                & (y_low <= ymin[block, None])
+                & (ymin[block, None] <= y_high)
+            )
+            # remove the smallest box
+            smaller = areas[block, None] > areas
+            to_delete |= ((intersection | contain) & smaller).any(axis=0)
+        points = [p for ctr, p in enumerate(points) if not to_delete[ctr]]
         return points
 
     def image_edge_detection(
-        self, image: Image
+        self, image: Image, max_dim=config.IMAGE_EDGE_DETECTION_MAX_DIM
     ):  # pylint: disable=no-self-use, too-many-locals
         """
         Detecs the image edges from the design.
+        If the larger side of the image exceeds max_dim, the edges are
+        detected on a downscaled copy and the boxes are mapped back to the
+        input image coordinates.
 
         @param  image: input open-cv image
+        @param max_dim: working resolution of the larger image side,
+                        0 / None to use the full resolution
 
         @return image_points: list of image objects coordinates
         """
         image_points = []
+        height, width = image.shape[:2]
+        scale = 1.0
+        if max_dim and max(height, width) > max_dim:
+            scale = max_dim / max(height, width)
+            image = cv2.resize(
+                image,
+                (max(1, round(width * scale)), max(1, round(height * scale))),
+                interpolation=cv2.INTER_AREA,
+            )
         # pre processing
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         dst = cv2.equalizeHist(gray)
-        blur = cv2.GaussianBlur(dst, (5, 5), 0)
+        # keep the filters size relative to the design
+        k_size = max(1, int(round(5 * scale)))
+        blur = cv2.GaussianBlur(dst, (k_size | 1, k_size | 1), 0)
         _, im_th = cv2.threshold(blur, 150, 255, cv2.THRESH_BINARY)
         # Set the kernel and perform opening
         # k_size = 6
-        kernel = np.ones((5, 5), np.uint8)
+        kernel = np.ones((k_size, k_size), np.uint8)
 
         opened = cv2.morphologyEx(im_th, cv2.MORPH_OPEN, kernel)
         # edge detection
         edged = cv2.Canny(opened, 0, 255)
-        # countours
-        _, contours, _ = cv2.findContours(
+        # countours, opencv 3 returns the image along with the contours
+        contours = cv2.findContours(
             edged, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE
-        )
+        )[-2]
         # get the coords of the contours
         for con in contours:
             (x_ax, y_ax, w_ax, h_ax) = cv2.boundingRect(con)
             image_points.append((x_ax, y_ax, x_ax + w_ax, y_ax + h_ax))
+        if scale != 1.0:
+            # map back to the input resolution, widening to whole pixels
+            image_points = [
+                (
+                    int(point[0] / scale),
+                    int(point[1] / scale),
+                    min(width, int(np.ceil(point[2] / scale))),
+                    min(height, int(np.ceil(point[3] / scale))),
+                )
+                for point in image_points
+            ]
 
         return image_points
 
@@ -176,6 +204,9 @@ class ImageExtraction:
         """
         Removes all image object's intersecting or containing the rcnn
         detected objects.
+        The rcnn boxes are kept in a grid spatial index, and each image
+        object is only compared with the rcnn boxes sharing a grid cell
+        with it.
 
         @param points1: list of detected image or rcnn model objects coordinates
         @param points2: list of detected image or rcnn model objects coordinates
@@ -185,23 +216,35 @@ class ImageExtraction:
         @param image_first: Boolean value to determine the image object points
                             among points1 and points2
         """
-
-        for point1_ctr, point1 in enumerate(points1):
-            for point2_ctr, point2 in enumerate(points2):
-                if not image_first:
-                    intersection = self.find_points(
-                        point1, point2, for_image=True
+        image_points, model_points = (
+            (points1, points2) if image_first else (points2, points1)
+        )
+        index = GridIndex(config.IMAGE_EXTRACTION_GRID_CELL_SIZE)
+        for model_ctr, model_point in enumerate(model_points):
+            index.add(model_ctr, model_point)
+
+        for image_ctr, image_point in enumerate(image_points):
+            if included_points_positions[image_ctr]:
+                continue
+            # the between models containment check looks 5px inside the
+            # image object
+            xmin, ymin, xmax, ymax = image_point
+            region = (xmin - 5, ymin - 5, xmax + 5, ymax + 5)
+            for model_ctr in index.query(region):
+                model_point = model_points[model_ctr]
+                if image_first:
+                    found = self.check_contains(
+                        image_point, model_point, between_models=True
                     )
                 else:
-                    intersection = False
-                contains = self.check_contains(
-                    point1, point2, between_models=True
-                )
-                if contains or intersection:
-                    if image_first:
-                        included_points_positions[point1_ctr] = 1
-                    else:
-                        included_points_positions[point2_ctr] = 1
+                    found = self.find_points(
+                        model_point, image_point, for_image=True
+                    ) or self.check_contains(
+                        model_point, image_point, between_models=True
+                    )
+                if found:
+                    included_points_positions[image_ctr] = 1
+                    break
 
     def get_image_with_boundary_boxes(
         self,
@@ -256,7 +299,13 @@ class ImageExtraction:
                 2,
             )
 
-    def detect_image(self, image=None, detected_coords=None, pil_image=None):
+    def detect_image(
+        self,
+        image=None,
+        detected_coords=None,
+        pil_image=None,
+        max_dim=config.IMAGE_EDGE_DETECTION_MAX_DIM,
+    ):
         """
         Returns the Detected image coordinates by buidling
         countours over the design edge detection and on removing
@@ -267,10 +316,11 @@ class ImageExtraction:
                                 object's coordinates from faster
                                 rcnn model
         @param pil_image: Input PIL image
+        @param max_dim: working resolution of the edge detection
 
         @return: list of image object coordinates
         """
-        image_points = self.image_edge_detection(image)
+        image_points = self.image_edge_detection(image, max_dim=max_dim)
 
         included_points_positions = [0] * len(image_points)
         self.remove_model_intersection(
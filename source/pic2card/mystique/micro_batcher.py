@@ -0,0 +1,164 @@
+"""
+Dynamic request micro-batching in front of the object detection model.
+
+Concurrent requests hand over their images to a single worker thread which
+collects them into a batch, bounded by a maximum batch size and a maximum
+wait time, and serves the whole batch with one `get_objects_batch` call.
+"""
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+from mystique import config
+
+# Queued by `shutdown` after the last request to stop the worker thread.
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Collects the concurrent detection requests and runs them as a single
+    batched inference on the wrapped object detection model.
+
+    The batcher exposes the same `get_objects` api as the object detection
+    models, so it can be passed to `PredictCard` in place of the model.
+    """
+
+    def __init__(
+        self,
+        od_model,
+        max_batch_size: int = config.MICRO_BATCH_MAX_SIZE,
+        max_wait_ms: float = config.MICRO_BATCH_MAX_WAIT_MS,
+    ):
+        """
+        @param od_model: object detection model instance
+        @param max_batch_size: maximum number of images served per batch
+        @param max_wait_ms: maximum time to wait for a batch to fill up
+        """
+        self.od_model = od_model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batch_size_histogram = Counter()
+        self.queue_depth_histogram = Counter()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run, name="od-micro-batcher", daemon=True
+        )
+        self._worker.start()
+
+    def get_objects(self, image_np: np.array, image: Image) -> Dict:
+        """
+        Queue the image for the next batch and wait for its detections.
+
+        @param image_np: Image tensor, dimension should be HxWx3
+        @param image: PIL Image object
+        @return: ouput dict from the object detection model
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is shut down")
+            self._queue.put((image_np, image, future))
+        return future.result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting the requests, the already queued ones are still
+        served before the worker thread exits.
+
+        @param wait: wait for the worker thread to exit
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        if wait:
+            self._worker.join()
+
+    def _collect_batch(self) -> Tuple[List[Tuple], bool]:
+        """
+        Block for the first request and keep collecting the requests until
+        the batch is full or the wait time is over.
+
+        @return: the batch and True if the batcher is shut down
+        """
+        request = self._queue.get()
+        if request is _STOP:
+            return [], True
+        batch = [request]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is _STOP:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    def _detect(self, batch: List[Tuple]) -> None:
+        """
+        Run the batched inference and fan out the results to the waiting
+        requests.
+        """
+        images_np = [image_np for image_np, _, _ in batch]
+        images = [image for _, image, _ in batch]
+        try:
+            if hasattr(self.od_model, "get_objects_batch"):
+                output_dicts = self.od_model.get_objects_batch(
+                    images_np, images
+                )
+            else:
+                output_dicts = [
+                    self.od_model.get_objects(image_np=image_np, image=image)
+                    for image_np, image in zip(images_np, images)
+                ]
+        except Exception as ex:  # pylint: disable=broad-except
+            for _, _, future in batch:
+                future.set_exception(ex)
+            return
+        for (_, _, future), output_dict in zip(batch, output_dicts):
+            future.set_result(output_dict)
+
+    def _run(self) -> None:
+        """Batching loop of the worker thread"""
+        stopped = False
+        while not stopped:
+            batch, stopped = self._collect_batch()
+            if not batch:
+                continue
+            with self._lock:
+                self.batch_size_histogram[len(batch)] += 1
+                self.queue_depth_histogram[self._queue.qsize()] += 1
+            self._detect(batch)
+
+    def stats(self) -> Dict:
+        """
+        Returns the current queue depth along with the batch size and
+        queue depth histograms.
+        """
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batch_size_histogram": dict(
+                    sorted(self.batch_size_histogram.items())
+                ),
+                "queue_depth_histogram": dict(
+                    sorted(self.queue_depth_histogram.items())
+                ),
+            }
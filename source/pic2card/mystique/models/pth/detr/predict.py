@@ -2,7 +2,7 @@
 Inference APIs for the trained models.
 """
 
-from typing import Callable
+from typing import Callable, List, Tuple
 import torch
 import torchvision.transforms as T
 from PIL import Image
@@ -68,3 +68,44 @@ def detect(
     # bboxes = box_cxcywh_to_xyxy(outputs['pred_boxes'][0, keep])
 
     return probas[keep], bboxes_scaled
+
+
+def detect_batch(  # pylint: disable=redefined-outer-name
+    images: List[Image.Image],
+    model: Callable,
+    transform: Callable,
+    threshold=0.8,
+) -> List[Tuple]:
+    """
+    Batched version of `detect`, the transformed images of the same size
+    are propagated through the model at once.
+
+    The traced model takes no padding mask, so the images are not zero
+    padded to a common size, which would change the detections compared to
+    `detect`. A batch of different sized images runs one forward pass per
+    size instead.
+
+    @param images: List of PIL Images
+    @param model: A Serialized callable, exported using torchscript.
+    @param transform: Data transformer function.
+    @param threshold: Confidence of bbox prediction.
+    @return: list of (probas, bboxes) per image, same as `detect`
+    """
+    tensors = [transform(image) for image in images]
+    size_groups = {}
+    for ctr, tensor in enumerate(tensors):
+        size_groups.setdefault(tuple(tensor.shape), []).append(ctr)
+
+    results = [None] * len(images)
+    for indices in size_groups.values():
+        # pylint: disable=no-member
+        batch = torch.stack([tensors[ctr] for ctr in indices])
+        outputs = model(batch)
+        probas = outputs["pred_logits"].softmax(-1)[:, :, :-1]
+        for batch_ctr, ctr in enumerate(indices):
+            keep = probas[batch_ctr].max(-1).values > threshold
+            bboxes_scaled = rescale_bboxes(
+                outputs["pred_boxes"][batch_ctr, keep], images[ctr].size
+            )
+            results[ctr] = (probas[batch_ctr, keep], bboxes_scaled)
+    return results
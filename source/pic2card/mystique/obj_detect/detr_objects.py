@@ -2,11 +2,11 @@
 Find the objects from card and its attributes using DETR object detection
 model.
 """
-from typing import Dict
+from typing import Dict, List
 import numpy as np
 from PIL import Image
 import torch
-from mystique.models.pth.detr.predict import detect, transform
+from mystique.models.pth.detr.predict import detect, detect_batch, transform
 from mystique import config
 from .od_base import AbstractObjectDetection
 
@@ -49,5 +49,25 @@ class DetrOD(AbstractObjectDetection):
             "detection_boxes": boxes.detach().numpy(),
         }
 
+    def get_objects_batch(
+        self, images_np: List[np.array], images: List[Image.Image]
+    ) -> List[Dict]:
+        """
+        Do the model inference for a list of PIL images, one forward pass per
+        image size, and return the standard response for each image.
+        """
+        results = detect_batch(images, self.model, transform, threshold=0.8)
+        output_dicts = []
+        for scores, boxes in results:
+            ss_ = scores.max(-1)
+            output_dicts.append(
+                {
+                    "detection_classes": ss_.indices.detach().numpy(),
+                    "detection_scores": ss_.values.detach().numpy(),
+                    "detection_boxes": boxes.detach().numpy(),
+                }
+            )
+        return output_dicts
+
     def get_bboxes(self):  # pylint: disable=arguments-differ
         pass
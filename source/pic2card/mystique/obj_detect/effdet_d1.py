@@ -2,14 +2,14 @@
 EfficientDet-D1 Model Inference Integration module.
 """
 from distutils.version import StrictVersion
-from typing import Tuple
+from typing import Dict, List, Tuple
 
 import numpy as np
 import tensorflow as tf
 from PIL import Image
 
 from mystique import config
-from mystique.utils import id_to_label, load_image
+from mystique.utils import group_by_size, id_to_label, load_image
 from .od_base import AbstractObjectDetection
 from .utils import load_frozen_graph
 
@@ -81,3 +81,30 @@ class Tf2EfficientDetD1Model(AbstractObjectDetection):
         output_dict["detection_scores"] = scores
 
         return output_dict
+
+    def get_objects_batch(  # pylint: disable=unused-argument
+        self, images_np: List[np.array], images: List[Image.Image]
+    ) -> List[Dict]:
+        """
+        Returns the objects and coordiates detected for a list of images
+        using a single forward pass per image size, so the detections are
+        the same as of `get_objects`.
+
+        @param images_np: list of image tensors, dimension should be HxWx3
+        @param images: list of PIL Image objects
+
+        @return: list of ouput dicts, one per image
+        """
+        output_dicts = [None] * len(images_np)
+        for indices in group_by_size(images_np):
+            batch = np.stack([images_np[ctr] for ctr in indices])
+            # Model returns [img_id, ymin, xmin, ymax, xmax, score, class]
+            detections = self.model(tf.constant(batch))[0].numpy()
+            for ctr, image_detections in zip(indices, detections):
+                # format: xmin, ymin, xmax, ymax
+                output_dicts[ctr] = {
+                    "detection_classes": image_detections[:, 6],
+                    "detection_boxes": image_detections[:, [2, 1, 4, 3]],
+                    "detection_scores": image_detections[:, 5],
+                }
+        return output_dicts
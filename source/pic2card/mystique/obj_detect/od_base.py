@@ -2,7 +2,7 @@
     apis
 """
 import abc
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List
 import numpy as np
 from PIL import Image
 
@@ -29,6 +29,27 @@ class AbstractObjectDetection(
         """
         pass  # pylint: disable=unnecessary-pass
 
+    def get_objects_batch(
+        self, images_np: List[np.array], images: List[Image.Image]
+    ) -> List[Dict]:
+        """
+        Return the object detection data for a list of images, one response
+        per image in the same order as the input and in the same format as
+        `get_objects`.
+
+        The default implementation runs `get_objects` per image, models
+        supporting batched inference should override this to serve the whole
+        list in a single forward pass.
+
+        @param images_np: list of image tensors, dimension should be HxWx3
+        @param images: list of PIL Image objects
+        @return: list of output dicts
+        """
+        return [
+            self.get_objects(image_np=image_np, image=image)
+            for image_np, image in zip(images_np, images)
+        ]
+
     @abc.abstractmethod
     def get_bboxes(self, image_path: str, img_pipeline=None):
         """
@@ -1,14 +1,14 @@
 """Module for object detection using faster rcnn"""
 
 from distutils.version import StrictVersion
-from typing import Tuple
+from typing import Dict, List, Tuple
 
 import numpy as np
 import tensorflow as tf
 from PIL import Image
 
 from mystique import config
-from mystique.utils import id_to_label, load_image
+from mystique.utils import group_by_size, id_to_label, load_image
 from .od_base import AbstractObjectDetection
 from .utils import load_frozen_graph
 
@@ -71,6 +71,50 @@ class Tf2ObjectDetection(AbstractObjectDetection):
         # renormalize the the box cooridinates
         return output_dict
 
+    def get_objects_batch(
+        self, images_np: List[np.array], images: List[Image.Image]
+    ) -> List[Dict]:
+        """
+        Returns the objects and coordiates detected for a list of images
+        using a single forward pass per image size, so the detections are
+        the same as of `get_objects`.
+
+        @param images_np: list of image tensors, dimension should be HxWx3
+        @param images: list of PIL Image objects
+
+        @return: list of ouput dicts, one per image
+        """
+        output_dicts = [None] * len(images_np)
+        for indices in group_by_size(images_np):
+            batch = np.stack([images_np[ctr] for ctr in indices])
+            batch_outputs = self.run_inference_for_batch(batch)
+            for ctr, output_dict in zip(indices, batch_outputs):
+                width, height = images[ctr].size
+                # format: ymin, xmin, ymax, xmax, renormalize the coords.
+                scale = [height, width, height, width]
+                bboxes = output_dict["detection_boxes"] * scale
+                # format: xmin, ymin, xmax, ymax
+                output_dict["detection_boxes"] = bboxes[:, [1, 0, 3, 2]]
+                output_dicts[ctr] = output_dict
+        return output_dicts
+
+    def run_inference_for_batch(self, batch: np.array) -> List[Dict]:
+        """
+        Runs the inference graph for the given batch of images
+        @param batch: NxHxWx3 numpy array of same sized design images
+        @return: list of output dict of objects, classes and coordinates
+        """
+        bboxes, labels, scores = self.model(tf.constant(batch))
+        bboxes, labels, scores = bboxes.numpy(), labels.numpy(), scores.numpy()
+        return [
+            {
+                "detection_classes": labels[ctr],
+                "detection_boxes": bboxes[ctr],
+                "detection_scores": scores[ctr],
+            }
+            for ctr in range(batch.shape[0])
+        ]
+
     def run_inference_for_single_image(self, image: np.array):
         """
         Runs the inference graph for the given image
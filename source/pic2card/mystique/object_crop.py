@@ -0,0 +1,122 @@
+"""
+Per design object crop context shared by the property extractors.
+The object region is sliced once from a numpy view of the card and the
+grayscale, binary, LA and quantized variants needed by the text, font
+weight and color extraction are derived lazily on first use.
+"""
+from typing import Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Extra width added on both the sides of the text region for the OCR
+TEXT_MARGIN = 5
+
+
+def crop_array(image_np: np.array, coords: Tuple) -> np.array:
+    """
+    Crops the image array like PIL Image.crop, the coordinates are rounded
+    and the region outside the image is filled with zeros.
+    Returns a view of the image array if the region is inside the image.
+    @param image_np: HxWxC image array
+    @param coords: xmin, ymin, xmax, ymax of the region
+    @return: cropped image array
+    """
+    xmin, ymin, xmax, ymax = [int(round(coord)) for coord in coords]
+    height, width = image_np.shape[:2]
+    if xmin >= 0 and ymin >= 0 and xmax <= width and ymax <= height:
+        return image_np[ymin:ymax, xmin:xmax]
+    cropped = np.zeros(
+        (max(ymax - ymin, 0), max(xmax - xmin, 0)) + image_np.shape[2:],
+        dtype=image_np.dtype,
+    )
+    src_x, src_y = max(xmin, 0), max(ymin, 0)
+    src_xmax, src_ymax = min(xmax, width), min(ymax, height)
+    if src_xmax > src_x and src_ymax > src_y:
+        cropped[
+            src_y - ymin : src_ymax - ymin, src_x - xmin : src_xmax - xmin
+        ] = image_np[src_y:src_ymax, src_x:src_xmax]
+    return cropped
+
+
+class ObjectCrop:
+    """
+    Crop context of a design object, created once per object and passed to
+    the text, font weight and color extractors.
+    """
+
+    def __init__(self, image: Image, coords: Tuple, image_np=None):
+        """
+        @param image: input PIL image
+        @param coords: xmin, ymin, xmax, ymax of the design object
+        @param image_np: numpy view of the input image shared by all the
+                         objects of the card, if None it's created from
+                         the PIL image
+        """
+        self.coords = tuple(coords)
+        self.image = image
+        self.image_np = np.asarray(image) if image_np is None else image_np
+        self._array = None
+        self._pil_image = None
+        self._text_image = None
+        self._binary = None
+        self._quantized = None
+
+    @property
+    def array(self) -> np.array:
+        """Returns the object region array"""
+        if self._array is None:
+            self._array = crop_array(self.image_np, self.coords)
+        return self._array
+
+    @property
+    def pil_image(self) -> Image:
+        """Returns the object region PIL image"""
+        if self._pil_image is None:
+            self._pil_image = Image.fromarray(self.array)
+        return self._pil_image
+
+    @property
+    def text_image(self) -> Image:
+        """Returns the LA image of the text region used for the OCR"""
+        if self._text_image is None:
+            xmin, ymin, xmax, ymax = self.coords
+            text_coords = (xmin - TEXT_MARGIN, ymin, xmax + TEXT_MARGIN, ymax)
+            self._text_image = Image.fromarray(
+                crop_array(self.image_np, text_coords)
+            ).convert("LA")
+        return self._text_image
+
+    @property
+    def binary(self) -> np.array:
+        """Returns the binary image with the text pixels set to 255"""
+        if self._binary is None:
+            gray = cv2.cvtColor(
+                np.ascontiguousarray(self.array), cv2.COLOR_BGR2GRAY
+            )
+            # Converting input image to binary format
+            _, self._binary = cv2.threshold(
+                gray, 200, 255, cv2.THRESH_BINARY_INV
+            )
+        return self._binary
+
+    @property
+    def quantized(self) -> Image:
+        """Returns the object region quantized into its 2 dominant colors"""
+        if self._quantized is None:
+            self._quantized = self.pil_image.quantize(colors=2, method=2)
+        return self._quantized
+
+
+def get_object_crop(object_crop, image: Image, coords: Tuple) -> ObjectCrop:
+    """
+    Returns the given crop context if it's of the same coordinates, else
+    a new crop context of the coordinates.
+    @param object_crop: ObjectCrop instance or None
+    @param image: input PIL image
+    @param coords: xmin, ymin, xmax, ymax of the design object
+    """
+    if object_crop is not None and object_crop.coords == tuple(coords):
+        return object_crop
+    return ObjectCrop(image, coords)
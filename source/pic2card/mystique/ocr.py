@@ -0,0 +1,266 @@
+"""
+OCR utilities for the text extraction.
+- pluggable OCR backends [ pytesseract / in-process tesserocr ]
+- whole image OCR, runs tesseract once on the card design image and assigns
+  the recognized words to the detected design object boxes using a uniform
+  grid spatial index over the word bounding boxes.
+"""
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+from PIL import Image
+from pytesseract import pytesseract, Output
+
+from mystique import config
+from mystique.utils import GridIndex, load_instance_with_class_path
+
+logger = logging.getLogger("mysitque")
+
+# pytesseract image_to_data output columns
+OCR_DATA_KEYS = [
+    "level",
+    "page_num",
+    "block_num",
+    "par_num",
+    "line_num",
+    "word_num",
+    "left",
+    "top",
+    "width",
+    "height",
+    "conf",
+    "text",
+]
+
+_OCR_BACKEND = None
+
+
+class PytesseractBackend:  # pylint: disable=too-few-public-methods
+    """
+    OCR backend shelling out to the tesseract binary using pytesseract.
+    """
+
+    # pylint: disable=no-self-use
+    def image_to_data(self, image: Image, psm: int = 6) -> Dict:
+        """
+        Returns the pytesseract image_to_data dict output for the image
+        @param image: input PIL image
+        @param psm: tesseract page segmentation mode
+        @return: pytesseract image_to_data output dict
+        """
+        return pytesseract.image_to_data(
+            image, lang="eng", config=f"--psm {psm}", output_type=Output.DICT
+        )
+
+    def close(self) -> None:
+        """Releases the resources held by the backend"""
+
+
+class TesserocrBackend(PytesseractBackend):
+    """
+    In-process OCR backend using the tesseract C-API through tesserocr.
+    The tesseract API handles are kept in a process wide pool per page
+    segmentation mode and reused across the threads and the requests,
+    avoiding the process spawn and the language data loading for every
+    call. At most `pool_size` handles are created per mode, the callers
+    wait for a free handle beyond that.
+
+    Falls back to pytesseract if tesserocr isn't installed.
+    """
+
+    def __init__(self, pool_size: int = config.TESSEROCR_POOL_SIZE):
+        """
+        @param pool_size: max number of API handles per page segmentation
+                          mode
+        """
+        try:
+            # pylint: disable=import-outside-toplevel, import-error
+            import tesserocr
+
+            self.tesserocr = tesserocr
+        except ImportError:
+            logger.warning("tesserocr isn't available, using pytesseract")
+            self.tesserocr = None
+        self.pool_size = pool_size
+        self._pools = {}
+        self._created = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def _get_api(self, psm: int):
+        """
+        Borrows a tesseract API handle of the psm from the pool, a new one
+        is created if all the handles are in use and the pool isn't full.
+        Raises RuntimeError if no handle is free within the pool timeout.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("OCR backend is closed")
+            pool = self._pools.setdefault(psm, queue.LifoQueue())
+            create = pool.empty() and self._created.get(psm, 0) < self.pool_size
+            if create:
+                self._created[psm] = self._created.get(psm, 0) + 1
+        if create:
+            try:
+                api = self.tesserocr.PyTessBaseAPI(lang="eng", psm=psm)
+            except Exception:
+                # give the slot back, eg; missing language data
+                with self._lock:
+                    self._created[psm] -= 1
+                raise
+        else:
+            try:
+                api = pool.get(timeout=config.TESSEROCR_POOL_TIMEOUT)
+            except queue.Empty as err:
+                raise RuntimeError(
+                    "Timed out waiting for a tesseract API handle"
+                ) from err
+            if api is None:
+                # closed while waiting, wake up the next waiting caller
+                pool.put(None)
+                raise RuntimeError("OCR backend is closed")
+        try:
+            yield api
+        finally:
+            api.Clear()
+            with self._lock:
+                if self._closed:
+                    api.End()
+                else:
+                    pool.put(api)
+
+    def close(self) -> None:
+        """Ends the idle API handles, the borrowed ones end on return"""
+        with self._lock:
+            self._closed = True
+            pools = list(self._pools.values())
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().End()
+                except queue.Empty:
+                    break
+            # wakes up the callers waiting for a handle
+            pool.put(None)
+
+    def image_to_data(self, image: Image, psm: int = 6) -> Dict:
+        """
+        Returns the pytesseract image_to_data like dict output for the image
+        @param image: input PIL image
+        @param psm: tesseract page segmentation mode
+        @return: pytesseract image_to_data output dict
+        """
+        if self.tesserocr is None:
+            return super().image_to_data(image, psm=psm)
+        if image.mode == "LA":
+            # same gray levels as tesseract reads from the LA image
+            image = image.convert("L")
+        with self._get_api(psm) as api:
+            api.SetImage(image)
+            tsv = api.GetTSVText(0)
+        # parse the same tsv format as pytesseract does
+        header = "\t".join(OCR_DATA_KEYS)
+        return pytesseract.file_to_dict(f"{header}\n{tsv}", "\t", -1)
+
+
+def get_ocr_backend():
+    """
+    Returns the active OCR backend instance from the OCR_BACKEND_REGISTRY,
+    the backend is created once and shared.
+    """
+    global _OCR_BACKEND  # pylint: disable=global-statement
+    if _OCR_BACKEND is None:
+        _OCR_BACKEND = load_instance_with_class_path(
+            config.OCR_BACKEND_REGISTRY[config.ACTIVE_OCR_BACKEND]
+        )
+    return _OCR_BACKEND
+
+
+def close_ocr_backend() -> None:
+    """Closes the active OCR backend, a new one is created on the next use"""
+    global _OCR_BACKEND  # pylint: disable=global-statement
+    if _OCR_BACKEND is not None:
+        _OCR_BACKEND.close()
+        _OCR_BACKEND = None
+
+
+class WholeImageOcr:
+    """
+    Runs tesseract on the whole design image and returns the per object
+    pytesseract data for the given coordinates, in the same shape as the
+    per crop `image_to_data` output.
+    """
+
+    def __init__(self, image: Image, cell_size=config.OCR_GRID_CELL_SIZE):
+        """
+        @param image: input PIL image
+        @param cell_size: grid cell size in pixels of the spatial index
+        """
+        img_data = get_ocr_backend().image_to_data(
+            image.convert("LA"), psm=config.OCR_WHOLE_IMAGE_PSM
+        )
+        # keep only the recognized words
+        self.words = [
+            {key: img_data[key][ctr] for key in OCR_DATA_KEYS}
+            for ctr in range(len(img_data["text"]))
+            if img_data["level"][ctr] == 5 and img_data["text"][ctr].strip()
+        ]
+        self.index = GridIndex(cell_size)
+        for word_id, word in enumerate(self.words):
+            self.index.add(
+                word_id,
+                (
+                    word["left"],
+                    word["top"],
+                    word["left"] + word["width"],
+                    word["top"] + word["height"],
+                ),
+            )
+
+    def query(self, coords: Tuple) -> List[Dict]:
+        """
+        Returns the words whose center lies inside the given coordinates in
+        the tesseract reading order.
+        @param coords: xmin, ymin, xmax, ymax of the region
+        """
+        words = []
+        for word_id in self.index.query(coords):
+            word = self.words[word_id]
+            x_center = word["left"] + word["width"] / 2
+            y_center = word["top"] + word["height"] / 2
+            if (
+                coords[0] <= x_center <= coords[2]
+                and coords[1] <= y_center <= coords[3]
+            ):
+                words.append(word)
+        return words
+
+    def get_data(self, coords: Tuple) -> Dict:
+        """
+        Build the pytesseract data dict of the region, the positions are
+        relative to the region and the lines are renumbered from 1 as if
+        the region was cropped and recognized separately.
+        @param coords: xmin, ymin, xmax, ymax of the region
+        @return: pytesseract image_to_data like dict
+        """
+        img_data = {key: [] for key in OCR_DATA_KEYS}
+        line_numbers = {}
+        for word in self.query(coords):
+            line_key = (word["block_num"], word["par_num"], word["line_num"])
+            line_num = line_numbers.setdefault(line_key, len(line_numbers) + 1)
+            word_row = dict(
+                word,
+                page_num=1,
+                block_num=1,
+                par_num=1,
+                line_num=line_num,
+                left=word["left"] - int(coords[0]),
+                top=word["top"] - int(coords[1]),
+            )
+            for key in OCR_DATA_KEYS:
+                img_data[key].append(word_row[key])
+        return img_data
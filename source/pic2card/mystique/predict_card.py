@@ -1,22 +1,32 @@
 """Module to  get the predicted adaptive card json"""
-
 import base64
-import io
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 
-import cv2
 import numpy as np
 from PIL import Image
 from mystique import config
 from mystique.ac_export.card_template_data import DataBinding
 from mystique.extract_properties import CollectProperties
 from mystique.font_properties import classify_font_weights
-from mystique.utils import get_property_method, send_json_payload
+from mystique.ocr import WholeImageOcr
+from mystique.object_crop import ObjectCrop
+from mystique.tf_serving import get_tf_serving_client
+from mystique.utils import DecodedImage, get_property_method
 from mystique.card_layout import row_column_group
 from mystique.card_layout import bbox_utils
+from mystique.card_layout.design_object import DesignObjects
 from mystique.ac_export import adaptive_card_export
 
+# class id to label lookup, the last entry is for the unknown class ids
+LABEL_LOOKUP = np.array(
+    [
+        config.ID_TO_LABEL.get(class_id, "")
+        for class_id in range(max(config.ID_TO_LABEL) + 2)
+    ],
+    dtype=object,
+)
+
 
 class PredictCard:
     """
@@ -30,6 +40,9 @@ class PredictCard:
         Find the card components using Object detection model
         """
         self.od_model = od_model
+        # DecodedImage of the card being predicted, its RGB array is reused
+        # for cropping the design objects.
+        self.decoded_image = None
 
     def collect_objects(
         self, output_dict=None, pil_image=None
@@ -42,67 +55,108 @@ class PredictCard:
         @return: Collected json of the design objects
                  and list of detected object's coordinates
         """
-        boxes = output_dict["detection_boxes"]
-        scores = output_dict["detection_scores"]
-        classes = output_dict["detection_classes"]
-        r_a, _ = boxes.shape
-        detected_coords = []
-        json_object = {}.fromkeys(["objects"], [])
-        for i in range(r_a):
-            if scores[i] * 100 >= config.MODEL_CONFIDENCE:
-                object_json = dict().fromkeys(
-                    ["object", "xmin", "ymin", "xmax", "ymax"], ""
-                )
-                object_json["object"] = config.ID_TO_LABEL[classes[i]]
-                if object_json["object"]:
-                    xmin, ymin, xmax, ymax = boxes[i]
-                    object_json["xmin"] = xmin
-                    object_json["ymin"] = ymin
-                    object_json["xmax"] = xmax
-                    object_json["ymax"] = ymax
-                    object_json["coordinates"] = (xmin, ymin, xmax, ymax)
-                    object_json["score"] = scores[i]
-                    object_json["uuid"] = str(uuid.uuid4())
-                    object_json["class"] = classes[i]
-
-                    if object_json["object"] == "textbox":
-                        detected_coords.append(
-                            (
-                                xmin - config.TEXTBOX_PADDING,
-                                ymin,
-                                xmax + config.TEXTBOX_PADDING,
-                                ymax,
-                            )
-                        )
-                    else:
-                        detected_coords.append((xmin, ymin, xmax, ymax))
-
-                    json_object["objects"].append(object_json)
+        boxes = np.asarray(output_dict["detection_boxes"])
+        scores = np.asarray(output_dict["detection_scores"])
+        classes = np.asarray(output_dict["detection_classes"])
+        # confidence filtering and label mapping over all the proposals at
+        # once, dicts are built only for the surviving objects.
+        keep = np.flatnonzero(scores * 100 >= config.MODEL_CONFIDENCE)
+        class_ids = classes[keep].astype(np.int64)
+        class_ids[(class_ids < 0) | (class_ids >= len(LABEL_LOOKUP))] = -1
+        labels = LABEL_LOOKUP[class_ids]
+        keep, labels = keep[labels != ""], labels[labels != ""]
+        boxes, scores, classes = boxes[keep], scores[keep], classes[keep]
+        # extra padding for the textboxes
+        padding = np.where(labels == "textbox", config.TEXTBOX_PADDING, 0)
+        detected_boxes = boxes.copy()
+        detected_boxes[:, 0] -= padding
+        detected_boxes[:, 2] += padding
+
+        detected_coords = [tuple(box) for box in detected_boxes]
+        design_objects = DesignObjects(labels, boxes, scores, classes)
+        json_object = {"objects": design_objects.to_dicts()}
 
         return json_object, detected_coords
 
     # pylint: disable=no-self-use
+    def _extract_object_properties(
+        self,
+        design_object: Dict,
+        pil_image: Image,
+        ocr_index=None,
+        image_np=None,
+    ) -> Dict:
+        """
+        Extract the properties of a single design object.
+        @param design_object: design object collected from the model.
+        @param pil_image: Input PIL image
+        @param ocr_index: WholeImageOcr instance of the card if any
+        @param image_np: numpy view of the input PIL image
+        @return: property element of the design object
+        """
+        # Creating an Extract Property class instance per object, as the
+        # uuid is kept as instance state and objects run concurrently.
+        collect_prop = CollectProperties()
+        collect_prop.uuid = design_object.get("uuid")
+        collect_prop.ocr_index = ocr_index
+        collect_prop.object_crop = ObjectCrop(
+            pil_image, design_object.get("coordinates"), image_np=image_np
+        )
+        # Invoking the methods from dict according to the design object
+        property_object = get_property_method(
+            collect_prop, design_object.get("object")
+        )
+        return property_object(pil_image, design_object.get("coordinates"))
+
     def get_object_properties(
         self, design_objects: List[Dict], pil_image: Image, queue=None
     ) -> None:
         """
         Extract each design object's properties.
+        The objects are extracted concurrently using a bounded thread pool of
+        config.PROPERTY_EXTRACTION_WORKERS, the OCR and the opencv calls
+        release the GIL, and the results are merged back by uuid in the
+        order of the design objects.
         @param design_objects: List of design objects collected from the model.
         @param pil_image: Input PIL image
         @param queue: Queue object of the calling process
         """
-        # Creating an Extract Property class instance
-        collect_prop = CollectProperties()
+        ocr_index = None
+        if config.OCR_MODE == "whole_image":
+            ocr_index = WholeImageOcr(pil_image)
+        # objects are cropped from a single array view of the card
+        if (
+            self.decoded_image is not None
+            and self.decoded_image.pil_image is pil_image
+        ):
+            image_np = self.decoded_image.rgb
+        else:
+            image_np = np.asarray(pil_image)
+        workers = min(config.PROPERTY_EXTRACTION_WORKERS, len(design_objects))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    design_object.get("uuid"): executor.submit(
+                        self._extract_object_properties,
+                        design_object,
+                        pil_image,
+                        ocr_index,
+                        image_np,
+                    )
+                    for design_object in design_objects
+                }
+                properties = {
+                    uuid_: future.result() for uuid_, future in futures.items()
+                }
+        else:
+            properties = {
+                design_object.get("uuid"): self._extract_object_properties(
+                    design_object, pil_image, ocr_index, image_np
+                )
+                for design_object in design_objects
+            }
         for design_object in design_objects:
-            collect_prop.uuid = design_object.get("uuid")
-            # Invoking the methods from dict according to the design object
-            property_object = get_property_method(
-                collect_prop, design_object.get("object")
-            )
-            property_element = property_object(
-                pil_image, design_object.get("coordinates")
-            )
-            design_object.update(property_element)
+            design_object.update(properties[design_object.get("uuid")])
         design_objects = classify_font_weights(design_objects)
         # If any Queue object is passed , put the return value inside the
         # queue in-order to retrieve the value after the process finishes.
@@ -119,14 +173,26 @@ class PredictCard:
         @param image: input image path
         @return: predicted card json
         """
-        image = image.convert("RGB")
-        image_np = np.asarray(image)
-        image_np = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
+        return self.predict_decoded(DecodedImage.from_pil(image), card_format)
+
+    def predict_decoded(
+        self, decoded_image: DecodedImage, card_format=None
+    ) -> Dict:
+        """
+        Predicts the card json of the already decoded input image
+        @param decoded_image: DecodedImage of the input image
+        @param card_format: format specification for template data binding
+        @return: predicted card json
+        """
+        self.decoded_image = decoded_image
         # Extract the design objects from faster rcnn model
-        output_dict = self.od_model.get_objects(image_np=image_np, image=image)
-        return self.generate_card(output_dict, image, image_np, card_format)
+        output_dict = self.od_model.get_objects(
+            image_np=decoded_image.bgr, image=decoded_image.pil_image
+        )
+        return self.generate_card(
+            output_dict, decoded_image.pil_image, card_format
+        )
 
-    # pylint: disable=unused-argument
     def tf_serving_main(
         self,
         bs64_img: str,
@@ -136,43 +202,27 @@ class PredictCard:
     ) -> Dict:
         """
         Do model inference using TF-Serve service.
+        @param bs64_img: base64 string of the image
+        @param tf_server: TF Serving url, if None the url of the configured
+                          TF_SERVING_PROTOCOL
+        @param model_name: name of the served model
+        @param card_format: format specification for template data binding
         """
-
-        api_path = "v1/models/{model_name}:predict"
-        payloads = {
-            "signature_name": "serving_default",
-            "instances": [{"b64": bs64_img}],
-        }
-        # Hit the tf-serving and get the prediction
-        response = send_json_payload(
-            api_path, body=payloads, host_port=tf_server
-        )
-
-        pred_res = response["predictions"][0]
-
-        filtered_res = {}
-        for key_col in [
-            "detection_boxes",
-            "detection_scores",
-            "detection_classes",
-        ]:
-            filtered_res[key_col] = np.array(pred_res[key_col])
+        client = get_tf_serving_client(model_name, url=tf_server)
+        filtered_res = client.predict(bs64_img)
 
         # Prepare the card from object detection.
-        imgdata = base64.b64decode(bs64_img)
-        image = Image.open(io.BytesIO(imgdata))
-        image = image.convert("RGB")
-        image_np = np.asarray(image)
-        image_np = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
-        card = self.generate_card(filtered_res, image, image_np, card_format)
+        decoded_image = DecodedImage.from_bytes(base64.b64decode(bs64_img))
+        self.decoded_image = decoded_image
+        card = self.generate_card(
+            filtered_res, decoded_image.pil_image, card_format
+        )
         return card
 
-    # pylint: disable=unused-argument
     def generate_card(
         self,
         prediction: Dict,
         image: Image,
-        image_np: np.array,
         card_format: str,
     ):
         """
@@ -180,10 +230,8 @@ class PredictCard:
         card object.
         @param prediction: Prediction result from rcnn model
         @param image: PIL Image object to crop the regions.
-        @param image_np: Array representation of the image.
         @param card_format: format specification for template data binding
         """
-        # TODO: Remove the reduendant usage of image and image_np
         # Collect the objects along with its design properites
 
         predicted_objects, detected_coords = self.collect_objects(
@@ -0,0 +1,150 @@
+"""
+Clients of the object detection model hosted in TF Serving.
+
+The REST client posts the base64 image over the pooled keep-alive http
+connections, the gRPC client keeps a single HTTP/2 channel open per server
+and needs the optional tensorflow-serving-api and grpcio packages.
+"""
+import base64
+import threading
+from typing import Dict
+
+import numpy as np
+
+from mystique import config
+from mystique.http_pool import retry_with_backoff
+from mystique.utils import send_json_payload
+
+# Detection outputs used for the card generation.
+OUTPUT_KEYS = ["detection_boxes", "detection_scores", "detection_classes"]
+
+
+class TfServingRestClient:
+    """
+    Predicts the objects using the TF Serving REST api.
+    """
+
+    def __init__(self, url: str, model_name: str):
+        """
+        @param url: TF Serving REST url eg; http://localhost:8501
+        @param model_name: name of the served model
+        """
+        self.url = url
+        self.api_path = f"/v1/models/{model_name}:predict"
+
+    def predict(self, bs64_img: str) -> Dict:
+        """
+        Returns the detection boxes, scores and classes of the image.
+        @param bs64_img: base64 string of the image
+        """
+        payloads = {
+            "signature_name": "serving_default",
+            "instances": [{"b64": bs64_img}],
+        }
+        # Hit the tf-serving and get the prediction
+        response = send_json_payload(
+            self.api_path, body=payloads, host_port=self.url
+        )
+        pred_res = response["predictions"][0]
+        return {key: np.array(pred_res[key]) for key in OUTPUT_KEYS}
+
+
+class TfServingGrpcClient:
+    """
+    Predicts the objects using the TF Serving gRPC api.
+    """
+
+    def __init__(self, url: str, model_name: str):
+        """
+        @param url: TF Serving gRPC host and port eg; localhost:8500
+        @param model_name: name of the served model
+        """
+        # pylint: disable=import-outside-toplevel, import-error
+        import grpc
+        from tensorflow.core.framework import types_pb2
+        from tensorflow_serving.apis import predict_pb2
+        from tensorflow_serving.apis import prediction_service_pb2_grpc
+
+        self.grpc = grpc
+        self.types_pb2 = types_pb2
+        self.predict_pb2 = predict_pb2
+        self.model_name = model_name
+        # transient errors worth a retry, the others [ invalid argument,
+        # model not found ... ] fail the same way again
+        self.retry_codes = (
+            grpc.StatusCode.UNAVAILABLE,
+            grpc.StatusCode.DEADLINE_EXCEEDED,
+        )
+        self.dtypes = {
+            types_pb2.DT_FLOAT: ("float_val", np.float32),
+            types_pb2.DT_DOUBLE: ("double_val", np.float64),
+            types_pb2.DT_INT32: ("int_val", np.int32),
+            types_pb2.DT_INT64: ("int64_val", np.int64),
+        }
+        self.stub = prediction_service_pb2_grpc.PredictionServiceStub(
+            grpc.insecure_channel(url)
+        )
+
+    def to_array(self, tensor) -> np.array:
+        """
+        Returns the numpy array of the output TensorProto.
+        @param tensor: TensorProto of an output
+        """
+        field, dtype = self.dtypes[tensor.dtype]
+        shape = [dim.size for dim in tensor.tensor_shape.dim]
+        if tensor.tensor_content:
+            values = np.frombuffer(tensor.tensor_content, dtype=dtype)
+        else:
+            values = np.array(getattr(tensor, field), dtype=dtype)
+        return values.reshape(shape)
+
+    def predict(self, bs64_img: str) -> Dict:
+        """
+        Returns the detection boxes, scores and classes of the image.
+        @param bs64_img: base64 string of the image
+        """
+        request = self.predict_pb2.PredictRequest()
+        request.model_spec.name = self.model_name
+        request.model_spec.signature_name = "serving_default"
+        tensor = request.inputs[config.TF_SERVING_INPUT_NAME]
+        tensor.dtype = self.types_pb2.DT_STRING
+        tensor.tensor_shape.dim.add(size=1)
+        tensor.string_val.append(base64.b64decode(bs64_img))
+
+        response = retry_with_backoff(
+            lambda: self.stub.Predict(request, timeout=config.HTTP_TIMEOUT),
+            (self.grpc.RpcError,),
+            should_retry=lambda err: err.code() in self.retry_codes,
+        )
+        return {
+            key: self.to_array(response.outputs[key])[0] for key in OUTPUT_KEYS
+        }
+
+
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_tf_serving_client(model_name: str, url: str = None, protocol=None):
+    """
+    Returns the process wide TF Serving client of the model.
+    @param model_name: name of the served model
+    @param url: TF Serving url, TF_SERVING_URL or TF_SERVING_GRPC_URL of
+                the protocol by default
+    @param protocol: "rest" or "grpc", TF_SERVING_PROTOCOL by default
+    """
+    protocol = protocol or config.TF_SERVING_PROTOCOL
+    key = (protocol, url, model_name)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            if protocol == "grpc":
+                client = TfServingGrpcClient(
+                    url or config.TF_SERVING_GRPC_URL, model_name
+                )
+            else:
+                client = TfServingRestClient(
+                    url or config.TF_SERVING_URL, model_name
+                )
+            _CLIENTS[key] = client
+        return client
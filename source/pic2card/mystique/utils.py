@@ -3,20 +3,21 @@ import time
 import io
 import re
 import json
-import http.client
-import urllib
-from typing import Optional, Dict, Tuple
+import urllib.parse
+from typing import Optional, Dict, List, Tuple
 import glob
 import xml.etree.ElementTree as Et
 from contextlib import contextmanager
 from importlib import import_module
 
+import cv2
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from PIL import Image
 
 from mystique import config
+from mystique.http_pool import get_connection_pool
 
 # Colro map used for the plotting.
 COLORS = [
@@ -216,20 +217,21 @@ def send_json_payload(
     url_params: Optional[Dict] = None,
 ) -> Dict:
     """
-    Send Json payload via http post method.
+    Send Json payload via http post method, over a pooled keep-alive
+    connection to the host.
 
     @param path: API path, eg; /predict_json
     @param body: Request payload
-    @param host_port: Host and port of the api server eg; localhost:5050
+    @param host_port: Host and port of the api server eg; localhost:5050,
+                      optionally with the scheme eg; http://localhost:8501
     @param method: Http request method.
     """
     headers = {"Content-Type": "application/json"}
     if url_params:
         path += "?" + urllib.parse.urlencode(url_params)
-    conn = http.client.HTTPConnection(host_port)
-    conn.request(method, path, json.dumps(body), headers)
-    response = json.loads(conn.getresponse().read())
-    return response
+    pool = get_connection_pool(host_port)
+    _, data = pool.request(method, path, json.dumps(body), headers)
+    return json.loads(data)
 
 
 def load_image(image_path: str) -> Tuple[Image.Image, np.array]:
@@ -241,3 +243,105 @@ def load_image(image_path: str) -> Tuple[Image.Image, np.array]:
     image = image.convert("RGB")
     image_np = np.asarray(image)
     return image, image_np
+
+
+class DecodedImage:
+    """
+    Input image decoded once, holding the RGB PIL image, its RGB array and
+    the BGR array for the opencv / model consumers created on first use.
+    """
+
+    def __init__(self, pil_image: Image.Image):
+        """
+        @param pil_image: RGB PIL image
+        """
+        self.pil_image = pil_image
+        self.rgb = np.asarray(pil_image)
+        self._bgr = None
+
+    @classmethod
+    def from_pil(cls, image: Image.Image) -> "DecodedImage":
+        """
+        Decodes the PIL image, RGB images are not converted.
+        @param image: input PIL image
+        """
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return cls(image)
+
+    @classmethod
+    def from_bytes(cls, imgdata: bytes) -> "DecodedImage":
+        """
+        Decodes the encoded image file bytes.
+        @param imgdata: image file content
+        """
+        return cls.from_pil(Image.open(io.BytesIO(imgdata)))
+
+    @property
+    def bgr(self) -> np.array:
+        """Returns the BGR array of the image"""
+        if self._bgr is None:
+            self._bgr = cv2.cvtColor(self.rgb, cv2.COLOR_RGB2BGR)
+        return self._bgr
+
+
+def group_by_size(images_np: List[np.array]) -> List[List[int]]:
+    """
+    Groups the indices of the same shaped images, so that each group is
+    stacked into a batch without padding. The models resize their input,
+    a padded canvas would change the scale an image is seen at and so its
+    detections.
+
+    @param images_np: list of image arrays, dimension should be HxWx3
+    @return: list of the image index groups, in the order of appearance
+    """
+    groups = {}
+    for ctr, image_np in enumerate(images_np):
+        groups.setdefault(image_np.shape, []).append(ctr)
+    return list(groups.values())
+
+
+class GridIndex:
+    """
+    Uniform grid spatial index over bounding boxes, every box is added to
+    the grid cells it overlaps so that a query only looks at the boxes
+    sharing a cell with the queried region.
+    """
+
+    def __init__(self, cell_size: int):
+        """
+        @param cell_size: grid cell size in pixels
+        """
+        self.cell_size = cell_size
+        self.grid = {}
+
+    def cells(self, box: Tuple) -> List[Tuple[int, int]]:
+        """
+        Returns the grid cells overlapped by the box.
+        @param box: xmin, ymin, xmax, ymax of the box
+        """
+        xmin, ymin, xmax, ymax = [int(c // self.cell_size) for c in box]
+        return [
+            (x_cell, y_cell)
+            for x_cell in range(min(xmin, xmax), max(xmin, xmax) + 1)
+            for y_cell in range(min(ymin, ymax), max(ymin, ymax) + 1)
+        ]
+
+    def add(self, item_id: int, box: Tuple):
+        """
+        Adds the item to the cells overlapped by its box.
+        @param item_id: id of the item, returned by the queries
+        @param box: xmin, ymin, xmax, ymax of the item
+        """
+        for cell in self.cells(box):
+            self.grid.setdefault(cell, []).append(item_id)
+
+    def query(self, box: Tuple) -> List[int]:
+        """
+        Returns the sorted ids of the items sharing a cell with the box.
+        @param box: xmin, ymin, xmax, ymax of the region
+        """
+        candidates = set()
+        for cell in self.cells(box):
+            candidates.update(self.grid.get(cell, []))
+        return sorted(candidates)
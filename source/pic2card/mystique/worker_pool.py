@@ -0,0 +1,169 @@
+"""
+Persistent worker pool used to run the property extraction and the layout
+structuring of a card in parallel.
+
+The pool is created once (at app startup) instead of forking new processes
+for every card, and in the process based pool the input image is handed over
+to the workers through shared memory instead of pickling it.
+"""
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from mystique import config
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # python < 3.8
+    shared_memory = None
+
+_WORKER_POOL = None
+
+# Image modes restored as it is from the shared pixel array, the palette of
+# the "P" images is sent along with the reference and the other modes are
+# shared as RGB.
+SHARED_IMAGE_MODES = ("RGB", "RGBA", "L", "LA", "P")
+
+
+def get_pool_type() -> str:
+    """
+    Returns the configured pool type [process / thread], the boolean True
+    in config.MULTI_PROC means a process pool.
+    """
+    if config.MULTI_PROC == "thread":
+        return "thread"
+    return "process"
+
+
+def get_worker_pool() -> Executor:
+    """
+    Returns the shared worker pool, creates it on the first call and
+    recreates it once a worker process died and broke the pool.
+    """
+    global _WORKER_POOL  # pylint: disable=global-statement
+    if isinstance(_WORKER_POOL, ProcessPoolExecutor) and _WORKER_POOL._broken:
+        # pylint: disable=protected-access
+        # a broken pool raises BrokenProcessPool for every submit
+        _WORKER_POOL.shutdown(wait=False)
+        _WORKER_POOL = None
+    if _WORKER_POOL is None:
+        if get_pool_type() == "thread":
+            _WORKER_POOL = ThreadPoolExecutor(
+                max_workers=config.MULTI_PROC_WORKERS
+            )
+        else:
+            _WORKER_POOL = ProcessPoolExecutor(
+                max_workers=config.MULTI_PROC_WORKERS
+            )
+    return _WORKER_POOL
+
+
+def init_worker_pool() -> Executor:
+    """
+    Create the worker pool and start all of its workers upfront, so the
+    requests don't pay for the worker startup.
+    """
+    pool = get_worker_pool()
+    futures = [
+        pool.submit(os.getpid) for _ in range(config.MULTI_PROC_WORKERS)
+    ]
+    for future in futures:
+        future.result()
+    return pool
+
+
+def shutdown_worker_pool() -> None:
+    """Shutdown the shared worker pool"""
+    global _WORKER_POOL  # pylint: disable=global-statement
+    if _WORKER_POOL is not None:
+        _WORKER_POOL.shutdown()
+        _WORKER_POOL = None
+
+
+class SharedImage:
+    """
+    Holds a copy of the PIL image in a shared memory block and returns a
+    small picklable reference to it, that can be loaded back in the worker
+    processes using `load_shared_image`.
+
+    For the thread pool or when shared memory isn't available the reference
+    is the PIL image itself.
+
+    >> with SharedImage(image) as image_ref:
+    >>     pool.submit(func, image_ref)
+    """
+
+    def __init__(self, image: Image, use_shared_memory=True):
+        self.image = image
+        self.shm = None
+        if use_shared_memory and shared_memory is not None:
+            if image.mode not in SHARED_IMAGE_MODES:
+                image = image.convert("RGB")
+            image_np = np.asarray(image)
+            self.shm = shared_memory.SharedMemory(
+                create=True, size=image_np.nbytes
+            )
+            shared_np = np.ndarray(
+                image_np.shape, dtype=image_np.dtype, buffer=self.shm.buf
+            )
+            shared_np[:] = image_np
+            self.reference = (
+                self.shm.name,
+                image_np.shape,
+                image_np.dtype.str,
+                image.mode,
+                image.getpalette() if image.mode == "P" else None,
+            )
+        else:
+            self.reference = image
+
+    def __enter__(self) -> Union[Image.Image, Tuple]:
+        return self.reference
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        """Release the shared memory block"""
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+def load_shared_image(reference: Union[Image.Image, Tuple]) -> Image.Image:
+    """
+    Returns the PIL image for the reference built by `SharedImage`.
+    """
+    if isinstance(reference, Image.Image):
+        return reference
+    name, shape, dtype, mode, palette = reference
+    shm = _attach_shared_memory(name)
+    try:
+        image_np = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        image = Image.fromarray(image_np.copy(), mode=mode)
+    finally:
+        shm.close()
+    if palette is not None:
+        image.putpalette(palette)
+    return image
+
+
+def _attach_shared_memory(name: str):
+    """
+    Attach to the shared memory block created by the parent process,
+    without registering it with the resource tracker on python >= 3.13.
+
+    The older versions register the attached block again, the pool workers
+    share the parent's resource tracker [ its fd is inherited with fork,
+    spawn and forkserver ] where the repeated registration is a no-op.
+    Unregistering it here would drop the parent's own registration and the
+    tracker fails on the parent's unlink.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # python < 3.13
+        return shared_memory.SharedMemory(name=name)
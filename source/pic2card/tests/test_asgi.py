@@ -0,0 +1,188 @@
+"""Tests for the ASGI service routes"""
+import asyncio
+import base64
+import threading
+import unittest
+from unittest.mock import patch
+
+from starlette.requests import Request
+from starlette.testclient import TestClient
+
+from app import asgi
+from app.utils import get_templates
+from mystique import config
+
+IMAGE = b"\x89PNG image bytes"
+BOUNDARY = "pic2card-boundary"
+
+
+def multipart_chunks(image_chunks):
+    """
+    Yields the multipart body of the image field posted in the chunks
+    """
+    yield (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="image"; filename="card.png"'
+        "\r\nContent-Type: image/png\r\n\r\n"
+    ).encode()
+    yield from image_chunks
+    yield f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+class FakePredictCard:
+    """Returns the size and the card format of the posted image"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, service, imgdata, card_format):
+        """Blocks the prediction until released"""
+        self.started.set()
+        self.release.wait(timeout=5)
+        return {
+            "card_json": {"size": len(imgdata), "format": card_format},
+            "error": None,
+        }
+
+
+class TestAsgiApp(unittest.TestCase):
+    """Tests the uploads, the size limit and the backpressure"""
+
+    def setUp(self):
+        self.predict = FakePredictCard()
+        patches = [
+            patch.object(asgi, "init_service"),
+            patch.object(asgi, "shutdown_service"),
+            patch.object(asgi, "predict_card", self.predict),
+            patch.object(config, "ASGI_MAX_IN_FLIGHT", 1),
+            patch.object(config, "ASGI_MAX_WAITING", 0),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(asgi.app)
+        # runs the lifespan startup and shutdown
+        self.client.__enter__()
+        self.addCleanup(self.client.__exit__, None, None, None)
+
+    def assert_card(self, response, card_format=None):
+        """Asserts the prediction got the posted image"""
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["card_json"],
+            {"size": len(IMAGE), "format": card_format},
+        )
+
+    def test_octet_stream_upload(self):
+        """Tests the raw octet-stream upload"""
+        response = self.client.post(
+            "/predict_json?format=template",
+            content=IMAGE,
+            headers={"Content-Type": "application/octet-stream"},
+        )
+        self.assert_card(response, "template")
+
+    def test_base64_json(self):
+        """Tests the base64 json upload"""
+        response = self.client.post(
+            "/predict_json", json={"image": base64.b64encode(IMAGE).decode()}
+        )
+        self.assert_card(response)
+
+    def test_multipart_upload(self):
+        """Tests the multipart upload of the image field"""
+        response = self.client.post(
+            "/predict_json", files={"image": ("card.png", IMAGE)}
+        )
+        self.assert_card(response)
+
+    @patch.object(config, "IMG_MAX_UPLOAD_SIZE", 8)
+    def test_upload_too_large(self):
+        """Tests the uploads over the size limit, with and without the
+        Content-Length"""
+        octet_stream = "application/octet-stream"
+        multipart = f"multipart/form-data; boundary={BOUNDARY}"
+        uploads = [
+            (IMAGE, octet_stream),
+            (iter([IMAGE[:8], IMAGE[8:]]), octet_stream),
+            (multipart_chunks([IMAGE[:8], IMAGE[8:]]), multipart),
+        ]
+        for content, content_type in uploads:
+            response = self.client.post(
+                "/predict_json",
+                content=content,
+                headers={"Content-Type": content_type},
+            )
+            self.assertEqual(response.json()["error"]["code"], 1002)
+        self.assertFalse(self.predict.started.is_set())
+
+    @patch.object(config, "IMG_MAX_UPLOAD_SIZE", 1000)
+    @patch.object(config, "IMG_UPLOAD_MULTIPART_OVERHEAD", 1000)
+    def test_chunked_multipart_read(self):
+        """Tests the chunked multipart body is not read past the limit"""
+        body = list(multipart_chunks([b"0" * 1024] * 200))
+        received = []
+
+        async def receive():
+            received.append(body[len(received)])
+            more_body = len(received) < len(body)
+            return {
+                "type": "http.request",
+                "body": received[-1],
+                "more_body": more_body,
+            }
+
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/predict_json",
+            "query_string": b"",
+            "headers": [
+                (
+                    b"content-type",
+                    f"multipart/form-data; boundary={BOUNDARY}".encode(),
+                ),
+                (b"transfer-encoding", b"chunked"),
+            ],
+        }
+        with self.assertRaises(asgi.UploadTooLarge):
+            asyncio.run(asgi.read_image(Request(scope, receive)))
+        self.assertLess(len(received), 5)
+
+    def test_in_flight_limit(self):
+        """Tests the requests beyond the in-flight limit get a 503"""
+        self.predict.release.clear()
+        responses = []
+        running = threading.Thread(
+            target=lambda: responses.append(
+                self.client.post(
+                    "/predict_json",
+                    content=IMAGE,
+                    headers={"Content-Type": "application/octet-stream"},
+                )
+            )
+        )
+        running.start()
+        self.assertTrue(self.predict.started.wait(timeout=5))
+        response = self.client.post(
+            "/predict_json",
+            content=IMAGE,
+            headers={"Content-Type": "application/octet-stream"},
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["error"]["code"], 1003)
+        self.predict.release.set()
+        running.join(timeout=5)
+        self.assert_card(responses[0])
+
+    def test_card_templates(self):
+        """Tests the template images route"""
+        response = self.client.get("/get_card_templates")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), get_templates())
+
+
+if __name__ == "__main__":
+    unittest.main()
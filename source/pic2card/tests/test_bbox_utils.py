@@ -0,0 +1,75 @@
+"""Tests for the noise objects removal"""
+import copy
+import random
+import unittest
+
+from mystique.card_layout.bbox_utils import remove_noise_objects
+
+
+def get_objects(names_coordinates):
+    """Returns the predicted objects dict for the names and coordinates"""
+    return {
+        "objects": [
+            {"object": name, "coordinates": coordinates}
+            for name, coordinates in names_coordinates
+        ]
+    }
+
+
+class TestRemoveNoiseObjects(unittest.TestCase):
+    """Tests for the overlapping objects removal"""
+
+    def test_smaller_overlapping_object_removed(self):
+        """Tests the smaller of 2 overlapping objects is removed"""
+        predicted_objects = get_objects(
+            [
+                ("image", (0, 0, 100, 100)),
+                ("textbox", (10, 10, 60, 60)),
+                ("textbox", (200, 200, 250, 220)),
+            ]
+        )
+        remove_noise_objects(predicted_objects)
+        self.assertEqual(
+            [obj["coordinates"] for obj in predicted_objects["objects"]],
+            [(0, 0, 100, 100), (200, 200, 250, 220)],
+        )
+
+    def test_actionset_textbox_overlap(self):
+        """Tests the textbox overlapping an actionset is removed"""
+        predicted_objects = get_objects(
+            [
+                ("image", (300, 300, 400, 400)),
+                ("actionset", (0, 0, 100, 40)),
+                ("textbox", (90, 30, 200, 60)),
+            ]
+        )
+        remove_noise_objects(predicted_objects)
+        self.assertEqual(
+            [obj["object"] for obj in predicted_objects["objects"]],
+            ["image", "actionset"],
+        )
+
+    def test_matrix_and_sweep_modes_agree(self):
+        """Tests both the candidate pair selections give the same result"""
+        rng = random.Random(0)
+        names = ["textbox", "actionset", "image", "checkbox"]
+        for _ in range(50):
+            objects = []
+            for _ in range(rng.randint(0, 40)):
+                xmin, ymin = rng.randint(0, 300), rng.randint(0, 300)
+                objects.append(
+                    (
+                        rng.choice(names),
+                        (
+                            xmin,
+                            ymin,
+                            xmin + rng.randint(1, 100),
+                            ymin + rng.randint(1, 50),
+                        ),
+                    )
+                )
+            matrix_objects = get_objects(objects)
+            sweep_objects = copy.deepcopy(matrix_objects)
+            remove_noise_objects(matrix_objects, mode="matrix")
+            remove_noise_objects(sweep_objects, mode="sweep")
+            self.assertEqual(matrix_objects, sweep_objects)
@@ -0,0 +1,145 @@
+"""Tests for the content addressed caches"""
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from mystique.cache import (
+    CardCache,
+    DetectionCache,
+    CachedObjectDetection,
+    LruTtlCache,
+)
+
+
+class TestLruTtlCache(unittest.TestCase):
+    """Tests for the LRU, TTL and size bound behaviour"""
+
+    def test_hit_and_miss(self):
+        """Tests the hit / miss counters"""
+        cache = LruTtlCache(100, 60)
+        cache.set("a", b"1234")
+        self.assertEqual(cache.get("a"), b"1234")
+        self.assertIsNone(cache.get("b"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_size_bound_eviction(self):
+        """Tests the least recently used values are evicted"""
+        cache = LruTtlCache(10, 60)
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        cache.get("a")
+        cache.set("c", b"1234")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), b"1234")
+        self.assertEqual(cache.stats()["bytes"], 8)
+
+    def test_ttl_expiry(self):
+        """Tests the expired values are not returned"""
+        cache = LruTtlCache(100, 60)
+        with patch("mystique.cache.time.time", return_value=1000.0):
+            cache.set("a", b"1234")
+        with patch("mystique.cache.time.time", return_value=1100.0):
+            self.assertIsNone(cache.get("a"))
+
+    def test_disk_tier(self):
+        """Tests the values are served from the disk tier"""
+        with tempfile.TemporaryDirectory() as disk_dir:
+            LruTtlCache(100, 60, disk_dir=disk_dir).set("a", b"1234")
+            cache = LruTtlCache(100, 60, disk_dir=disk_dir)
+            self.assertEqual(cache.get("a"), b"1234")
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+
+    def test_disk_size_bound(self):
+        """Tests the oldest disk tier files are evicted first"""
+        with tempfile.TemporaryDirectory() as disk_dir:
+            cache = LruTtlCache(100, 60, disk_dir=disk_dir, disk_max_bytes=10)
+            for key, mtime in (("a", 2000), ("b", 1000), ("c", 3000)):
+                cache.set(key, b"1234")
+                # pylint: disable=protected-access
+                os.utime(cache._disk_path(key), (mtime, mtime))
+            self.assertEqual(sorted(os.listdir(disk_dir)), ["a.bin", "c.bin"])
+            self.assertEqual(cache.stats()["disk_evictions"], 1)
+            # the existing files count towards the bound of a new instance
+            cache = LruTtlCache(100, 1e9, disk_dir=disk_dir, disk_max_bytes=10)
+            cache.set("d", b"1234")
+            self.assertEqual(sorted(os.listdir(disk_dir)), ["c.bin", "d.bin"])
+
+    def test_disk_write_error(self):
+        """Tests a failed disk tier write is logged and keeps the value"""
+        with tempfile.TemporaryDirectory() as disk_dir:
+            cache = LruTtlCache(100, 60, disk_dir=disk_dir)
+            with patch.object(
+                cache, "dump", side_effect=OSError("No space left")
+            ):
+                with self.assertLogs("mysitque", level="WARNING"):
+                    cache.set("a", b"1234")
+            self.assertEqual(cache.get("a"), b"1234")
+            self.assertEqual(os.listdir(disk_dir), [])
+
+
+class TestCardCache(unittest.TestCase):
+    """Tests for the card response cache"""
+
+    def test_card_round_trip(self):
+        """Tests the cached cards are returned as fresh copies"""
+        cache = CardCache(1e6, 60)
+        key = cache.get_key(b"image-bytes", None)
+        card = {"card_json": {"card": {"body": []}}, "error": None}
+        cache.set(key, card)
+        cached = cache.get(key)
+        self.assertEqual(cached, card)
+        cached["error"] = "changed"
+        self.assertIsNone(cache.get(key)["error"])
+
+    def test_key(self):
+        """Tests the card format is part of the key"""
+        self.assertNotEqual(
+            CardCache.get_key(b"image-bytes", None),
+            CardCache.get_key(b"image-bytes", "template"),
+        )
+
+
+class TestDetectionCache(unittest.TestCase):
+    """Tests for the object detection output cache"""
+
+    def setUp(self):
+        self.image_np = np.zeros((20, 10, 3), dtype=np.uint8)
+        self.output_dict = {
+            "detection_boxes": np.array([[1.0, 2.0, 3.0, 4.0]]),
+            "detection_scores": np.array([0.9]),
+            "detection_classes": np.array([1], dtype=np.uint8),
+        }
+
+    def test_disk_tier(self):
+        """Tests the detections are stored and served as npz"""
+        with tempfile.TemporaryDirectory() as disk_dir:
+            key = DetectionCache.get_key(self.image_np)
+            DetectionCache(1e6, 60, disk_dir=disk_dir).set(
+                key, self.output_dict
+            )
+            cached = DetectionCache(1e6, 60, disk_dir=disk_dir).get(key)
+            for name, array in self.output_dict.items():
+                np.testing.assert_array_equal(cached[name], array)
+
+    def test_cached_object_detection(self):
+        """Tests the model runs only for the unseen images"""
+        od_model = Mock()
+        od_model.get_objects.return_value = self.output_dict
+        cached_model = CachedObjectDetection(od_model, DetectionCache(1e6, 60))
+        cached_model.get_objects(image_np=self.image_np, image=None)
+        cached_model.get_objects(image_np=self.image_np, image=None)
+        self.assertEqual(od_model.get_objects.call_count, 1)
+        od_model.get_objects_batch.return_value = [self.output_dict]
+        output_dicts = cached_model.get_objects_batch(
+            [self.image_np, np.ones((5, 5, 3), dtype=np.uint8)], [None, None]
+        )
+        self.assertEqual(len(output_dicts), 2)
+        self.assertEqual(len(od_model.get_objects_batch.call_args[0][0]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
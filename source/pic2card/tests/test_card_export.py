@@ -0,0 +1,150 @@
+"""Tests for the fused adaptive card export"""
+import copy
+import unittest
+from typing import Dict, List, Tuple
+
+from PIL import Image
+
+from mystique.ac_export.adaptive_card_export import (
+    FusedCardExport,
+    export_to_card_by_pass,
+)
+
+IMAGE_SIZE = (1000, 2000)
+
+
+def design_element(object_name: str, coordinates: Tuple, ctr: int) -> Dict:
+    """
+    Returns a design element with the extracted properties.
+    @param object_name: design object label eg; textbox
+    @param coordinates: xmin, ymin, xmax, ymax of the element
+    @param ctr: element number in the card
+    """
+    xmin, ymin, xmax, ymax = coordinates
+    return {
+        "object": object_name,
+        "xmin": xmin,
+        "ymin": ymin,
+        "xmax": xmax,
+        "ymax": ymax,
+        "coordinates": coordinates,
+        "uuid": str(ctr),
+        "data": f"{object_name} {ctr}",
+        "size": ["Small", "Medium", "Large"][ctr % 3],
+        "weight": "Default",
+        "color": "Default",
+    }
+
+
+def build_nested_card(depth: int, breadth: int) -> List[Dict]:
+    """
+    Returns the layout structure of a card with nested column-sets.
+    @param depth: number of the nested column-set levels
+    @param breadth: number of the columns per column-set
+    """
+    counter = iter(range(10**9))
+
+    def columnset(xmin, ymin, xmax, ymax, level) -> Dict:
+        width = (xmax - xmin) / breadth
+        columns = []
+        for col in range(breadth):
+            x_1 = xmin + col * width + 2
+            x_2 = x_1 + width - 4
+            items = [
+                design_element(
+                    "textbox", (x_1, ymin, x_2, ymin + 20), next(counter)
+                )
+            ]
+            if level < depth:
+                items.append(columnset(x_1, ymin + 30, x_2, ymax, level + 1))
+            else:
+                images = [
+                    design_element(
+                        "image",
+                        (
+                            x_1 + 10 * ctr,
+                            ymin + 30,
+                            x_1 + 10 * ctr + 8,
+                            ymin + 40,
+                        ),
+                        next(counter),
+                    )
+                    for ctr in range(2)
+                ]
+                items.append(
+                    {
+                        "object": "imageset",
+                        "imageset": {"items": images},
+                        "coordinates": (x_1, ymin + 30, x_2, ymin + 40),
+                    }
+                )
+                radiobuttons = [
+                    design_element(
+                        "radiobutton",
+                        (x_1, ymin + 50 + 20 * ctr, x_2, ymin + 60 + 20 * ctr),
+                        next(counter),
+                    )
+                    for ctr in range(2)
+                ]
+                items.append(
+                    {
+                        "object": "choiceset",
+                        "choiceset": {"items": radiobuttons},
+                        "coordinates": (x_1, ymin + 50, x_2, ymin + 80),
+                    }
+                )
+            columns.append(
+                {
+                    "object": "column",
+                    "column": {"items": items},
+                    "coordinates": (x_1, ymin, x_2, ymax),
+                }
+            )
+        return {
+            "object": "columnset",
+            "row": columns,
+            "coordinates": (xmin, ymin, xmax, ymax),
+        }
+
+    image_width, image_height = IMAGE_SIZE
+    return [
+        design_element("textbox", (10, 10, 300, 40), next(counter)),
+        columnset(0, 50, image_width, image_height - 100, 1),
+        design_element(
+            "actionset",
+            (10, image_height - 80, 200, image_height - 40),
+            next(counter),
+        ),
+    ]
+
+
+class TestFusedCardExport(unittest.TestCase):
+    """Tests the fused export matches the export by pass"""
+
+    def setUp(self):
+        self.pil_image = Image.new("RGB", IMAGE_SIZE, "white")
+
+    def assert_same_export(self, card_layout):
+        """Asserts the both exports return the same card body"""
+        self.assertEqual(
+            FusedCardExport(self.pil_image).build_adaptive_card(
+                copy.deepcopy(card_layout)
+            ),
+            export_to_card_by_pass(copy.deepcopy(card_layout), self.pil_image),
+        )
+
+    def test_nested_columnsets(self):
+        """Tests the deep nested column-sets"""
+        self.assert_same_export(build_nested_card(depth=3, breadth=2))
+
+    def test_single_item_container(self):
+        """Tests the line alignment of a single element container"""
+        card_layout = build_nested_card(depth=2, breadth=2)
+        column = card_layout[1]["row"][0]
+        textbox = column["column"]["items"][0]
+        textbox["image_data"] = {"line_num": [0, 1, 2], "left": [0, 10, 200]}
+        column["column"]["items"] = [textbox]
+        self.assert_same_export(card_layout)
+        body = FusedCardExport(self.pil_image).build_adaptive_card(card_layout)
+        items = body[1]["columns"][0]["items"]
+        self.assertEqual(items[0]["horizontalAlignment"], "Right")
@@ -0,0 +1,44 @@
+"""Tests for the compact design object models"""
+import pickle
+import unittest
+
+import numpy as np
+
+from mystique.card_layout.design_object import DesignObjects
+
+
+class TestDesignObjects(unittest.TestCase):
+    """Tests the conversions of the struct of arrays design objects"""
+
+    def setUp(self):
+        boxes = np.random.RandomState(0).rand(5, 4).astype(np.float32) * 500
+        self.design_objects = DesignObjects(
+            np.array(["textbox", "image", "radiobutton", "textbox", "image"]),
+            boxes,
+            np.linspace(0.5, 0.9, 5).astype(np.float32),
+            np.array([1.0, 5.0, 2.0, 1.0, 5.0], dtype=np.float32),
+        )
+
+    def test_dicts(self):
+        """Tests the dicts round trip through the struct of arrays"""
+        dicts = self.design_objects.to_dicts()
+        self.assertEqual(len(dicts), 5)
+        self.assertEqual(len({obj["uuid"] for obj in dicts}), 5)
+        for obj, box in zip(dicts, self.design_objects.boxes):
+            self.assertEqual(obj["coordinates"], tuple(box))
+            self.assertEqual(
+                (obj["xmin"], obj["ymin"], obj["xmax"], obj["ymax"]),
+                tuple(box),
+            )
+        self.assertEqual(DesignObjects.from_dicts(dicts).to_dicts(), dicts)
+
+    def test_pickle(self):
+        """Tests the struct of arrays pickles smaller than the dicts"""
+        design_objects = pickle.loads(pickle.dumps(self.design_objects))
+        self.assertEqual(
+            design_objects.to_dicts(), self.design_objects.to_dicts()
+        )
+        self.assertLess(
+            len(pickle.dumps(self.design_objects)),
+            len(pickle.dumps(self.design_objects.to_dicts())),
+        )
@@ -0,0 +1,90 @@
+"""Tests for the persistent session of the frozen graph object detection"""
+import unittest
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from mystique import config
+from mystique.detect_objects import ObjectDetection
+
+
+def fake_run(tensor_dict, feed_dict):  # pylint: disable=unused-argument
+    """
+    Returns a single detection per image of the batch, the score and the
+    box depend on the pixels and the size of the input image.
+    """
+    batch = list(feed_dict.values())[0]
+    batch_size, height, width = batch.shape[:3]
+    means = batch.reshape(batch_size, -1).mean(axis=1) / 255
+    boxes = np.array([10 / height, 10 / width, 0.5, 0.5], np.float32)
+    return {
+        "detection_classes": np.ones((batch_size, 1), dtype=np.float32),
+        "detection_boxes": np.tile(boxes, (batch_size, 1, 1)),
+        "detection_scores": means.reshape(batch_size, 1).astype(np.float32),
+    }
+
+
+class TestObjectDetectionSession(unittest.TestCase):
+    """Tests the inference session is created once and reused"""
+
+    def setUp(self):
+        graph = mock.MagicMock()
+        patches = [
+            mock.patch.object(
+                ObjectDetection,
+                "_load_model_dump",
+                return_value=(graph, {"detection_boxes": None}),
+            ),
+            mock.patch.object(ObjectDetection, "_create_session"),
+            mock.patch.object(config, "TF_SESSION_WARMUP", False),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        ObjectDetection._create_session.side_effect = lambda: mock.MagicMock(
+            run=mock.MagicMock(side_effect=fake_run)
+        )
+        self.od_model = ObjectDetection()
+        self.image = Image.new("RGB", (40, 30))
+        self.image_np = np.asarray(self.image)
+
+    def test_session_reuse(self):
+        """Tests the consecutive detections share the same session"""
+        session = self.od_model.session
+        for _ in range(2):
+            output = self.od_model.get_objects(self.image_np, self.image)
+            self.assertEqual(output["detection_boxes"].shape, (1, 4))
+        self.assertEqual(session.run.call_count, 2)
+        self.assertEqual(ObjectDetection._create_session.call_count, 1)
+
+    def test_close(self):
+        """Tests a closed session is re-created on the next detection"""
+        session = self.od_model.session
+        self.od_model.close()
+        session.close.assert_called_once()
+        self.od_model.get_objects(self.image_np, self.image)
+        self.assertIsNot(self.od_model.session, session)
+        self.assertEqual(ObjectDetection._create_session.call_count, 2)
+
+    def test_mixed_size_batch(self):
+        """Tests the batch detections are the same as of get_objects"""
+        images = [
+            Image.new("RGB", (40, 30), (200, 10, 10)),
+            Image.new("RGB", (60, 20), (10, 200, 10)),
+            Image.new("RGB", (40, 30), (10, 10, 200)),
+        ]
+        images_np = [np.asarray(image) for image in images]
+        session = self.od_model.session
+        outputs = self.od_model.get_objects_batch(images_np, images)
+        # one session run per image size
+        self.assertEqual(session.run.call_count, 2)
+        for image_np, image, output in zip(images_np, images, outputs):
+            expected = self.od_model.get_objects(image_np, image)
+            self.assertEqual(list(output), list(expected))
+            for key, value in expected.items():
+                np.testing.assert_allclose(output[key], value)
+
+
+if __name__ == "__main__":
+    unittest.main()
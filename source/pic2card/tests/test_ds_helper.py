@@ -0,0 +1,57 @@
+"""Tests for the layout data structure helpers"""
+import copy
+import os
+import unittest
+
+from commands.benchmark_layout import load_design_objects
+from mystique.card_layout.ds_helper import DsHelper, ContainerDetailTemplate
+from mystique.card_layout.row_column_group import get_layout_structure
+
+curr_dir = os.path.dirname(__file__)
+
+
+def collect_items(design_object, items):
+    """Collects the primary design elements of the layout"""
+    if isinstance(design_object, list):
+        for design_obj in design_object:
+            collect_items(design_obj, items)
+    elif design_object.get("object", "") in DsHelper.CONTAINERS:
+        container_items = getattr(
+            ContainerDetailTemplate(), design_object.get("object", "")
+        )(design_object)
+        collect_items(container_items, items)
+    else:
+        items.append(design_object)
+    return items
+
+
+class TestMergeProperties(unittest.TestCase):
+    """Tests the merge of the extracted properties into the layout"""
+
+    def setUp(self):
+        design_objects = load_design_objects(
+            os.path.join(curr_dir, "../data/test/3.xml")
+        )
+        self.card_layout = get_layout_structure(copy.deepcopy(design_objects))
+        self.properties = [
+            dict(
+                design_object,
+                data=f"text {design_object['uuid']}",
+                coordinates=(0, 0, 0, 0),
+            )
+            for design_object in design_objects
+        ]
+
+    def test_merge_properties(self):
+        """Tests the properties are merged without changing the inputs"""
+        properties = copy.deepcopy(self.properties)
+        items = collect_items(self.card_layout, [])
+        coordinates = [item["coordinates"] for item in items]
+        DsHelper().merge_properties(
+            properties, self.card_layout, ContainerDetailTemplate()
+        )
+        self.assertEqual(properties, self.properties)
+        self.assertEqual(len(items), len(self.properties))
+        for item, coords in zip(items, coordinates):
+            self.assertEqual(item["data"], f"text {item['uuid']}")
+            self.assertEqual(item["coordinates"], coords)
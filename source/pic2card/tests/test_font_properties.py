@@ -1,5 +1,19 @@
 """Test Moudle for the Font Properties"""
-from mystique.font_properties import classify_font_weights
+import os
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from mystique.extract_properties import (
+    ACTIONSET_STYLE_PALETTE,
+    TEXT_COLOR_PALETTE,
+)
+from mystique.font_properties import (
+    classify_font_weights,
+    FontPropDistanceTransform,
+    FontPropMorph,
+)
 
 # pylint: disable=no-name-in-module
 from tests.base_test_class import BaseSetUpClass
@@ -55,3 +69,50 @@ class TestClassifyFont(BaseSetUpClass):
         value = classify_font_weights(design_objects)
         self.assertEqual(value[0]["weight"], "Lighter")
         self.assertEqual(value[1]["weight"], "Lighter")
+
+
+class TestFontWeightThickness(unittest.TestCase):
+    """Tests the distance transform thickness agrees with the morph one"""
+
+    def test_thickness_agreement(self):
+        """
+        Tests both the pipelines give the same thickness on the text line
+        crops of the test image
+        """
+        image = Image.open(
+            os.path.join(os.path.dirname(__file__), "test_images/test01.png")
+        ).convert("RGB")
+        morph, distance_transform = FontPropMorph(), FontPropDistanceTransform()
+        width, height = image.size
+        for top in range(0, height - 40, 40):
+            coords = (0, top, width, top + 40)
+            img = morph.get_binary_image(image, coords)
+            if not 0 < img.sum() < img.size * 255:
+                continue
+            self.assertEqual(
+                morph.get_weight(image, coords, img_data={"uuid": top}),
+                distance_transform.get_weight(
+                    image, coords, img_data={"uuid": top}
+                ),
+            )
+        # the crop without text pixels
+        coords = (0, 0, width, 40)
+        blank = Image.new("RGB", image.size, "white")
+        for font_prop in (morph, distance_transform):
+            weight = font_prop.get_weight(blank, coords, img_data={"uuid": 0})
+            self.assertTrue(np.isnan(weight[0]))
+
+
+class TestColorPalette(unittest.TestCase):
+    """Tests for the closest reference color lookup"""
+
+    def test_get_closest(self):
+        """Tests the closest color name within the max distance is found"""
+        self.assertEqual(TEXT_COLOR_PALETTE.get_closest([10, 10, 10]), "Dark")
+        self.assertEqual(
+            TEXT_COLOR_PALETTE.get_closest([20, 100, 165]), "Accent"
+        )
+        self.assertEqual(
+            ACTIONSET_STYLE_PALETTE.get_closest([200, 20, 10]), "destructive"
+        )
+        self.assertIsNone(ACTIONSET_STYLE_PALETTE.get_closest([0, 255, 0]))
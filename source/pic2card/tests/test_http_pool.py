@@ -0,0 +1,76 @@
+"""Tests for the keep-alive http connection pool"""
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mystique.http_pool import ConnectionPool, RetryableStatus
+from mystique.utils import send_json_payload
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Echoes the json body along with the client port"""
+
+    protocol_version = "HTTP/1.1"
+    # number of the 503 responses before serving the requests
+    failures = 0
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Echoes the posted json"""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if EchoHandler.failures > 0:
+            EchoHandler.failures -= 1
+            status, data = 503, b"{}"
+        else:
+            payload = json.loads(body)
+            payload["client_port"] = self.client_address[1]
+            status, data = 200, json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Tests the connection reuse and the retries"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+        # the pooled keep-alive connections hold their handler threads
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        EchoHandler.failures = 0
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_keep_alive(self):
+        """Tests the consecutive requests share the same connection"""
+        responses = [
+            send_json_payload("/echo", {"ctr": ctr}, self.url)
+            for ctr in range(3)
+        ]
+        self.assertEqual([res["ctr"] for res in responses], [0, 1, 2])
+        self.assertEqual(len({res["client_port"] for res in responses}), 1)
+
+    def test_retry(self):
+        """Tests the 503 responses are retried up to the retries"""
+        pool = ConnectionPool(self.url)
+        EchoHandler.failures = 2
+        status, data = pool.request(
+            "POST", "/echo", b'{"ctr": 1}', retries=2, backoff=0
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(data)["ctr"], 1)
+        EchoHandler.failures = 2
+        with self.assertRaises(RetryableStatus):
+            pool.request("POST", "/echo", b"{}", retries=1, backoff=0)
+        pool.close()
@@ -0,0 +1,53 @@
+"""Tests for the image objects filtering of the custom image pipeline"""
+import unittest
+
+import numpy as np
+
+from mystique.image_extraction import ImageExtraction
+
+
+class TestImageExtraction(unittest.TestCase):
+    """Tests for the model intersection and noise removal"""
+
+    def setUp(self):
+        self.image_extraction = ImageExtraction()
+
+    def test_remove_model_intersection(self):
+        """Tests the image objects overlapping the rcnn objects are marked"""
+        image_points = [(0, 0, 50, 50), (300, 300, 320, 320), (103, 3, 110, 8)]
+        detected_coords = [(40, 40, 90, 90), (106, 6, 200, 200)]
+        included_points_positions = [0] * len(image_points)
+        self.image_extraction.remove_model_intersection(
+            image_points, detected_coords, included_points_positions, True
+        )
+        self.assertEqual(included_points_positions, [0, 0, 1])
+        self.image_extraction.remove_model_intersection(
+            detected_coords, image_points, included_points_positions, False
+        )
+        self.assertEqual(included_points_positions, [1, 0, 1])
+
+    def test_remove_noise_objects(self):
+        """Tests the smaller intersecting image objects are removed"""
+        points = [
+            (10, 10, 20, 20),
+            (0, 0, 100, 100),
+            (200, 200, 300, 300),
+            (300, 300, 310, 310),
+        ]
+        self.assertEqual(
+            self.image_extraction.remove_noise_objects(points),
+            [(0, 0, 100, 100), (200, 200, 300, 300)],
+        )
+
+    def test_downscaled_edge_detection(self):
+        """Tests the downscaled edge detection boxes are in input scale"""
+        image = np.full((800, 1200, 3), 255, np.uint8)
+        image[200:500, 300:700] = 30
+        full_points = self.image_extraction.image_edge_detection(
+            image, max_dim=0
+        )
+        points = self.image_extraction.image_edge_detection(image, max_dim=400)
+        self.assertEqual(len(points), len(full_points))
+        for point, full_point in zip(points, full_points):
+            for coord, full_coord in zip(point, full_point):
+                self.assertAlmostEqual(coord, full_coord, delta=6)
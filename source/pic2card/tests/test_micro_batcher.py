@@ -0,0 +1,121 @@
+"""Tests for the detection request micro-batcher"""
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from mystique.micro_batcher import MicroBatcher
+
+
+class StubModel:
+    """Returns the image id as the detection, blocks the batch on a gate"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def get_objects_batch(self, images_np, images):
+        """Returns one output dict per image of the batch"""
+        self.gate.wait()
+        self.batches.append(list(images_np))
+        if self.error:
+            raise self.error
+        return [
+            {"id": image_np, "image": image}
+            for image_np, image in zip(images_np, images)
+        ]
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Tests the batching, the fan out of the results and the shutdown"""
+
+    def setUp(self):
+        self.model = StubModel()
+        self.batcher = MicroBatcher(
+            self.model, max_batch_size=4, max_wait_ms=50
+        )
+        self.executor = ThreadPoolExecutor(max_workers=8)
+
+    def tearDown(self):
+        self.model.gate.set()
+        self.batcher.shutdown()
+        self.executor.shutdown()
+
+    def submit(self, ids):
+        """Submits the detection requests from the executor threads"""
+        return [
+            self.executor.submit(self.batcher.get_objects, ctr, f"image{ctr}")
+            for ctr in ids
+        ]
+
+    def queue_behind_blocked_batch(self, size):
+        """
+        Blocks the model on a first request and queues the next requests
+        behind it, returns the futures of the all requests.
+        """
+        self.model.gate.clear()
+        futures = self.submit([0])
+        # the first request waits out the max wait time before it's batch
+        # blocks in the model
+        time.sleep(0.2)
+        futures += self.submit(range(1, size + 1))
+        deadline = time.monotonic() + 5
+        # pylint: disable=protected-access
+        while self.batcher._queue.qsize() < size:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+        return futures
+
+    def test_batching(self):
+        """Tests the queued requests are grouped up to the max batch size"""
+        futures = self.queue_behind_blocked_batch(5)
+        self.model.gate.set()
+        results = [future.result(timeout=5) for future in futures]
+        self.assertEqual(
+            [len(batch) for batch in self.model.batches], [1, 4, 1]
+        )
+        self.assertEqual(self.model.batches[1], [1, 2, 3, 4])
+        # every caller gets the detections of it's own image
+        self.assertEqual([res["id"] for res in results], list(range(6)))
+        self.assertEqual(results[3]["image"], "image3")
+        self.assertEqual(
+            self.batcher.stats()["batch_size_histogram"], {1: 2, 4: 1}
+        )
+
+    def test_timeout(self):
+        """Tests a lone request is served after the max wait time"""
+        start = time.monotonic()
+        result = self.batcher.get_objects(7, "image7")
+        self.assertEqual(result["id"], 7)
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+        self.assertEqual(self.model.batches, [[7]])
+
+    def test_exception(self):
+        """Tests the model error is raised to every caller of the batch"""
+        self.model.error = ValueError("inference failed")
+        futures = self.queue_behind_blocked_batch(2)
+        self.model.gate.set()
+        for future in futures:
+            with self.assertRaises(ValueError):
+                future.result(timeout=5)
+
+    def test_shutdown(self):
+        """Tests the queued requests are served before the worker exits"""
+        futures = self.queue_behind_blocked_batch(5)
+        stopper = threading.Thread(target=self.batcher.shutdown)
+        stopper.start()
+        self.model.gate.set()
+        stopper.join(timeout=5)
+        self.assertFalse(stopper.is_alive())
+        self.assertEqual(
+            [future.result(timeout=5)["id"] for future in futures],
+            list(range(6)),
+        )
+        with self.assertRaises(RuntimeError):
+            self.batcher.get_objects(6, "image6")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""Tests for the design object crop context"""
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from mystique.object_crop import ObjectCrop, crop_array, get_object_crop
+
+
+class TestObjectCrop(unittest.TestCase):
+    """Tests the crops match the PIL crops of the design objects"""
+
+    def setUp(self):
+        image_np = np.random.RandomState(0).randint(
+            0, 256, (60, 80, 3), dtype=np.uint8
+        )
+        self.image = Image.fromarray(image_np)
+
+    def test_crop_array(self):
+        """Tests the array crops inside and outside the image"""
+        image_np = np.asarray(self.image)
+        for coords in [(10, 5, 40, 30), (-5, 10.6, 20.4, 70), (70, -3, 90, 8)]:
+            np.testing.assert_array_equal(
+                crop_array(image_np, coords),
+                np.asarray(self.image.crop(coords)),
+            )
+
+    def test_variants(self):
+        """Tests the text image and quantized variants"""
+        coords = (3, 4, 50, 30)
+        object_crop = ObjectCrop(self.image, coords)
+        text_image = self.image.crop((-2, 4, 55, 30)).convert("LA")
+        self.assertEqual(object_crop.text_image.tobytes(), text_image.tobytes())
+        self.assertEqual(
+            object_crop.quantized.getpalette()[:6],
+            self.image.crop(coords)
+            .quantize(colors=2, method=2)
+            .getpalette()[:6],
+        )
+        self.assertIs(
+            get_object_crop(object_crop, self.image, coords), object_crop
+        )
+        self.assertIsNot(
+            get_object_crop(object_crop, self.image, (0, 0, 5, 5)),
+            object_crop,
+        )
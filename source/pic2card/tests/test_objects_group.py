@@ -0,0 +1,161 @@
+"""Tests for the design object grouping and the container merge"""
+import copy
+import unittest
+
+from mystique.card_layout.container_group import ContainerGroup
+from mystique.card_layout.objects_group import (
+    ChoicesetGrouping,
+    RowColumnGrouping,
+)
+
+
+def design_object(name, coordinates, class_id=1):
+    """Returns a design object dict of the layout"""
+    xmin, ymin, xmax, ymax = coordinates
+    return {
+        "object": name,
+        "xmin": xmin,
+        "ymin": ymin,
+        "xmax": xmax,
+        "ymax": ymax,
+        "coordinates": coordinates,
+        "class": class_id,
+    }
+
+
+class TestObjectGrouping(unittest.TestCase):
+    """Tests the group membership of GroupObjects.object_grouping"""
+
+    def setUp(self):
+        self.grouping = RowColumnGrouping()
+        self.title = design_object("textbox", (10, 10, 100, 30))
+        self.subtitle = design_object("textbox", (120, 12, 200, 28))
+        self.body = design_object("textbox", (10, 50, 200, 70))
+
+    def test_row_grouping(self):
+        """Tests the objects are grouped in rows with the group bounds"""
+        groups = self.grouping.object_grouping(
+            [self.title, self.subtitle, self.body],
+            self.grouping.row_condition,
+        )
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(groups[0]["coordinates"], [10, 10, 200, 30])
+        self.assertEqual(groups[1]["coordinates"], [10, 50, 200, 70])
+        # the groups hold the layout dicts, not copies
+        self.assertIs(groups[0]["objects"][0], self.title)
+        self.assertIs(groups[0]["objects"][1], self.subtitle)
+        self.assertIs(groups[1]["objects"][0], self.body)
+
+    def test_single_object(self):
+        """Tests the first object of a group is added once"""
+        groups = self.grouping.object_grouping(
+            [self.title], self.grouping.row_condition
+        )
+        self.assertEqual(
+            groups,
+            [{"objects": [self.title], "coordinates": [10, 10, 100, 30]}],
+        )
+
+    def test_duplicate_looking_objects(self):
+        """Tests the equal but distinct dicts are all grouped"""
+        duplicate = copy.deepcopy(self.title)
+        self.assertEqual(duplicate, self.title)
+        groups = self.grouping.object_grouping(
+            [self.title, duplicate, self.body, copy.deepcopy(self.body)],
+            self.grouping.row_condition,
+        )
+        self.assertEqual([len(group["objects"]) for group in groups], [2, 2])
+        self.assertIs(groups[0]["objects"][1], duplicate)
+        # a repeated dict is a single member of the group
+        groups = self.grouping.object_grouping(
+            [self.title, self.title, self.subtitle],
+            self.grouping.row_condition,
+        )
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0]["objects"], [self.title, self.subtitle])
+
+    def test_image_group(self):
+        """Tests the groups holding an image are passed as image groups"""
+        image = design_object("image", (10, 10, 100, 30), class_id=5)
+        group_types = []
+
+        def condition(bbox_1, bbox_2):
+            group_types.append(bbox_1[-1])
+            return self.grouping.row_condition(bbox_1, bbox_2)
+
+        self.grouping.object_grouping(
+            [self.title, image, self.subtitle, self.body], condition
+        )
+        self.assertEqual(group_types, ["group", "group", "image", "image"])
+
+
+class TestContainerGroup(unittest.TestCase):
+    """Tests the collection and the merge of the choice-set items"""
+
+    def setUp(self):
+        self.container_group = ContainerGroup()
+        self.textbox = design_object("textbox", (10, 10, 200, 30))
+        self.radiobutton = design_object(
+            "radiobutton", (10, 40, 100, 60), class_id=2
+        )
+        # same content as the first radiobutton
+        self.duplicate = copy.deepcopy(self.radiobutton)
+        self.other_radiobutton = design_object(
+            "radiobutton", (10, 70, 100, 90), class_id=2
+        )
+        self.lone_radiobutton = design_object(
+            "radiobutton", (300, 40, 380, 60), class_id=2
+        )
+        self.card_layout = [
+            self.textbox,
+            self.radiobutton,
+            self.duplicate,
+            self.other_radiobutton,
+            self.lone_radiobutton,
+        ]
+
+    def test_collect_items_for_container(self):
+        """Tests the layout is split by the class in a stable order"""
+        items, remaining_items = (
+            self.container_group.collect_items_for_container(
+                self.card_layout, 2
+            )
+        )
+        self.assertEqual(len(items), 4)
+        for item, expected in zip(items, self.card_layout[1:]):
+            self.assertIs(item, expected)
+        self.assertEqual(len(remaining_items), 1)
+        self.assertIs(remaining_items[0], self.textbox)
+
+    def test_add_merged_items(self):
+        """Tests the grouped radiobuttons are moved into a choice-set"""
+        grouping = ChoicesetGrouping()
+        payload = {
+            "grouping_type": "choiceset",
+            "grouping_object": grouping,
+            "grouping_condition": grouping.choiceset_condition,
+        }
+        items, _ = self.container_group.collect_items_for_container(
+            self.card_layout, 2
+        )
+        card_layout = self.container_group.add_merged_items(
+            items, list(self.card_layout), payload
+        )
+        self.assertEqual(len(card_layout), 3)
+        self.assertIs(card_layout[0], self.textbox)
+        self.assertIs(card_layout[1], self.lone_radiobutton)
+        choiceset = card_layout[2]
+        self.assertEqual(choiceset["object"], "choiceset")
+        self.assertEqual(choiceset["coordinates"], [10, 40, 100, 90])
+        self.assertEqual(
+            [id(item) for item in choiceset["choiceset"]["items"]],
+            [
+                id(self.radiobutton),
+                id(self.duplicate),
+                id(self.other_radiobutton),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+"""Tests for the OCR backends and the whole image OCR region assignment"""
+import copy
+import threading
+import types
+import unittest
+from unittest.mock import patch
+from PIL import Image
+
+from mystique import config, ocr
+from mystique.ocr import (
+    PytesseractBackend,
+    TesserocrBackend,
+    WholeImageOcr,
+    close_ocr_backend,
+    get_ocr_backend,
+)
+from mystique.predict_card import PredictCard
+from tests.test_predict_card import build_card
+
+# pytesseract image_to_data output of a card with 2 text lines and a button
+mock_img_data = {
+    "level": [1, 5, 5, 5, 5, 5],
+    "page_num": [1] * 6,
+    "block_num": [0, 1, 1, 1, 2, 3],
+    "par_num": [0, 1, 1, 1, 1, 1],
+    "line_num": [0, 1, 1, 2, 1, 1],
+    "word_num": [0, 1, 2, 1, 1, 1],
+    "left": [0, 10, 60, 10, 300, 20],
+    "top": [0, 10, 10, 40, 12, 200],
+    "width": [400, 40, 50, 70, 30, 60],
+    "height": [300, 20, 20, 20, 18, 22],
+    "conf": ["-1", 90, 91, 92, 93, 94],
+    "text": ["", "Hello", "World", "Second", "Far", "Submit"],
+}
+
+
+class TestWholeImageOcr(unittest.TestCase):
+    """Tests for the word assignment to the design object regions"""
+
+    def setUp(self):
+        with patch(
+            "mystique.ocr.pytesseract.image_to_data",
+            return_value=mock_img_data,
+        ):
+            self.ocr = WholeImageOcr(Image.new("RGB", (400, 300)), 32)
+
+    def test_words_in_region(self):
+        """Tests only the words inside the region are assigned"""
+        img_data = self.ocr.get_data((5, 5, 150, 65))
+        self.assertEqual(img_data["text"], ["Hello", "World", "Second"])
+        self.assertEqual(img_data["line_num"], [1, 1, 2])
+        # positions are relative to the region
+        self.assertEqual(img_data["left"], [5, 55, 5])
+        self.assertEqual(img_data["top"], [5, 5, 35])
+
+    def test_line_renumbering(self):
+        """Tests the lines are renumbered from 1 for each region"""
+        img_data = self.ocr.get_data((0, 190, 100, 230))
+        self.assertEqual(img_data["text"], ["Submit"])
+        self.assertEqual(img_data["line_num"], [1])
+
+    def test_empty_region(self):
+        """Tests a region without words"""
+        img_data = self.ocr.get_data((150, 100, 250, 150))
+        self.assertEqual(img_data["text"], [])
+
+
+class FakeTessBaseAPI:
+    """Records the created and the ended tesserocr API handles"""
+
+    created = []
+    lock = threading.Lock()
+    # raised on the handle creation if set
+    error = None
+
+    def __init__(self, lang, psm):
+        if self.error is not None:
+            raise self.error
+        self.lang = lang
+        self.psm = psm
+        self.ended = False
+        self.image = None
+        with self.lock:
+            self.created.append(self)
+
+    def SetImage(self, image):  # pylint: disable=invalid-name
+        """Keeps the image to recognize"""
+        self.image = image
+
+    def GetTSVText(self, page):  # pylint: disable=invalid-name
+        """Returns a single word named after the image size"""
+        width, height = self.image.size
+        return (
+            f"5\t{page + 1}\t1\t1\t1\t1\t2\t2\t{width}\t{height}\t90"
+            f"\t{width}x{height}"
+        )
+
+    def Clear(self):  # pylint: disable=invalid-name
+        """Clears the recognition results"""
+        self.image = None
+
+    def End(self):  # pylint: disable=invalid-name
+        """Releases the handle"""
+        self.ended = True
+
+
+class TestOcrBackends(unittest.TestCase):
+    """Tests the OCR backend registry and the tesserocr handle pool"""
+
+    def setUp(self):
+        FakeTessBaseAPI.created = []
+        FakeTessBaseAPI.error = None
+        fake_tesserocr = types.ModuleType("tesserocr")
+        fake_tesserocr.PyTessBaseAPI = FakeTessBaseAPI
+        patches = [
+            patch.dict("sys.modules", {"tesserocr": fake_tesserocr}),
+            patch.object(ocr, "_OCR_BACKEND", None),
+            patch.object(config, "OCR_MODE", "per_object"),
+            patch.object(config, "PROPERTY_EXTRACTION_WORKERS", 4),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_registry(self):
+        """Tests the active backend is loaded once from the registry"""
+        with patch.object(config, "ACTIVE_OCR_BACKEND", "pytesseract"):
+            self.assertIsInstance(get_ocr_backend(), PytesseractBackend)
+            close_ocr_backend()
+        with patch.object(config, "ACTIVE_OCR_BACKEND", "tesserocr"):
+            backend = get_ocr_backend()
+            self.assertIsInstance(backend, TesserocrBackend)
+            self.assertIs(get_ocr_backend(), backend)
+            close_ocr_backend()
+            self.assertIsNot(get_ocr_backend(), backend)
+
+    def test_handle_reuse(self):
+        """Tests the handles are reused across the cards and closed"""
+        image, design_objects = build_card()
+        with patch.object(config, "ACTIVE_OCR_BACKEND", "tesserocr"):
+            for _ in range(2):
+                properties = PredictCard().get_object_properties(
+                    copy.deepcopy(design_objects), image
+                )
+                self.assertTrue(properties[0]["data"])
+            handles = list(FakeTessBaseAPI.created)
+            self.assertGreater(len(handles), 0)
+            self.assertLessEqual(len(handles), config.TESSEROCR_POOL_SIZE)
+            PredictCard().get_object_properties(
+                copy.deepcopy(design_objects), image
+            )
+            # no new handle for the next card
+            self.assertEqual(FakeTessBaseAPI.created, handles)
+            close_ocr_backend()
+        self.assertTrue(all(handle.ended for handle in handles))
+
+    def test_pool_bound(self):
+        """Tests the callers wait for a free handle when the pool is full"""
+        backend = TesserocrBackend(pool_size=2)
+        barrier = threading.Barrier(6)
+
+        def recognize():
+            barrier.wait()
+            for _ in range(5):
+                backend.image_to_data(Image.new("L", (20, 10)), psm=6)
+
+        threads = [threading.Thread(target=recognize) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        self.assertLessEqual(len(FakeTessBaseAPI.created), 2)
+        backend.close()
+        self.assertTrue(all(api.ended for api in FakeTessBaseAPI.created))
+        with self.assertRaises(RuntimeError):
+            backend.image_to_data(Image.new("L", (20, 10)), psm=6)
+
+    def test_failed_creation(self):
+        """Tests the failed handle creations don't take the pool slots"""
+        backend = TesserocrBackend(pool_size=2)
+        FakeTessBaseAPI.error = RuntimeError("Failed loading language 'eng'")
+        errors = []
+
+        def recognize():
+            for _ in range(4):
+                try:
+                    backend.image_to_data(Image.new("L", (20, 10)), psm=6)
+                except RuntimeError as err:
+                    errors.append(err)
+
+        thread = threading.Thread(target=recognize, daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(errors), 4)
+        FakeTessBaseAPI.error = None
+        data = backend.image_to_data(Image.new("L", (20, 10)), psm=6)
+        self.assertEqual(data["text"][-1], "20x10")
+        self.assertEqual(len(FakeTessBaseAPI.created), 1)
+        backend.close()
+
+    @patch.object(config, "TESSEROCR_POOL_TIMEOUT", 0.05)
+    def test_pool_timeout(self):
+        """Tests the wait for a free handle times out"""
+        backend = TesserocrBackend(pool_size=1)
+        errors = []
+
+        def recognize():
+            try:
+                backend.image_to_data(Image.new("L", (20, 10)), psm=6)
+            except RuntimeError as err:
+                errors.append(err)
+
+        # pylint: disable=protected-access
+        with backend._get_api(6):
+            thread = threading.Thread(target=recognize, daemon=True)
+            thread.start()
+            thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(errors), 1)
+        backend.image_to_data(Image.new("L", (20, 10)), psm=6)
+        backend.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
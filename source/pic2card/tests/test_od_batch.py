@@ -0,0 +1,27 @@
+"""Tests for the batched object detection helpers"""
+import unittest
+import numpy as np
+
+from mystique.utils import group_by_size
+
+
+class TestBatchHelpers(unittest.TestCase):
+    """Tests for the grouping of the same sized images"""
+
+    def test_group_by_size(self):
+        """Tests the same shaped images are grouped in the order of
+        appearance"""
+        images_np = [
+            np.zeros((40, 60, 3), dtype=np.uint8),
+            np.zeros((80, 30, 3), dtype=np.uint8),
+            np.ones((40, 60, 3), dtype=np.uint8),
+        ]
+        self.assertEqual(group_by_size(images_np), [[0, 2], [1]])
+
+    def test_empty_batch(self):
+        """Tests the empty batch"""
+        self.assertEqual(group_by_size([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
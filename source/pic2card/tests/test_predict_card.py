@@ -0,0 +1,175 @@
+"""Tests for the design object collection and property extraction"""
+
+import copy
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from mystique import config
+from mystique.predict_card import PredictCard
+
+
+def fake_image_to_data(image, **kwargs):  # pylint: disable=unused-argument
+    """Returns a single word named after the size of the cropped image"""
+    width, height = image.size
+    return {
+        "level": [1, 5],
+        "page_num": [1, 1],
+        "block_num": [0, 1],
+        "par_num": [0, 1],
+        "line_num": [0, 1],
+        "word_num": [0, 1],
+        "left": [0, 2],
+        "top": [0, 2],
+        "width": [width, max(width - 4, 1)],
+        "height": [height, max(height - 4, 1)],
+        "conf": ["-1", 90],
+        "text": ["", f"{width}x{height}"],
+    }
+
+
+def build_card():
+    """Returns a card image and it's design objects"""
+    image = Image.new("RGB", (400, 300), "white")
+    draw = ImageDraw.Draw(image)
+    boxes = [
+        ("textbox", (10, 10, 200, 40)),
+        ("image", (250, 10, 390, 120)),
+        ("textbox", (10, 60, 150, 80)),
+        ("checkbox", (10, 100, 120, 120)),
+        ("radiobutton", (10, 140, 130, 160)),
+        ("actionset", (10, 200, 110, 240)),
+        ("textbox", (200, 200, 380, 230)),
+    ]
+    design_objects = []
+    for ctr, (label, box) in enumerate(boxes):
+        draw.rectangle(box, outline=(40 * ctr, 80, 160))
+        draw.text((box[0] + 4, box[1] + 4), f"Item {ctr}", fill="black")
+        design_objects.append(
+            {
+                "object": label,
+                "xmin": box[0],
+                "ymin": box[1],
+                "xmax": box[2],
+                "ymax": box[3],
+                "coordinates": box,
+                "score": 0.9,
+                "uuid": str(ctr),
+                "class": 1,
+            }
+        )
+    return image, design_objects
+
+
+class TestObjectProperties(unittest.TestCase):
+    """Tests the concurrent property extraction"""
+
+    def setUp(self):
+        self.image, self.design_objects = build_card()
+        patcher = patch(
+            "mystique.ocr.pytesseract.image_to_data",
+            side_effect=fake_image_to_data,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_properties(self, workers):
+        """Extracts the properties with the given number of workers"""
+        with patch.object(config, "PROPERTY_EXTRACTION_WORKERS", workers):
+            return PredictCard().get_object_properties(
+                copy.deepcopy(self.design_objects), self.image
+            )
+
+    def test_concurrent_extraction(self):
+        """Tests the concurrent extraction matches the serial one"""
+        serial = self.get_properties(1)
+        concurrent = self.get_properties(4)
+        self.assertEqual(
+            [obj["uuid"] for obj in concurrent],
+            [obj["uuid"] for obj in self.design_objects],
+        )
+        self.assertEqual(concurrent, serial)
+        # each object gets the text of it's own sized crop
+        texts = [obj["data"] for obj in concurrent if obj["object"] != "image"]
+        self.assertEqual(len(set(texts)), len(texts))
+
+
+class TestCollectObjects(unittest.TestCase):
+    """Tests the design objects collected from the detection arrays"""
+
+    def setUp(self):
+        self.output_dict = {
+            "detection_boxes": np.array(
+                [
+                    [10.0, 20.0, 110.0, 40.0],
+                    [10.0, 50.0, 60.0, 90.0],
+                    [10.0, 100.0, 30.0, 120.0],
+                    [10.0, 130.0, 90.0, 150.0],
+                    [10.0, 160.0, 90.0, 180.0],
+                    [10.0, 190.0, 90.0, 210.0],
+                ]
+            ),
+            # confidence bound is 80
+            "detection_scores": np.array([0.95, 0.5, 0.8, 0.99, 0.9, 0.85]),
+            # 9 and -1 are unknown class ids
+            "detection_classes": np.array([1, 5, 3, 9, -1, 4]),
+        }
+
+    def test_collect_objects(self):
+        """Tests the confidence filtering, label mapping and padding"""
+        with patch.object(config, "MODEL_CONFIDENCE", 80.0), patch.object(
+            config, "TEXTBOX_PADDING", 5
+        ):
+            json_object, detected_coords = PredictCard().collect_objects(
+                output_dict=self.output_dict
+            )
+        objects = json_object["objects"]
+        self.assertEqual(
+            [obj["object"] for obj in objects],
+            ["textbox", "checkbox", "actionset"],
+        )
+        self.assertEqual([obj["class"] for obj in objects], [1, 3, 4])
+        self.assertEqual([obj["score"] for obj in objects], [0.95, 0.8, 0.85])
+        # only the textbox coordinates are padded
+        self.assertEqual(
+            detected_coords,
+            [
+                (5.0, 20.0, 115.0, 40.0),
+                (10.0, 100.0, 30.0, 120.0),
+                (10.0, 190.0, 90.0, 210.0),
+            ],
+        )
+        self.assertEqual(objects[0]["coordinates"], (10.0, 20.0, 110.0, 40.0))
+        self.assertEqual(
+            (objects[2]["xmin"], objects[2]["ymin"]), (10.0, 190.0)
+        )
+        self.assertEqual(
+            set(objects[0]),
+            {
+                "object",
+                "xmin",
+                "ymin",
+                "xmax",
+                "ymax",
+                "coordinates",
+                "score",
+                "uuid",
+                "class",
+            },
+        )
+        self.assertEqual(len({obj["uuid"] for obj in objects}), 3)
+
+    def test_no_objects(self):
+        """Tests the detections below the confidence bound"""
+        self.output_dict["detection_scores"] = np.zeros(6)
+        json_object, detected_coords = PredictCard().collect_objects(
+            output_dict=self.output_dict
+        )
+        self.assertEqual(json_object, {"objects": []})
+        self.assertEqual(detected_coords, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
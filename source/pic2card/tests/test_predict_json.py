@@ -1,4 +1,6 @@
 """tests cases for predict_json api"""
+import io
+import os
 import unittest
 import json
 import sys
@@ -72,6 +74,60 @@ class PredictJsonTestAPI(BaseAPITest):
         self.assertIsNone(output["card_json"])
         self.assertEqual(output["error"]["code"], 1001)
 
+    def test_binary_upload(self):
+        """checks the raw octet-stream and multipart uploads"""
+        with open(os.environ["test_img_path"], "rb") as img_file:
+            imgdata = img_file.read()
+        response = self.client.post(
+            self.api,
+            headers={"Content-Type": "application/octet-stream"},
+            data=imgdata,
+        )
+        output = json.loads(response.data)
+        self.assertIsNone(output["error"])
+        self.assertTrue(len(output["card_json"]["card"]["body"]) > 0)
+        response = self.client.post(
+            self.api,
+            data={"image": (io.BytesIO(imgdata), "test01.png")},
+            content_type="multipart/form-data",
+        )
+        self.assertEqual(json.loads(response.data), output)
+
+    def test_binary_upload_max_size(self):
+        """checks the raw uploads larger than IMG_MAX_UPLOAD_SIZE"""
+        response = self.client.post(
+            self.api,
+            headers={"Content-Type": "application/octet-stream"},
+            data=b"0" * int(config.IMG_MAX_UPLOAD_SIZE + 1),
+        )
+        output = json.loads(response.data)
+        self.assertEqual(output["error"]["code"], 1002)
+
+    def test_chunked_upload_max_size(self):
+        """checks the chunked multipart uploads [ no Content-Length ] larger
+        than IMG_MAX_UPLOAD_SIZE are rejected without reading the body in
+        full"""
+        boundary = "pic2card-boundary"
+        body = io.BytesIO(
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="image"; '
+            'filename="test01.png"\r\n'
+            "Content-Type: image/png\r\n\r\n".encode()
+            + b"0" * int(2 * config.IMG_MAX_UPLOAD_SIZE)
+            + f"\r\n--{boundary}--\r\n".encode()
+        )
+        response = self.client.post(
+            self.api,
+            input_stream=body,
+            content_type=f"multipart/form-data; boundary={boundary}",
+            headers={"Transfer-Encoding": "chunked"},
+            # set by the servers terminating the chunked input
+            environ_overrides={"wsgi.input_terminated": True},
+        )
+        output = json.loads(response.data)
+        self.assertEqual(output["error"]["code"], 1002)
+        self.assertLess(body.tell(), len(body.getvalue()))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,159 @@
+"""Tests for the TF Serving gRPC client"""
+import base64
+import enum
+import types
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+import numpy as np
+
+from mystique import config
+from mystique.tf_serving import OUTPUT_KEYS, TfServingGrpcClient
+
+
+class StatusCode(enum.Enum):
+    """gRPC status codes used by the tests"""
+
+    INVALID_ARGUMENT = 3
+    DEADLINE_EXCEEDED = 4
+    UNAVAILABLE = 14
+
+
+class RpcError(Exception):
+    """gRPC error with a status code"""
+
+    def __init__(self, status_code):
+        super().__init__(status_code.name)
+        self.status_code = status_code
+
+    def code(self):
+        """Returns the status code of the error"""
+        return self.status_code
+
+
+def fake_modules():
+    """
+    Returns the grpc and tensorflow-serving-api modules used by the client
+    """
+    grpc = types.ModuleType("grpc")
+    grpc.StatusCode = StatusCode
+    grpc.RpcError = RpcError
+    grpc.insecure_channel = Mock()
+    types_pb2 = types.ModuleType("types_pb2")
+    types_pb2.DT_FLOAT = 1
+    types_pb2.DT_DOUBLE = 2
+    types_pb2.DT_INT32 = 3
+    types_pb2.DT_STRING = 7
+    types_pb2.DT_INT64 = 9
+    framework = types.ModuleType("tensorflow.core.framework")
+    framework.types_pb2 = types_pb2
+    predict_pb2 = types.ModuleType("predict_pb2")
+    predict_pb2.PredictRequest = MagicMock
+    grpc_apis = types.ModuleType("prediction_service_pb2_grpc")
+    grpc_apis.PredictionServiceStub = Mock()
+    apis = types.ModuleType("tensorflow_serving.apis")
+    apis.predict_pb2 = predict_pb2
+    apis.prediction_service_pb2_grpc = grpc_apis
+    return {
+        "grpc": grpc,
+        "tensorflow": types.ModuleType("tensorflow"),
+        "tensorflow.core": types.ModuleType("tensorflow.core"),
+        "tensorflow.core.framework": framework,
+        "tensorflow.core.framework.types_pb2": types_pb2,
+        "tensorflow_serving": types.ModuleType("tensorflow_serving"),
+        "tensorflow_serving.apis": apis,
+        "tensorflow_serving.apis.predict_pb2": predict_pb2,
+        "tensorflow_serving.apis.prediction_service_pb2_grpc": grpc_apis,
+    }
+
+
+def tensor_proto(array, dtype, packed=True):
+    """
+    Returns a TensorProto like object of the array, the values are either
+    packed in the tensor content or listed in the typed value field.
+    """
+    return types.SimpleNamespace(
+        dtype=dtype,
+        tensor_shape=types.SimpleNamespace(
+            dim=[types.SimpleNamespace(size=size) for size in array.shape]
+        ),
+        tensor_content=array.tobytes() if packed else b"",
+        float_val=[] if packed else array.ravel().tolist(),
+    )
+
+
+class TestTfServingGrpcClient(unittest.TestCase):
+    """Tests the request, the output decoding and the retries"""
+
+    def setUp(self):
+        self.modules = fake_modules()
+        patcher = patch.dict("sys.modules", self.modules)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TfServingGrpcClient("localhost:8500", "mystique")
+        self.stub = self.client.stub
+        self.boxes = np.array([[[0.1, 0.2, 0.3, 0.4]]], dtype=np.float32)
+        self.scores = np.array([[0.9]], dtype=np.float32)
+        self.classes = np.array([[1.0]], dtype=np.float32)
+        self.response = types.SimpleNamespace(
+            outputs={
+                "detection_boxes": tensor_proto(self.boxes, 1),
+                "detection_scores": tensor_proto(self.scores, 1),
+                "detection_classes": tensor_proto(
+                    self.classes, 1, packed=False
+                ),
+            }
+        )
+
+    def test_to_array(self):
+        """Tests the packed and the listed tensor values"""
+        array = np.arange(6, dtype=np.int64).reshape(2, 3)
+        for packed in (True, False):
+            tensor = tensor_proto(array, 9, packed=packed)
+            tensor.int64_val = tensor.float_val
+            decoded = self.client.to_array(tensor)
+            self.assertEqual(decoded.dtype, np.int64)
+            np.testing.assert_array_equal(decoded, array)
+
+    def test_predict(self):
+        """Tests the request and the decoded outputs of the first image"""
+        self.stub.Predict.return_value = self.response
+        output = self.client.predict(base64.b64encode(b"image").decode())
+        self.assertEqual(list(output), OUTPUT_KEYS)
+        np.testing.assert_array_equal(output["detection_boxes"], self.boxes[0])
+        np.testing.assert_array_equal(
+            output["detection_classes"], self.classes[0]
+        )
+        request = self.stub.Predict.call_args[0][0]
+        self.assertEqual(request.model_spec.name, "mystique")
+        tensor = request.inputs[config.TF_SERVING_INPUT_NAME]
+        tensor.string_val.append.assert_called_once_with(b"image")
+        self.assertEqual(
+            self.stub.Predict.call_args[1]["timeout"], config.HTTP_TIMEOUT
+        )
+
+    def test_retry(self):
+        """Tests only the transient errors are retried"""
+        self.stub.Predict.side_effect = [
+            RpcError(StatusCode.UNAVAILABLE),
+            RpcError(StatusCode.DEADLINE_EXCEEDED),
+            self.response,
+        ]
+        with patch("mystique.http_pool.time.sleep"):
+            output = self.client.predict("")
+            self.assertEqual(self.stub.Predict.call_count, 3)
+            np.testing.assert_array_equal(
+                output["detection_scores"], self.scores[0]
+            )
+            self.stub.Predict.reset_mock()
+            self.stub.Predict.side_effect = [
+                RpcError(StatusCode.INVALID_ARGUMENT),
+                self.response,
+            ]
+            with self.assertRaises(RpcError):
+                self.client.predict("")
+        self.assertEqual(self.stub.Predict.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+"""Tests for the prediction flow utilities"""
+import io
+import unittest
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from mystique.utils import DecodedImage
+
+
+class TestDecodedImage(unittest.TestCase):
+    """Tests the decoded image views"""
+
+    def test_views(self):
+        """Tests the PIL and BGR views match the PIL decoding"""
+        image = Image.fromarray(
+            np.random.RandomState(0).randint(0, 256, (20, 30, 4), np.uint8)
+        )
+        buff = io.BytesIO()
+        image.save(buff, format="PNG")
+        decoded_image = DecodedImage.from_bytes(buff.getvalue())
+        rgb = np.asarray(image.convert("RGB"))
+        self.assertEqual(decoded_image.pil_image.size, (30, 20))
+        np.testing.assert_array_equal(np.asarray(decoded_image.pil_image), rgb)
+        np.testing.assert_array_equal(
+            decoded_image.bgr, cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+        )
@@ -0,0 +1,105 @@
+"""Tests for the shared memory image hand over to the worker processes"""
+import os
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+from PIL import Image
+
+from mystique import config, worker_pool
+from mystique.worker_pool import SharedImage, load_shared_image
+
+
+def load_image_mode(image_ref):
+    """Loads the shared image in the worker process"""
+    image = load_shared_image(image_ref)
+    return image.mode, image.size, image.tobytes(), image.getpalette()
+
+
+class TestSharedImage(unittest.TestCase):
+    """Tests the images round trip through the shared memory"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ProcessPoolExecutor(max_workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def round_trip(self, image):
+        """Returns the image loaded in the worker process"""
+        with SharedImage(image) as image_ref:
+            mode, size, data, palette = self.pool.submit(
+                load_image_mode, image_ref
+            ).result()
+        loaded = Image.frombytes(mode, size, data)
+        if palette is not None:
+            loaded.putpalette(palette)
+        return loaded
+
+    def assert_same_image(self, image, loaded):
+        """Asserts the loaded image has the same mode and pixels"""
+        self.assertEqual(loaded.mode, image.mode)
+        self.assertEqual(loaded.size, image.size)
+        self.assertEqual(loaded.tobytes(), image.tobytes())
+
+    def test_rgb(self):
+        """Tests the RGB image"""
+        image = Image.new("RGB", (30, 20), (255, 0, 0))
+        image.paste((0, 0, 255), (5, 5, 15, 10))
+        self.assert_same_image(image, self.round_trip(image))
+
+    def test_grayscale(self):
+        """Tests the L image"""
+        image = Image.new("L", (30, 20), 100)
+        image.paste(200, (5, 5, 15, 10))
+        self.assert_same_image(image, self.round_trip(image))
+
+    def test_palette(self):
+        """Tests the P image keeps it's palette"""
+        image = Image.new("RGB", (30, 20), (255, 0, 0))
+        image.paste((0, 128, 0), (5, 5, 15, 10))
+        image = image.convert("P", palette=Image.ADAPTIVE, colors=4)
+        loaded = self.round_trip(image)
+        self.assert_same_image(image, loaded)
+        self.assertEqual(loaded.convert("RGB").getpixel((0, 0)), (255, 0, 0))
+        self.assertEqual(loaded.convert("RGB").getpixel((6, 6)), (0, 128, 0))
+
+    def test_other_modes(self):
+        """Tests the other modes are shared as RGB"""
+        image = Image.new("CMYK", (30, 20), (0, 255, 255, 0))
+        loaded = self.round_trip(image)
+        self.assertEqual(loaded.mode, "RGB")
+        self.assertEqual(loaded.getpixel((0, 0)), (255, 0, 0))
+
+
+class TestWorkerPool(unittest.TestCase):
+    """Tests the shared process pool"""
+
+    def setUp(self):
+        patches = [
+            patch.object(config, "MULTI_PROC", True),
+            patch.object(config, "MULTI_PROC_WORKERS", 1),
+            patch.object(worker_pool, "_WORKER_POOL", None),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(worker_pool.shutdown_worker_pool)
+
+    def test_broken_pool(self):
+        """Tests the pool is recreated once a worker process died"""
+        pool = worker_pool.init_worker_pool()
+        self.assertIs(worker_pool.get_worker_pool(), pool)
+        with self.assertRaises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result()
+        new_pool = worker_pool.get_worker_pool()
+        self.assertIsNot(new_pool, pool)
+        self.assertNotEqual(new_pool.submit(os.getpid).result(), os.getpid())
+        self.assertIs(worker_pool.get_worker_pool(), new_pool)
+
+
+if __name__ == "__main__":
+    unittest.main()